@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawl benchmark against a local synthetic site (see mocksite.py).
+
+Runs check_all_links in each mode (single page, recursive crawl and
+sitemap), each in a fresh process so its peak RSS and CPU time are its
+own. The mock servers run in this process, so their CPU time is not
+counted. For every mode it reports links checked per second, p50/p99
+check latency (timed around each check_link call), peak RSS and CPU
+time. Results are written as JSON; pass an earlier file with --compare to
+see the change.
+
+Usage:
+    python benchmarks/bench_crawl.py [--pages 200] [--fanout 5] [--depth 3]
+                                     [--workers 10] [--modes single crawl sitemap]
+                                     [--latency lognormal --latency-ms 20 --jitter-ms 10]
+                                     [--error-rate 0.02] [--slow-hosts 1 --slow-ms 400]
+                                     [--head-reject-hosts 1] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, SRC)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mocksite import MockSite, SiteSpec
+
+MODES = ('single', 'crawl', 'sitemap')
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_mode(mode: str, url: str, depth: int, workers: int, timeout: float) -> dict:
+    """Crawl once in this (fresh) process and return its measurements."""
+    sys.path.insert(0, SRC)
+    import threading
+    from deadlink import crawler
+
+    latencies = []
+    lock = threading.Lock()
+    check_link = crawler.check_link
+
+    def timed_check_link(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return check_link(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    crawler.check_link = timed_check_link
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    results = crawler.check_all_links(url, max_workers=workers, timeout=timeout, max_depth=depth if mode == 'crawl' else 1)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        'links': len(results),
+        'dead': sum(1 for r in results if r.is_dead),
+        'pages': len({r.found_on for r in results}),
+        'wall_s': round(wall, 3),
+        'links_per_s': round(len(results) / wall, 1) if wall else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'cpu_s': round(cpu, 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None,
+    }
+
+def compare(current: dict, baseline: dict):
+    print(f"\nChange vs {baseline.get('timestamp', 'baseline')} (version {baseline.get('version', '?')}):")
+    for mode, run in current['runs'].items():
+        old = baseline.get('runs', {}).get(mode)
+        if not old:
+            continue
+        changes = []
+        for key, better in (('links_per_s', 1), ('p99_ms', -1), ('cpu_s', -1), ('peak_rss_mb', -1)):
+            if old.get(key) and run.get(key) is not None:
+                delta = (run[key] - old[key]) / old[key] * 100
+                marker = "✅" if delta * better >= 0 else "⚠️"
+                changes.append(f"{key} {delta:+.1f}% {marker}")
+        print(f"  {mode:8} " + ", ".join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end crawl benchmark on a local synthetic site")
+    defaults = SiteSpec()
+    parser.add_argument('--pages', type=int, default=defaults.pages)
+    parser.add_argument('--fanout', type=int, default=defaults.fanout)
+    parser.add_argument('--depth', type=int, default=3, help="Crawl depth for the 'crawl' mode (default: 3)")
+    parser.add_argument('--assets', default="Image=3,Script=1,Styles/Icon=1", help="Assets per page as TYPE=N,... (default: %(default)s)")
+    parser.add_argument('--shared-assets', type=int, default=defaults.shared_assets)
+    parser.add_argument('--broken-links', type=int, default=defaults.broken_links)
+    parser.add_argument('--external-links', type=int, default=defaults.external_links)
+    parser.add_argument('--external-hosts', type=int, default=defaults.external_hosts)
+    parser.add_argument('--slow-hosts', type=int, default=defaults.slow_hosts)
+    parser.add_argument('--slow-ms', type=float, default=defaults.slow_ms)
+    parser.add_argument('--head-reject-hosts', type=int, default=defaults.head_reject_hosts)
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'exponential', 'lognormal'], default=defaults.latency)
+    parser.add_argument('--latency-ms', type=float, default=defaults.latency_ms)
+    parser.add_argument('--jitter-ms', type=float, default=defaults.jitter_ms)
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--output', help="JSON file to write (default: benchmarks/results/crawl-<timestamp>.json)")
+    parser.add_argument('--compare', metavar='FILE', help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    try:
+        assets = {name: int(count) for name, count in (item.split('=') for item in args.assets.split(',') if item)}
+    except ValueError:
+        parser.error(f"Invalid --assets: {args.assets}")
+
+    spec = SiteSpec(pages=args.pages, fanout=args.fanout, assets=assets, shared_assets=args.shared_assets,
+                    broken_links=args.broken_links, external_links=args.external_links, external_hosts=args.external_hosts,
+                    slow_hosts=args.slow_hosts, slow_ms=args.slow_ms, head_reject_hosts=args.head_reject_hosts,
+                    latency=args.latency, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                    error_rate=args.error_rate, seed=args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    from deadlink.version import VERSION
+    report = {
+        'version': VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': args.workers,
+        'depth': args.depth,
+        'spec': asdict(spec),
+        'runs': {},
+    }
+
+    context = multiprocessing.get_context('spawn')
+    with MockSite(spec) as site:
+        print(f"Mock site at {site.main['base']} with {len(site.hosts)} external hosts, {spec.pages} pages\n")
+        print(f"{'mode':8} {'links':>7} {'wall s':>8} {'links/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'CPU s':>7} {'RSS MB':>7}")
+        for mode in args.modes:
+            url = site.sitemap_url if mode == 'sitemap' else site.root_url
+            with context.Pool(1) as pool:
+                run = pool.apply(run_mode, (mode, url, args.depth, args.workers, args.timeout))
+            report['runs'][mode] = run
+            rss = f"{run['peak_rss_mb']:7.1f}" if run['peak_rss_mb'] is not None else f"{'n/a':>7}"
+            print(f"{mode:8} {run['links']:7d} {run['wall_s']:8.2f} {run['links_per_s']:9.1f} {run['p50_ms']:8.1f} {run['p99_ms']:8.1f} {run['cpu_s']:7.2f} {rss}")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"crawl-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline is not None:
+        compare(report, baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for exclusion rule matching.
+
+Compares the original per-pattern re.search loop with the precompiled
+ExclusionMatcher on a synthetic rule set and URL list.
+
+Usage:
+    python benchmarks/bench_exclusion.py [--rules 200] [--urls 20000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.exclusion import ExclusionMatcher
+
+def legacy_should_exclude(url: str, patterns: list[str]) -> bool:
+    """The pre-ExclusionMatcher implementation, kept here as the baseline."""
+    for pattern in patterns:
+        try:
+            if re.search(pattern, url, re.IGNORECASE):
+                return True
+        except re.error:
+            if pattern.lower() in url.lower():
+                return True
+    return False
+
+def make_rules(count: int) -> list[str]:
+    rules = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            rules.append(f"/private-{i}/")
+        elif kind == 1:
+            rules.append(f"^https://cdn{i}.example.org")
+        elif kind == 2:
+            rules.append(rf"\.(zip|tar|gz)\?v={i}$")
+        else:
+            rules.append(rf"tracking-{i}\.js")
+    return rules
+
+def make_urls(count: int, rules: int, rng: random.Random) -> list[str]:
+    """Mostly non-matching URLs, with roughly 5% built to hit one of the rules."""
+    hosts = ["example.com", "www.example.com", "cdn.example.org", "static.example.net"]
+    urls = []
+    for _ in range(count):
+        i = rng.randrange(rules)
+        roll = rng.random()
+        if roll < 0.0125:
+            urls.append(f"https://example.com/private-{i - i % 4}/doc")
+        elif roll < 0.025:
+            urls.append(f"https://cdn{i - i % 4 + 1}.example.org/lib.js")
+        elif roll < 0.0375:
+            urls.append(f"https://example.com/files/archive.zip?v={i - i % 4 + 2}")
+        elif roll < 0.05:
+            urls.append(f"https://static.example.net/tracking-{i - i % 4 + 3}.js")
+        else:
+            urls.append(f"https://{rng.choice(hosts)}/section-{rng.randrange(50)}/page-{rng.randrange(10_000)}.html?ref={rng.randrange(100)}")
+    return urls
+
+def bench(label: str, fn, urls: list[str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    hits = sum(1 for url in urls if fn(url))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed * 1000:9.1f} ms  {len(urls) / elapsed:12,.0f} urls/s  ({hits} excluded)")
+    return elapsed, hits
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark exclusion rule matching.')
+    parser.add_argument('--rules', type=int, default=200, help='Number of exclusion rules (default: 200)')
+    parser.add_argument('--urls', type=int, default=20000, help='Number of URLs to match (default: 20000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = make_rules(args.rules)
+    urls = make_urls(args.urls, args.rules, rng)
+
+    start = time.perf_counter()
+    matcher = ExclusionMatcher(rules)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Exclusion matching: {args.rules} rules, {args.urls} URLs (compile: {compile_ms:.1f} ms)")
+    legacy_time, legacy_hits = bench("legacy re.search loop", lambda u: legacy_should_exclude(u, rules), urls)
+    matcher_time, matcher_hits = bench("ExclusionMatcher", matcher.matches, urls)
+    if legacy_hits != matcher_hits:
+        print("  ⚠️  Results differ between implementations!")
+        sys.exit(1)
+    print(f"  speedup: {legacy_time / matcher_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Offline microbenchmarks for the scanner, utils, exclusion, reporter and database hot paths.
+
+Every benchmark runs without network access: page parsing reads saved HTML
+from benchmarks/fixtures/ (plus one generated large page) through a fake
+session, and reports and the database work on synthetic LinkResults.
+Times are the best of --repeat runs, each looped until it takes at least
+0.2 s.
+
+Results are compared against a stored baseline (benchmarks/baseline_micro.json
+by default), after scaling by a short pure-Python calibration loop so that
+a uniformly slower or faster machine state does not count as a change.
+Baselines still compare best on the machine that recorded them, so record
+one there with --save-baseline before making a change.
+
+Usage:
+    python benchmarks/bench_micro.py [--scale small|full] [--only report] [--repeat 5]
+                                     [--baseline FILE] [--save-baseline] [--threshold 25]
+                                     [--output FILE]
+
+--scale full adds 100k and 1M result sets to the report and database benchmarks.
+Exits with status 1 if any benchmark is slower than the baseline by more
+than --threshold percent.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, 'fixtures')
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline_micro.json')
+SIZES = {'small': [10_000], 'full': [10_000, 100_000, 1_000_000]}
+
+# name -> (setup(size) -> (callable, items per call), sizes or None for the fixed-size ones)
+BENCHMARKS = {}
+
+def benchmark(name: str, scaled: bool = False):
+    def register(setup):
+        BENCHMARKS[name] = (setup, scaled)
+        return setup
+    return register
+
+def make_results(count: int, seed: int = 1) -> list[LinkResult]:
+    """Synthetic results with a realistic mix of types, hosts and failures."""
+    rng = random.Random(seed)
+    types = ["Link"] * 6 + ["Image"] * 2 + ["Script", "Styles/Icon"]
+    statuses = [(200, "200 OK")] * 18 + [(404, "404 Not Found"), (None, "Error: Timeout")]
+    pages = [f"https://www.example.com/blog/post-{i}" for i in range(max(1, count // 40))]
+    results = []
+    for i in range(count):
+        external = rng.random() < 0.3
+        host = f"cdn{i % 17}.example.net" if external else "www.example.com"
+        code, text = rng.choice(statuses)
+        results.append(LinkResult(f"https://{host}/path/{i % 5000}/item-{i}?ref={i % 7}", code, text,
+                                  round(rng.uniform(0.02, 1.5), 2), rng.choice(pages),
+                                  code is None or code >= 400, external, rng.choice(types)))
+    return results
+
+def make_urls(count: int, seed: int = 2) -> list[str]:
+    rng = random.Random(seed)
+    hosts = ["example.com", "www.example.com", "cdn.example.org", "Example.COM:443", "static.example.net"]
+    return [f"https://{rng.choice(hosts)}/a/{i % 300}/b-{i}/?q={i % 11}#frag" for i in range(count)]
+
+class _FixtureSession:
+    """Stands in for requests.Session: every GET returns the same saved page."""
+
+    def __init__(self, html: str):
+        self.response = SimpleNamespace(text=html, raise_for_status=lambda: None)
+
+    def get(self, *args, **kwargs):
+        return self.response
+
+def _large_page(links: int = 5000) -> str:
+    rows = "\n".join(f'<li><a href="/archive/{i}">Item {i}</a> <img src="/thumbs/{i}.png"></li>' for i in range(links))
+    return f"<html><head><title>Archive</title></head><body><ul>{rows}</ul></body></html>"
+
+@benchmark("scanner.get_all_links[article]")
+def _parse_article(size):
+    from deadlink.scanner import get_all_links
+    with open(os.path.join(FIXTURES, 'article.html'), encoding='utf-8') as f:
+        session = _FixtureSession(f.read())
+    return (lambda: get_all_links("https://www.example.com/blog/release-notes", session=session)), 1
+
+@benchmark("scanner.get_all_links[5k links]")
+def _parse_large(size):
+    from deadlink.scanner import get_all_links
+    session = _FixtureSession(_large_page())
+    return (lambda: get_all_links("https://www.example.com/archive", session=session)), 1
+
+@benchmark("utils.normalize_url[warm]")
+def _normalize(size):
+    from deadlink.utils import normalize_url
+    urls = make_urls(10_000)
+    return (lambda: [normalize_url(u) for u in urls]), len(urls)
+
+@benchmark("utils.normalize_url[cold]")
+def _normalize_cold(size):
+    from deadlink.utils import normalize_url
+    # Bypass the lru_cache to time the parsing itself
+    normalize = normalize_url.__wrapped__
+    urls = make_urls(10_000)
+    return (lambda: [normalize(u) for u in urls]), len(urls)
+
+@benchmark("utils.is_external_url[warm]")
+def _is_external(size):
+    from deadlink.utils import is_external_url
+    urls = make_urls(10_000)
+    return (lambda: [is_external_url(u, "https://www.example.com/") for u in urls]), len(urls)
+
+@benchmark("utils.is_external_url[cold]")
+def _is_external_cold(size):
+    from deadlink.utils import is_external_url, _domain_of
+    urls = make_urls(10_000)
+
+    def run():
+        _domain_of.cache_clear()
+        return [is_external_url(u, "https://www.example.com/") for u in urls]
+    return run, len(urls)
+
+@benchmark("canonical.URLCanonicalizer.normalize[cold]")
+def _canonical(size):
+    from deadlink.canonical import URLCanonicalizer
+    urls = make_urls(10_000)
+
+    def run():
+        canonicalizer = URLCanonicalizer("https://www.example.com/")
+        return [canonicalizer.normalize(u) for u in urls]
+    return run, len(urls)
+
+@benchmark("crawler.should_exclude[1000 rules]")
+def _exclude(size):
+    from deadlink.crawler import should_exclude
+    from deadlink.exclusion import ExclusionMatcher
+    rules = []
+    for i in range(1000):
+        rules.append([f"/private-{i}/", f"^https://cdn{i}.example.org", rf"\.(zip|tar)\?v={i}$", rf"tracking-{i}\.js"][i % 4])
+    matcher = ExclusionMatcher(rules)
+    urls = make_urls(10_000)
+    return (lambda: [should_exclude(u, matcher) for u in urls]), len(urls)
+
+@benchmark("reporter.generate_report", scaled=True)
+def _report(size):
+    from deadlink.reporter import generate_report
+    results = make_results(size)
+    return (lambda: generate_report(results)), size
+
+@benchmark("reporter.generate_csv_report", scaled=True)
+def _csv(size):
+    from deadlink.reporter import generate_csv_report
+    results = make_results(size)
+    path = os.path.join(_scratch(), 'report.csv')
+    return (lambda: generate_csv_report(results, path, "https://www.example.com")), size
+
+@benchmark("reporter.generate_pdf_report", scaled=True)
+def _pdf(size):
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        return None, "reportlab not installed"
+    from deadlink.reporter import generate_pdf_report
+    results = make_results(size)
+    path = os.path.join(_scratch(), 'report.pdf')
+    return (lambda: generate_pdf_report(results, path, "https://www.example.com")), size
+
+@benchmark("database.save_session", scaled=True)
+def _save(size):
+    from deadlink.database import DatabaseManager
+    results = make_results(size)
+    db = DatabaseManager(os.path.join(_scratch(), f'save-{size}.db'))
+    return (lambda: db.save_session("https://www.example.com", "Crawl", results, "bench")), size
+
+@benchmark("database.get_session_results", scaled=True)
+def _load(size):
+    from deadlink.database import DatabaseManager
+    db = DatabaseManager(os.path.join(_scratch(), f'load-{size}.db'))
+    session_id = db.save_session("https://www.example.com", "Crawl", make_results(size), "bench")
+    return (lambda: db.get_session_results(session_id)), size
+
+_SCRATCH = []
+
+def _scratch() -> str:
+    if not _SCRATCH:
+        _SCRATCH.append(tempfile.mkdtemp(prefix='deadlink-bench-'))
+    return _SCRATCH[0]
+
+def _calibration_workload():
+    # Fixed pure-Python work (dicts, strings, sorting) standing in for "how fast is this machine right now"
+    counts = {}
+    for i in range(20000):
+        key = f"k{i % 997}"
+        counts[key] = counts.get(key, 0) + i
+    return sorted(counts.items(), key=lambda item: item[1])[:10]
+
+def measure(fn, repeat: int) -> float:
+    """Best time per call in seconds."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline microbenchmarks with baseline comparison")
+    parser.add_argument('--scale', choices=sorted(SIZES), default='small', help="Result-set sizes for scaled benchmarks (default: small)")
+    parser.add_argument('--only', metavar='TEXT', help="Run only benchmarks whose name contains TEXT")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark, best is kept (default: 5)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON (default: benchmarks/baseline_micro.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Write this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=25, help="Percent slowdown counted as a regression (default: 25)")
+    parser.add_argument('--output', help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    baseline, baseline_calibration = {}, None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            stored = json.load(f)
+        baseline, baseline_calibration = stored.get('benchmarks', {}), stored.get('calibration')
+
+    # Comparisons are scaled by the calibration ratio, so a machine that is
+    # uniformly slower today (frequency scaling, noisy neighbours) is not a regression
+    calibration = measure(_calibration_workload, args.repeat)
+    scale = calibration / baseline_calibration if baseline_calibration else 1.0
+    if baseline:
+        print(f"Calibration: {calibration * 1000:.2f} ms ({(scale - 1) * 100:+.1f}% vs baseline machine state)\n")
+
+    runs = {}
+    regressions = []
+    print(f"{'benchmark':45} {'size':>9} {'per call':>12} {'per item':>10} {'vs baseline':>12}")
+    try:
+        for name, (setup, scaled) in BENCHMARKS.items():
+            if args.only and args.only not in name:
+                continue
+            for size in (SIZES[args.scale] if scaled else [None]):
+                key = f"{name}[{size}]" if size else name
+                fn, items = setup(size)
+                if fn is None:
+                    print(f"{key:45} {'':>9} skipped: {items}")
+                    continue
+                seconds = measure(fn, args.repeat)
+                runs[key] = {'seconds': seconds, 'items': items}
+                change = ""
+                old = baseline.get(key)
+                if old:
+                    delta = (seconds / scale - old['seconds']) / old['seconds'] * 100
+                    change = f"{delta:+.1f}%"
+                    if delta > args.threshold:
+                        change += " ⚠️"
+                        regressions.append(key)
+                print(f"{key:45} {size or '':>9} {seconds * 1000:10.3f}ms {seconds / items * 1e6:8.2f}µs {change:>12}")
+    finally:
+        if _SCRATCH:
+            shutil.rmtree(_SCRATCH[0], ignore_errors=True)
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'calibration': calibration,
+        'benchmarks': runs,
+    }
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) more than {args.threshold:.0f}% slower than the baseline: {', '.join(regressions)}")
+        sys.exit(1)
+    if baseline:
+        print("\n✅ No regressions against the baseline")
+
+if __name__ == '__main__':
+    main()
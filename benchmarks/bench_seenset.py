@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for crawler seen-sets.
+
+Adds N synthetic URLs to each seen-set mode and then looks up N seen and
+N unseen URLs. Reports the time per operation, the traced peak memory and
+the false-positive rate observed on the unseen URLs.
+
+Usage:
+    python benchmarks/bench_seenset.py [--urls 1000000] [--modes memory disk bloom]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.seenset import seen_set_factory, SEEN_SET_MODES
+
+def make_url(i: int, prefix: str = "") -> str:
+    return f"https://www.example{i % 97}.com/{prefix}section-{i % 1013}/article-{i}?ref=nav&page={i % 7}"
+
+def run(mode: str, count: int, capacity: int) -> dict:
+    tracemalloc.start()
+    seen = seen_set_factory(mode, capacity=capacity)()
+    start = time.perf_counter()
+    for i in range(count):
+        key = make_url(i)
+        if key not in seen:
+            seen.add(key)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = sum(make_url(i) in seen for i in range(count))
+    false_positives = sum(make_url(i, "new/") in seen for i in range(count))
+    lookup_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if hasattr(seen, 'close'):
+        seen.close()
+    return {
+        'add_us': add_time / count * 1e6,
+        'lookup_us': lookup_time / (2 * count) * 1e6,
+        'peak_mb': peak / 1e6,
+        'missed': count - hits,
+        'fp_rate': false_positives / count,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare seen-set modes")
+    parser.add_argument('--urls', type=int, default=1_000_000, help="URLs to add (default: 1000000)")
+    parser.add_argument('--modes', nargs='+', default=list(SEEN_SET_MODES), choices=SEEN_SET_MODES)
+    parser.add_argument('--capacity', type=int, default=5_000_000, help="Bloom filter capacity (default: 5000000)")
+    args = parser.parse_args()
+
+    print(f"{args.urls} URLs\n")
+    print(f"{'mode':8} {'add µs':>8} {'lookup µs':>10} {'peak MB':>9} {'missed':>7} {'FP rate':>9}")
+    for mode in args.modes:
+        r = run(mode, args.urls, args.capacity)
+        print(f"{mode:8} {r['add_us']:8.2f} {r['lookup_us']:10.2f} {r['peak_mb']:9.1f} {r['missed']:7d} {r['fp_rate']:9.5f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the GUI (and the deadlink package).
+
+Imports the target module in a fresh interpreter under `python -X importtime`,
+reports the cumulative import time and the slowest top-level imports, and
+checks that modules meant to load lazily (HTTP stack, parsers, tray and
+notification backends, the history database) were not imported at startup.
+With --window it also times constructing the main window and drawing it once,
+which needs a display.
+
+Usage:
+    python benchmarks/bench_startup.py [--module deadlink_gui] [--repeat 5]
+                                       [--budget-ms 400] [--window]
+
+Exits with status 1 if the budget is exceeded or a deferred module was loaded.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Top-level packages that must not be imported before the first window is up
+DEFERRED = ['requests', 'urllib3', 'bs4', 'lxml', 'reportlab', 'PIL', 'pystray', 'plyer', 'sqlite3',
+            'deadlink.crawler', 'deadlink.scanner', 'deadlink.control', 'deadlink.database']
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+WINDOW_SNIPPET = """
+import time
+start = time.perf_counter()
+import deadlink_gui
+app = deadlink_gui.DeadLinkCheckerGUI()
+app.update()
+print(f"WINDOW {time.perf_counter() - start:.6f}")
+app.destroy()
+"""
+
+def run_python(args: list[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, cwd=SRC)
+
+def measure_import(module: str) -> tuple[float, list[tuple[str, float]], set[str]]:
+    """
+    Import `module` once in a new interpreter.
+
+    Returns its cumulative import time in ms, its direct imports with their
+    cumulative times, and every module imported on its behalf.
+    """
+    proc = run_python(['-X', 'importtime', '-c', f'import {module}'])
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} failed")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            entries.append((len(match.group(3)), match.group(4), int(match.group(2)) / 1000))
+
+    # -X importtime prints a module after everything it imported, indented one level deeper
+    position = max(i for i, (_, name, _) in enumerate(entries) if name == module)
+    depth, _, total_ms = entries[position]
+    children = []
+    modules = set()
+    for child_depth, name, ms in reversed(entries[:position]):
+        if child_depth <= depth:
+            break
+        modules.add(name)
+        if child_depth == depth + 2:
+            children.append((name, ms))
+    return total_ms, children, modules
+
+def measure_window() -> float:
+    proc = run_python(['-c', WINDOW_SNIPPET])
+    match = re.search(r'WINDOW ([\d.]+)', proc.stdout)
+    if proc.returncode != 0 or not match:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "window did not open")
+    return float(match.group(1)) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GUI startup import time")
+    parser.add_argument('--module', default='deadlink_gui', help="Module to import (default: deadlink_gui)")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs to take the best of")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Fail if the best import time exceeds this")
+    parser.add_argument('--top', type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument('--window', action='store_true', help="Also time window construction (needs a display)")
+    args = parser.parse_args()
+
+    try:
+        runs = [measure_import(args.module) for _ in range(args.repeat)]
+    except RuntimeError as e:
+        print(f"Could not import {args.module}: {e}")
+        sys.exit(2)
+
+    best_ms, top_level, modules = min(runs, key=lambda run: run[0])
+    print(f"import {args.module}: best {best_ms:.1f} ms of {args.repeat} "
+          f"(median {sorted(r[0] for r in runs)[len(runs) // 2]:.1f} ms)")
+    print(f"\nSlowest imports of {args.module}:")
+    for name, ms in sorted(top_level, key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    loaded = [name for name in DEFERRED if name in modules]
+    if loaded:
+        failed = True
+        print(f"\n❌ Loaded at startup but should be deferred: {', '.join(loaded)}")
+    else:
+        print(f"\n✅ No deferred modules loaded at startup")
+
+    if args.budget_ms is not None:
+        if best_ms > args.budget_ms:
+            failed = True
+            print(f"❌ Over budget: {best_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        else:
+            print(f"✅ Within budget: {best_ms:.1f} ms <= {args.budget_ms:.1f} ms")
+
+    if args.window:
+        try:
+            window_ms = min(measure_window() for _ in range(args.repeat))
+            print(f"\nTime to first window: {window_ms:.1f} ms")
+        except RuntimeError as e:
+            print(f"\nCould not open the window: {e}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
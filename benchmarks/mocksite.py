@@ -0,0 +1,226 @@
+"""
+Synthetic websites served from localhost, for end-to-end crawl benchmarks.
+
+A MockSite serves a generated site on 127.0.0.1 plus a number of
+"external" hosts on other loopback addresses (127.0.0.2, ...), each with
+its own server so per-host behaviour can differ:
+
+- Pages /p/<i>.html form a tree with `fanout` children per page. Each page
+  also links back to the root and to `broken_links` missing pages.
+- Each page carries its own assets according to `assets` (link type ->
+  count per page), plus `shared_assets` site-wide files that every page
+  links to.
+- `external_links` per page point at the external hosts in turn. Of those
+  hosts, `slow_hosts` answer after `slow_ms`, and `head_reject_hosts`
+  return 405 to HEAD so the checker has to fall back to GET.
+- Every response is delayed by a latency drawn from `latency` ('fixed',
+  'uniform', 'exponential' or 'lognormal') with mean `latency_ms` and
+  spread `jitter_ms`. A fraction `error_rate` of non-page URLs answer
+  500 or 404, chosen deterministically from the URL.
+- /sitemap.xml lists every page.
+
+Loopback addresses other than 127.0.0.1 work out of the box on Linux.
+Where they do not (macOS without aliases), the external hosts fall back
+to 127.0.0.1 on their own ports, and the crawler then treats their links
+as internal.
+"""
+
+import hashlib
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ASSET_PATHS = {
+    'Image': ('img', 'png'),
+    'Script': ('js', 'js'),
+    'Styles/Icon': ('css', 'css'),
+    'Iframe': ('embed', 'html'),
+}
+
+@dataclass
+class SiteSpec:
+    pages: int = 200
+    fanout: int = 5
+    assets: dict = field(default_factory=lambda: {'Image': 3, 'Script': 1, 'Styles/Icon': 1})
+    shared_assets: int = 4
+    broken_links: int = 1
+    external_links: int = 4
+    external_hosts: int = 6
+    slow_hosts: int = 1
+    slow_ms: float = 400
+    head_reject_hosts: int = 1
+    latency: str = 'lognormal'
+    latency_ms: float = 20
+    jitter_ms: float = 10
+    error_rate: float = 0.02
+    seed: int = 1
+
+def _fraction(text: str) -> float:
+    """Stable pseudo-random number in [0, 1) for `text`."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little') / 2 ** 64
+
+class _Latency:
+    def __init__(self, spec: SiteSpec):
+        self.spec = spec
+        self._rng = random.Random(spec.seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        mean, jitter = self.spec.latency_ms, self.spec.jitter_ms
+        with self._lock:
+            if self.spec.latency == 'fixed':
+                ms = mean
+            elif self.spec.latency == 'uniform':
+                ms = self._rng.uniform(mean - jitter, mean + jitter)
+            elif self.spec.latency == 'exponential':
+                ms = self._rng.expovariate(1 / mean) if mean > 0 else 0
+            elif self.spec.latency == 'lognormal':
+                if mean <= 0:
+                    ms = 0
+                else:
+                    sigma2 = math.log(1 + (jitter / mean) ** 2)
+                    ms = self._rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+            else:
+                raise ValueError(f"Unknown latency distribution: {self.spec.latency}")
+        return max(ms, 0) / 1000
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def _respond(self, head: bool):
+        host = self.server.host_info
+        delay = host['delay'] if host['delay'] is not None else self.server.site.latency.sample()
+        if delay:
+            time.sleep(delay)
+        if head and host['reject_head']:
+            return self._send(405, b"")
+        status, body, content_type = self.server.site.render(host, self.path)
+        self._send(status, b"" if head else body, content_type, len(body))
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain", length: int = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body) if length is None else length))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+class MockSite:
+    """Serve a SiteSpec; use as a context manager, then crawl `root_url` or `sitemap_url`."""
+
+    def __init__(self, spec: SiteSpec = None):
+        self.spec = spec or SiteSpec()
+        self.latency = _Latency(self.spec)
+        self._servers = []
+        self.hosts = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        spec = self.spec
+        self.main = self._serve('127.0.0.1', delay=None, reject_head=False, main=True)
+        for i in range(spec.external_hosts):
+            slow = i < spec.slow_hosts
+            reject = spec.slow_hosts <= i < spec.slow_hosts + spec.head_reject_hosts
+            try:
+                host = self._serve(f'127.0.0.{i + 2}', delay=spec.slow_ms / 1000 if slow else None, reject_head=reject)
+            except OSError:
+                host = self._serve('127.0.0.1', delay=spec.slow_ms / 1000 if slow else None, reject_head=reject)
+            self.hosts.append(host)
+
+    def _serve(self, address: str, delay, reject_head: bool, main: bool = False) -> dict:
+        server = ThreadingHTTPServer((address, 0), _Handler)
+        server.daemon_threads = True
+        server.site = self
+        server.host_info = {'base': f"http://{address}:{server.server_address[1]}", 'delay': delay,
+                            'reject_head': reject_head, 'main': main}
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._servers.append(server)
+        return server.host_info
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers.clear()
+
+    @property
+    def root_url(self) -> str:
+        return f"{self.main['base']}/p/0.html"
+
+    @property
+    def sitemap_url(self) -> str:
+        return f"{self.main['base']}/sitemap.xml"
+
+    def render(self, host: dict, path: str) -> tuple[int, bytes, str]:
+        path = path.split('?', 1)[0]
+        if host['main'] and path == '/sitemap.xml':
+            return 200, self._sitemap(), "application/xml"
+        if host['main'] and path.startswith('/p/') and path.endswith('.html'):
+            try:
+                page = int(path[3:-5])
+            except ValueError:
+                page = -1
+            if 0 <= page < self.spec.pages:
+                return 200, self._page(page), "text/html"
+            return 404, b"not found", "text/plain"
+        if path.startswith('/missing/'):
+            return 404, b"not found", "text/plain"
+        roll = _fraction(host['base'] + path)
+        if roll < self.spec.error_rate / 2:
+            return 500, b"error", "text/plain"
+        if roll < self.spec.error_rate:
+            return 404, b"not found", "text/plain"
+        return 200, b"x" * 64, "application/octet-stream"
+
+    def _page(self, page: int) -> bytes:
+        spec, base = self.spec, self.main['base']
+        parts = ["<html><head><title>Page %d</title>" % page]
+        for i in range(spec.shared_assets):
+            parts.append(f'<script src="{base}/static/shared-{i}.js"></script>')
+        for link_type, count in spec.assets.items():
+            folder, ext = ASSET_PATHS.get(link_type, ('files', 'bin'))
+            for i in range(count):
+                url = f"{base}/{folder}/{page}-{i}.{ext}"
+                if link_type == 'Image':
+                    parts.append(f'<img src="{url}">')
+                elif link_type == 'Script':
+                    parts.append(f'<script src="{url}"></script>')
+                elif link_type == 'Styles/Icon':
+                    parts.append(f'<link rel="stylesheet" href="{url}">')
+                else:
+                    parts.append(f'<iframe src="{url}"></iframe>')
+        parts.append("</head><body>")
+        parts.append(f'<a href="{base}/p/0.html">home</a>')
+        for child in range(page * spec.fanout + 1, min(page * spec.fanout + spec.fanout + 1, spec.pages)):
+            parts.append(f'<a href="/p/{child}.html">child {child}</a>')
+        for i in range(spec.broken_links):
+            parts.append(f'<a href="/missing/{page}-{i}.html">broken</a>')
+        if self.hosts:
+            for i in range(spec.external_links):
+                host = self.hosts[(page * spec.external_links + i) % len(self.hosts)]
+                parts.append(f'<a href="{host["base"]}/ext/{page}-{i}">external</a>')
+        parts.append("</body></html>")
+        return "\n".join(parts).encode()
+
+    def _sitemap(self) -> bytes:
+        base = self.main['base']
+        urls = "".join(f"<url><loc>{base}/p/{i}.html</loc></url>" for i in range(self.spec.pages))
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'.encode()
@@ -31,7 +31,6 @@ pyinstaller --noconfirm \
     --hidden-import "plyer.platforms.linux.notification" \
     --hidden-import "pystray._appindicator" \
     --collect-all "customtkinter" \
-    --collect-all "CTkTable" \
     --distpath "$DIST_DIR" \
     "src/deadlink_gui.py"
 
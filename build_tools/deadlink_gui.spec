@@ -13,7 +13,7 @@ a = Analysis(
         'tkinter',
         'tkinter.filedialog',
         'tkinter.messagebox',
-        'CTkTable',
+        'tkinter.ttk',
         
         # Tray & Notifications
         'pystray',
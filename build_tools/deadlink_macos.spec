@@ -9,7 +9,7 @@ a = Analysis(
     datas=[],
     hiddenimports=[
         'customtkinter',
-        'CTkTable',
+        'tkinter.ttk',
         'pystray',
         'pystray._darwin',
         'plyer',
@@ -1,11 +1,72 @@
-from .models import LinkResult
-from .utils import setup_windows_encoding, is_external_url, get_status_text, normalize_url, open_file
-from .scanner import get_all_links, check_link
-from .crawler import crawl_website, get_sitemap_urls, crawl_sitemap, check_all_links
-from .reporter import generate_report, get_report_filename, save_report, generate_csv_report, generate_pdf_report
-from .database import DatabaseManager
+"""
+Dead link checker package.
+
+Public names are loaded on first access (PEP 562), so `import deadlink`
+stays cheap and only the submodules a caller actually uses get imported.
+The crawler and its HTTP stack, for example, load the first time
+check_all_links is looked up.
+"""
+
+import importlib
 from .version import VERSION
 
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'LinkResult': 'models',
+    'setup_windows_encoding': 'utils',
+    'is_external_url': 'utils',
+    'get_status_text': 'utils',
+    'normalize_url': 'utils',
+    'open_file': 'utils',
+    'get_all_links': 'scanner',
+    'check_link': 'scanner',
+    'crawl_website': 'crawler',
+    'get_sitemap_urls': 'crawler',
+    'crawl_sitemap': 'crawler',
+    'check_all_links': 'crawler',
+    'TimeoutPolicy': 'timeouts',
+    'RetryPolicy': 'retry',
+    'is_transient': 'retry',
+    'ExclusionMatcher': 'exclusion',
+    'validate_patterns': 'exclusion',
+    'URLCanonicalizer': 'canonical',
+    'URLKey': 'canonical',
+    'RunController': 'control',
+    'ProgressChannel': 'events',
+    'ProgressBatch': 'events',
+    'ProgressCounters': 'events',
+    'ResultModel': 'resultmodel',
+    'SearchIndex': 'search',
+    'parse_query': 'search',
+    'LogSpool': 'logspool',
+    'generate_report': 'reporter',
+    'generate_summary': 'reporter',
+    'generate_batch_summary': 'reporter',
+    'get_report_filename': 'reporter',
+    'save_report': 'reporter',
+    'generate_csv_report': 'reporter',
+    'generate_pdf_report': 'reporter',
+    'DatabaseManager': 'database',
+    'CheckServer': 'server',
+    'remote_check': 'server',
+    'check_batch': 'batch',
+    'FairScheduler': 'batch',
+    'StatusCache': 'batch',
+    'SQLiteFrontier': 'frontier',
+    'RemoteFrontier': 'frontier',
+    'seed_crawl': 'frontier',
+    'run_worker': 'frontier',
+    'DiskSeenSet': 'seenset',
+    'BloomSeenSet': 'seenset',
+    'seen_set_factory': 'seenset',
+    'RunProfile': 'timing',
+    'CrawlMetrics': 'metrics',
+    'serve_metrics': 'metrics',
+    'RunDiagnostics': 'diagnostics',
+    'NDJSONReporter': 'ndjson',
+    'ColumnarReader': 'columnar',
+}
+
 __all__ = [
     'VERSION',
     'LinkResult',
@@ -20,10 +81,56 @@ __all__ = [
     'get_sitemap_urls',
     'crawl_sitemap',
     'check_all_links',
+    'TimeoutPolicy',
+    'RetryPolicy',
+    'is_transient',
+    'ExclusionMatcher',
+    'validate_patterns',
+    'URLCanonicalizer',
+    'URLKey',
+    'RunController',
+    'ProgressChannel',
+    'ProgressBatch',
+    'ProgressCounters',
+    'ResultModel',
+    'SearchIndex',
+    'parse_query',
+    'LogSpool',
     'generate_report',
+    'generate_summary',
+    'generate_batch_summary',
     'get_report_filename',
     'save_report',
     'generate_csv_report',
     'generate_pdf_report',
-    'DatabaseManager'
+    'DatabaseManager',
+    'CheckServer',
+    'remote_check',
+    'check_batch',
+    'FairScheduler',
+    'StatusCache',
+    'SQLiteFrontier',
+    'RemoteFrontier',
+    'seed_crawl',
+    'run_worker',
+    'DiskSeenSet',
+    'BloomSeenSet',
+    'seen_set_factory',
+    'RunProfile',
+    'CrawlMetrics',
+    'serve_metrics',
+    'RunDiagnostics',
+    'NDJSONReporter',
+    'ColumnarReader'
 ]
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
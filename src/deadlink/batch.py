@@ -0,0 +1,221 @@
+"""
+Check many sites in one process.
+
+Sites run concurrently but every HTTP request, whichever site it belongs
+to, first takes a slot from one FairScheduler, so the total number of
+requests in flight stays within a single budget. Free slots are handed to
+sites round-robin, so a site with thousands of queued links gets the same
+share as one with ten. A StatusCache shared by all sites checks links that
+appear on several sites (CDNs, social profiles, ...) only once.
+"""
+
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, Optional
+from .models import LinkResult
+from .retry import is_transient
+
+def read_targets(lines: Iterable[str]) -> list[str]:
+    """
+    Parse a target list: one URL per line; blank lines, `#` comment lines and
+    anything after the URL are ignored.
+
+    URLs without a scheme get https://; duplicates are dropped, keeping the first.
+    """
+    targets = []
+    seen = set()
+    for line in lines:
+        words = line.split()
+        if not words or words[0].startswith('#'):
+            continue
+        url = words[0]
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        if url not in seen:
+            seen.add(url)
+            targets.append(url)
+    return targets
+
+class FairScheduler:
+    """
+    A global budget of concurrent requests, shared round-robin between sites.
+
+    Each site takes slots through its own lane(). While the budget is used
+    up, waiting requests queue per site and every released slot goes to the
+    next site in turn that has one waiting, regardless of how many worker
+    threads each site runs.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiting: dict[str, deque] = {}
+        self._turns: deque = deque()
+        self.granted: dict[str, int] = {}
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def lane(self, site: str) -> '_Lane':
+        """The slot source for one site's requests."""
+        return _Lane(self, site)
+
+    def acquire(self, site: str):
+        with self._cond:
+            if self._in_use < self.capacity and not self._turns:
+                self._grant(site)
+                return
+            ticket = [False]
+            queue = self._waiting.setdefault(site, deque())
+            if not queue:
+                self._turns.append(site)
+            queue.append(ticket)
+            while not ticket[0]:
+                self._cond.wait()
+
+    def release(self):
+        with self._cond:
+            self._in_use -= 1
+            while self._in_use < self.capacity and self._turns:
+                site = self._turns.popleft()
+                queue = self._waiting[site]
+                queue.popleft()[0] = True
+                self._grant(site)
+                if queue:
+                    self._turns.append(site)
+                else:
+                    del self._waiting[site]
+            self._cond.notify_all()
+
+    def _grant(self, site: str):
+        self._in_use += 1
+        self.granted[site] = self.granted.get(site, 0) + 1
+
+class _Lane:
+    """One site's view of a FairScheduler; passed to the crawler as `limiter`."""
+
+    def __init__(self, scheduler: FairScheduler, site: str):
+        self._scheduler = scheduler
+        self.site = site
+
+    @contextmanager
+    def slot(self):
+        self._scheduler.acquire(self.site)
+        try:
+            yield
+        finally:
+            self._scheduler.release()
+
+class StatusCache:
+    """
+    Link results shared between sites, keyed by canonical URL.
+
+    A link already checked (or being checked) for another site is not
+    requested again: the caller gets a copy of that result with its own
+    URL spelling, page and link type. Transient failures are not kept,
+    so the next site to see the link checks it afresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: dict[str, LinkResult] = {}
+        self._pending: dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key: str, url: str, found_on: str, link_type: str, fetch: Callable[[], LinkResult]) -> LinkResult:
+        """Return the cached result for `key`, or call `fetch` once for all concurrent callers."""
+        while True:
+            with self._lock:
+                cached = self._results.get(key)
+                if cached is not None:
+                    self.hits += 1
+                    return replace(cached, url=url, found_on=found_on, link_type=link_type, retries=0)
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another site is checking this link; use its result unless it was transient
+            pending.wait()
+            with self._lock:
+                if key not in self._results:
+                    continue
+
+        try:
+            result = fetch()
+            if result is not None and not is_transient(result):
+                with self._lock:
+                    self._results[key] = result
+            return result
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+@dataclass
+class SiteRun:
+    """Outcome of checking one site in a batch."""
+    url: str
+    results: list[LinkResult] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def dead(self) -> int:
+        return sum(1 for r in self.results if r.is_dead)
+
+def check_batch(targets: list[str], max_workers: int = 10, max_sites: int = 4, site_options: Callable[[str], dict] = None,
+                on_site_done: Callable[[SiteRun, int, int], None] = None, controller=None,
+                scheduler: FairScheduler = None, status_cache: StatusCache = None) -> list[SiteRun]:
+    """
+    Check several sites under one request budget and one status cache.
+
+    `max_workers` is the global number of concurrent requests; up to
+    `max_sites` sites are crawled at once. `site_options(url)` returns the
+    check_all_links keyword arguments for a site (progress output, timeouts,
+    ...); max_workers, controller, limiter and status_cache are filled in
+    here. `on_site_done(run, done, total)` is called as each site finishes.
+    Returns one SiteRun per target, in target order.
+    """
+    from .crawler import check_all_links
+    from .control import RunController
+
+    scheduler = scheduler or FairScheduler(max_workers)
+    status_cache = status_cache if status_cache is not None else StatusCache()
+    controller = controller or RunController()
+    runs = [SiteRun(url) for url in targets]
+    done_lock = threading.Lock()
+    done = [0]
+
+    def run_site(run: SiteRun):
+        if controller.stopped:
+            return
+        options = dict(site_options(run.url)) if site_options else {}
+        options.update(max_workers=max_workers, controller=controller, limiter=scheduler.lane(run.url), status_cache=status_cache)
+        start = time.perf_counter()
+        try:
+            run.results = check_all_links(run.url, **options)
+        except Exception as e:
+            run.error = str(e)
+        run.elapsed = time.perf_counter() - start
+        if on_site_done:
+            with done_lock:
+                done[0] += 1
+                on_site_done(run, done[0], len(runs))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_sites, len(runs)))) as executor:
+        for future in [executor.submit(run_site, run) for run in runs]:
+            future.result()
+    return runs
@@ -0,0 +1,104 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, quote
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# RFC 3986 unreserved characters never need percent-encoding
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+_PATH_SAFE = "/%:@!$&'()*+,;=-._~"
+_QUERY_SAFE = _PATH_SAFE + "?"
+
+def _normalize_escapes(text: str, safe: str) -> str:
+    """Percent-encode unsafe characters, decode escaped unreserved ones and uppercase the rest."""
+    text = quote(text, safe=safe)
+
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else '%' + match.group(1).upper()
+
+    return _ESCAPE.sub(fix, text)
+
+def site_host(host: str) -> str:
+    """Host used to decide whether two URLs belong to the same site ('www.' ignored, as in is_external_url)."""
+    return host.replace('www.', '')
+
+class URLKey(NamedTuple):
+    """A parsed, canonical URL. Fragments are dropped; str() gives the canonical URL."""
+    scheme: str
+    host: str
+    port: Optional[int]
+    path: str
+    query: str
+
+    def __str__(self):
+        netloc = self.host if self.port is None else f"{self.host}:{self.port}"
+        url = f"{self.scheme}://{netloc}{self.path}"
+        return f"{url}?{self.query}" if self.query else url
+
+class URLCanonicalizer:
+    """
+    Parses URLs once into cached URLKeys for deduplication and host classification.
+
+    Canonical form: lowercase scheme and host (IDNA-encoded), default port
+    removed, percent-encoding normalized, fragment dropped and trailing
+    slash stripped from non-root paths. With `sort_query`, query parameters
+    are sorted so `?b=2&a=1` and `?a=1&b=2` are the same URL.
+    """
+
+    def __init__(self, base_url: str = None, sort_query: bool = False, cache_size: int = 65536):
+        self.sort_query = sort_query
+        self.key = lru_cache(maxsize=cache_size)(self._parse)
+        self._site = lru_cache(maxsize=1024)(self._site_of)
+        self.base_url = base_url
+        self.base_site = self._site(base_url) if base_url else None
+
+    def _parse(self, url: str) -> URLKey:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').rstrip('.')
+        if host and not host.isascii():
+            try:
+                host = host.encode('idna').decode('ascii')
+            except UnicodeError:
+                pass
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port == DEFAULT_PORTS.get(scheme):
+            port = None
+
+        path = _normalize_escapes(parts.path, _PATH_SAFE) or '/'
+        if path.endswith('/') and len(path) > 1:
+            path = path[:-1]
+
+        query = _normalize_escapes(parts.query, _QUERY_SAFE)
+        if self.sort_query and query:
+            query = '&'.join(sorted(p for p in query.split('&') if p))
+        return URLKey(scheme, host, port, path, query)
+
+    def _site_of(self, url: str) -> str:
+        # The netloc is_external_url compares, with the host and port in canonical form:
+        # userinfo and non-default ports still make a different site
+        key = self.key(url)
+        userinfo, at, _ = urlsplit(url.strip()).netloc.rpartition('@')
+        site = site_host(key.host) if key.port is None else f"{site_host(key.host)}:{key.port}"
+        return f"{userinfo.lower()}{at}{site}"
+
+    def normalize(self, url: str) -> str:
+        """Return the canonical string form of `url`."""
+        return str(self.key(url))
+
+    def host(self, url: str) -> str:
+        return self.key(url).host
+
+    def is_external(self, url: str, base_url: str = None) -> bool:
+        """Check if `url` is on a different site than `base_url` (default: the canonicalizer's base URL)."""
+        base_site = self.base_site if base_url is None or base_url == self.base_url else self._site(base_url)
+        return self._site(url) != base_site
+
+    def cache_info(self):
+        return self.key.cache_info()
@@ -0,0 +1,250 @@
+"""
+Columnar export of stored link results for analytics.
+
+write_columnar() takes batches of result rows (tuples in COLUMNS order, as
+DatabaseManager.iter_result_batches yields them) and writes them column by
+column:
+
+- format='parquet' (needs pyarrow): a zstd-compressed Parquet file with
+  site, status_text, found_on and link_type as dictionary columns.
+- format='dlcol': the stdlib-only fallback. Each batch becomes a row group
+  of zlib-compressed column chunks; dictionary columns hold uint32 codes
+  and their values are stored once, after the last row group. A footer
+  indexes every chunk, so ColumnarReader loads only the columns asked for.
+- format='auto': parquet when pyarrow is installed, dlcol otherwise.
+
+dlcol layout (integers little-endian):
+
+    MAGIC | column chunks... | dictionaries... | footer (zlib JSON) | footer length (u64) | MAGIC
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b"DLCOL1\n\x00"
+FORMATS = ('auto', 'parquet', 'dlcol')
+
+# (name, type); 'dict' columns are dictionary-encoded strings
+COLUMNS = (
+    ('session_id', 'int'),
+    ('site', 'dict'),
+    ('timestamp', 'str'),
+    ('url', 'str'),
+    ('status_code', 'int'),
+    ('status_text', 'dict'),
+    ('response_time', 'float'),
+    ('found_on', 'dict'),
+    ('is_dead', 'bool'),
+    ('is_external', 'bool'),
+    ('link_type', 'dict'),
+    ('retries', 'int'),
+)
+
+_TYPECODES = {'int': 'q', 'float': 'd', 'bool': 'b'}
+
+def have_pyarrow() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def write_columnar(path: str, batches, format: str = 'auto', level: int = 6) -> tuple[str, str, int]:
+    """
+    Write row batches to `path`; returns (path written, format used, rows).
+
+    With format='auto' and no pyarrow, a '.parquet' path is written as '.dlcol'.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown columnar format: {format} (expected one of {', '.join(FORMATS)})")
+    if format == 'auto':
+        format = 'parquet' if have_pyarrow() else 'dlcol'
+        if format == 'dlcol' and path.endswith('.parquet'):
+            path = path[:-len('.parquet')] + '.dlcol'
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    if format == 'parquet':
+        rows = _write_parquet(path, batches)
+    else:
+        with open(path, 'wb') as f:
+            writer = _DlcolWriter(f, level)
+            for batch in batches:
+                writer.write_batch(batch)
+            writer.close()
+        rows = writer.rows
+    return path, format, rows
+
+def _write_parquet(path: str, batches) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use the dlcol format without it") from e
+    types = {'int': pa.int64(), 'float': pa.float64(), 'bool': pa.bool_(), 'str': pa.string(),
+             'dict': pa.dictionary(pa.int32(), pa.string())}
+    schema = pa.schema([(name, types[kind]) for name, kind in COLUMNS])
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for batch in batches:
+            if not batch:
+                continue
+            arrays = []
+            for (name, kind), values in zip(COLUMNS, zip(*batch)):
+                if kind == 'dict':
+                    arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+                elif kind == 'bool':
+                    arrays.append(pa.array([None if v is None else bool(v) for v in values], type=pa.bool_()))
+                else:
+                    arrays.append(pa.array(values, type=types[kind]))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+    return rows
+
+def _pack(typecode: str, values) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+def _unpack(typecode: str, raw: bytes) -> list:
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tolist()
+
+class _DlcolWriter:
+    def __init__(self, f, level: int):
+        self.f = f
+        self.level = level
+        self.rows = 0
+        self.row_groups = []
+        self.dictionaries = {name: {} for name, kind in COLUMNS if kind == 'dict'}
+        f.write(MAGIC)
+        self.offset = len(MAGIC)
+
+    def _block(self, payload: bytes) -> list:
+        data = zlib.compress(payload, self.level)
+        self.f.write(data)
+        block = [self.offset, len(data)]
+        self.offset += len(data)
+        return block
+
+    def write_batch(self, batch):
+        if not batch:
+            return
+        chunks = []
+        for (name, kind), values in zip(COLUMNS, zip(*batch)):
+            chunk = {}
+            if kind == 'dict':
+                codes = self.dictionaries[name]
+                chunk['codes'] = self._block(_pack('I', [codes.setdefault(v, len(codes)) for v in values]))
+            else:
+                if None in values:
+                    chunk['validity'] = self._block(bytes(v is not None for v in values))
+                if kind == 'str':
+                    encoded = [(v or '').encode('utf-8') for v in values]
+                    chunk['lengths'] = self._block(_pack('I', [len(v) for v in encoded]))
+                    chunk['data'] = self._block(b"".join(encoded))
+                else:
+                    zero = 0.0 if kind == 'float' else 0
+                    chunk['data'] = self._block(_pack(_TYPECODES[kind], [zero if v is None else v for v in values]))
+            chunks.append(chunk)
+        self.row_groups.append({'rows': len(batch), 'columns': chunks})
+        self.rows += len(batch)
+
+    def close(self):
+        dictionaries = {name: self._block(json.dumps(list(codes), ensure_ascii=False).encode('utf-8'))
+                        for name, codes in self.dictionaries.items()}
+        footer = zlib.compress(json.dumps({
+            'version': 1,
+            'rows': self.rows,
+            'columns': [[name, kind] for name, kind in COLUMNS],
+            'dictionaries': dictionaries,
+            'row_groups': self.row_groups,
+        }).encode('utf-8'), self.level)
+        self.f.write(footer)
+        self.f.write(struct.pack('<Q', len(footer)))
+        self.f.write(MAGIC)
+
+class ColumnarReader:
+    """Reads a dlcol file column by column."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a dlcol file: {path}")
+            f.seek(-(8 + len(MAGIC)), os.SEEK_END)
+            length, = struct.unpack('<Q', f.read(8))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Truncated dlcol file: {path}")
+            f.seek(-(8 + len(MAGIC) + length), os.SEEK_END)
+            self._footer = json.loads(zlib.decompress(f.read(length)))
+        self.num_rows = self._footer['rows']
+        self.types = dict(self._footer['columns'])
+        self.columns = list(self.types)
+        self._dictionaries = {}
+
+    def _read(self, f, block) -> bytes:
+        f.seek(block[0])
+        return zlib.decompress(f.read(block[1]))
+
+    def dictionary(self, name: str) -> list:
+        """The distinct values of a dictionary column, indexed by code."""
+        if name not in self._dictionaries:
+            with open(self.path, 'rb') as f:
+                self._dictionaries[name] = json.loads(self._read(f, self._footer['dictionaries'][name]))
+        return self._dictionaries[name]
+
+    def iter_batches(self, columns=None, decode: bool = True):
+        """
+        Yield one {column: values} dict per row group.
+
+        Dictionary columns come back as values, or as their integer codes
+        with decode=False (see dictionary()) for cheap grouping.
+        """
+        columns = list(columns or self.columns)
+        for name in columns:
+            if name not in self.types:
+                raise KeyError(name)
+        index = {name: i for i, name in enumerate(self.columns)}
+        dictionaries = {name: self.dictionary(name) for name in columns if self.types[name] == 'dict' and decode}
+        with open(self.path, 'rb') as f:
+            for group in self._footer['row_groups']:
+                batch = {}
+                for name in columns:
+                    batch[name] = self._column(f, self.types[name], group['columns'][index[name]], dictionaries.get(name))
+                yield batch
+
+    def _column(self, f, kind: str, chunk: dict, dictionary) -> list:
+        if kind == 'dict':
+            codes = _unpack('I', self._read(f, chunk['codes']))
+            return [dictionary[c] for c in codes] if dictionary is not None else codes
+        if kind == 'str':
+            data = self._read(f, chunk['data'])
+            values, pos = [], 0
+            for n in _unpack('I', self._read(f, chunk['lengths'])):
+                values.append(data[pos:pos + n].decode('utf-8'))
+                pos += n
+        else:
+            values = _unpack(_TYPECODES[kind], self._read(f, chunk['data']))
+            if kind == 'bool':
+                values = [bool(v) for v in values]
+        if 'validity' in chunk:
+            values = [v if valid else None for v, valid in zip(values, self._read(f, chunk['validity']))]
+        return values
+
+    def read(self, columns=None) -> dict:
+        """Whole columns as {column: values}."""
+        columns = list(columns or self.columns)
+        result = {name: [] for name in columns}
+        for batch in self.iter_batches(columns):
+            for name in columns:
+                result[name].extend(batch[name])
+        return result
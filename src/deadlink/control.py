@@ -0,0 +1,229 @@
+import socket
+import threading
+import time
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+class _InstrumentedConnection:
+    """
+    Connection mixin: registers with the controller once connected and, while
+    the controller has a profile, times DNS, TCP connect, TLS and TTFB into it.
+    """
+    _controller = None
+
+    def _new_conn(self):
+        profile = self._controller.profile
+        if profile is None:
+            return super()._new_conn()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            # Let urllib3 resolve again and raise its own NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        profile.record('dns', resolved - start, self.host)
+
+        # Connect to the resolved addresses in turn, as create_connection would
+        error = None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = host
+        self._connected_at = time.perf_counter()
+        profile.record('connect', self._connected_at - resolved, self.host)
+        return sock
+
+    def connect(self):
+        self._connected_at = None
+        super().connect()
+        profile = self._controller.profile
+        if profile is not None and self._connected_at is not None and isinstance(self, HTTPSConnection):
+            profile.record('tls', time.perf_counter() - self._connected_at, self.host)
+        self._controller._track(self)
+
+    def getresponse(self, *args, **kwargs):
+        profile = self._controller.profile
+        if profile is None:
+            return super().getresponse(*args, **kwargs)
+        start = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        profile.record('ttfb', time.perf_counter() - start, self.host)
+        return response
+
+class _TrackingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections register their sockets with a RunController so stop() can abort them."""
+
+    def __init__(self, controller: 'RunController', **kwargs):
+        self._controller = controller
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {'_controller': self._controller}
+        TrackedHTTPConnection = type('TrackedHTTPConnection', (_InstrumentedConnection, HTTPConnection), attrs)
+        TrackedHTTPSConnection = type('TrackedHTTPSConnection', (_InstrumentedConnection, HTTPSConnection), attrs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': type('TrackedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': TrackedHTTPConnection}),
+            'https': type('TrackedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': TrackedHTTPSConnection}),
+        }
+
+class RunController:
+    """
+    Pause/resume/stop state shared between a crawl run and whoever drives it.
+
+    Workers call wait_if_paused() before dispatching each request, so pausing
+    stops new requests from starting and resume()/stop() wake them at once.
+    Requests made through session() are tied to the controller, and stop()
+    shuts down their sockets so in-flight requests fail fast instead of
+    running to their timeout.
+
+    Setting `profile` to a deadlink.timing.RunProfile makes those requests
+    record DNS, connect, TLS and time-to-first-byte phases into it.
+    """
+
+    def __init__(self):
+        self.profile = None
+        self._cond = threading.Condition()
+        self._paused = False
+        self._stopped = False
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._connections = weakref.WeakSet()
+        self._tracking_lock = threading.Lock()
+
+    @classmethod
+    def from_events(cls, pause_event=None, stop_event=None) -> 'RunController':
+        """Wrap legacy threading.Event pause/stop flags (polled, without in-flight cancellation)."""
+        if pause_event is None and stop_event is None:
+            return cls()
+        return _EventRunController(pause_event, stop_event)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def pause(self):
+        with self._cond:
+            self._paused = True
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._paused = False
+            self._cond.notify_all()
+        self._abort_connections()
+
+    def wait_if_paused(self) -> bool:
+        """Block while paused. Returns False if the run has been stopped."""
+        with self._cond:
+            while self._paused and not self._stopped:
+                self._cond.wait()
+            return not self._stopped
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep up to `seconds`, waking early on stop. Returns False if the run has been stopped."""
+        deadline = time.monotonic() + seconds
+        with self._cond:
+            while not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return not self._stopped
+
+    def session(self) -> requests.Session:
+        """Return this thread's HTTP session; its connections are aborted when the run stops."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = _TrackingAdapter(self)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            with self._tracking_lock:
+                self._sessions.add(session)
+        return session
+
+    def _track(self, connection):
+        with self._tracking_lock:
+            self._connections.add(connection)
+        if self._stopped:
+            self._abort_connections()
+
+    def _abort_connections(self):
+        with self._tracking_lock:
+            connections = list(self._connections)
+            sessions = list(self._sessions)
+        for connection in connections:
+            sock = getattr(connection, 'sock', None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        for session in sessions:
+            session.close()
+
+class _EventRunController(RunController):
+    """RunController view over caller-owned pause/stop Events."""
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, pause_event=None, stop_event=None):
+        super().__init__()
+        self._pause_event = pause_event
+        self._stop_event = stop_event
+
+    @property
+    def paused(self) -> bool:
+        return bool(self._pause_event and self._pause_event.is_set())
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self._stop_event and self._stop_event.is_set())
+
+    def pause(self):
+        if self._pause_event: self._pause_event.set()
+
+    def resume(self):
+        if self._pause_event: self._pause_event.clear()
+
+    def stop(self):
+        if self._stop_event: self._stop_event.set()
+        if self._pause_event: self._pause_event.clear()
+        self._abort_connections()
+
+    def wait_if_paused(self) -> bool:
+        while self.paused and not self.stopped:
+            time.sleep(self.POLL_INTERVAL)
+        return not self.stopped
+
+    def sleep(self, seconds: float) -> bool:
+        if self._stop_event:
+            return not self._stop_event.wait(seconds)
+        time.sleep(seconds)
+        return True
@@ -1,172 +1,282 @@
 import concurrent.futures
+import time
+from contextlib import nullcontext
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
-import re
 from .models import LinkResult
 from .scanner import get_all_links, check_link
-from .utils import normalize_url, is_external_url
-
-import time
-
-def should_exclude(url: str, patterns: list[str]) -> bool:
-    """Check if a URL matches any of the exclusion patterns."""
+from .canonical import URLCanonicalizer
+from .timeouts import TimeoutPolicy, is_timeout
+from .retry import RetryPolicy, RetryQueue
+from .exclusion import ExclusionMatcher
+from .control import RunController
+from .events import ResultLine, as_reporter
+
+# Linked files that are checked but never crawled as pages
+PAGE_SKIP_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.tar', '.gz', '.mp4', '.mp3', '.doc', '.docx', '.xls', '.xlsx', '.css', '.js')
+
+def should_exclude(url: str, patterns) -> bool:
+    """Check if a URL matches any of the exclusion patterns (a list or a precompiled ExclusionMatcher)."""
     if not patterns:
         return False
-    for pattern in patterns:
-        try:
-            if re.search(pattern, url, re.IGNORECASE):
-                return True
-        except re.error:
-            if pattern.lower() in url.lower():
-                return True
-    return False
-
-def crawl_website(url: str, max_workers: int = 10, timeout: int = 10, max_depth: int = 1, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] = None, pause_event=None, stop_event=None, check_external: bool = True) -> list[LinkResult]:
+    return ExclusionMatcher.of(patterns).matches(url)
+
+def _close_seen(*seen_sets):
+    """Release seen-sets that hold files (see deadlink.seenset); plain sets need nothing."""
+    for seen in seen_sets:
+        close = getattr(seen, 'close', None)
+        if close:
+            close()
+
+def _timeout_for(url: str, timeout, timeout_policy: TimeoutPolicy = None):
+    return timeout_policy.timeout_for(url) if timeout_policy else timeout
+
+def _fetch(link: str, found_on: str, budget, link_type: str, auth: tuple, headers: dict, controller: RunController, limiter=None, status_cache=None, cache_key: str = None, profile=None, metrics=None) -> LinkResult:
+    """check_link, holding a slot from `limiter` (if any) and going through a shared status cache (if any)."""
+    def fetch():
+        with limiter.slot() if limiter else nullcontext():
+            if metrics:
+                metrics.check_started()
+            start = time.perf_counter()
+            result = None
+            try:
+                result = check_link(link, found_on, budget, link_type, auth=auth, headers=headers, session=controller.session())
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                if profile:
+                    profile.record('request', elapsed, urlparse(link).hostname)
+                if metrics:
+                    metrics.check_finished(link, result, elapsed)
+
+    if status_cache is None:
+        return fetch()
+    return status_cache.get(cache_key or link, link, found_on, link_type, fetch)
+
+def _check_batch(links: list[tuple[str, str]], found_on: str, base_url: str, max_workers: int, timeout, reporter=None, auth: tuple = None, headers: dict = None, controller: RunController = None, timeout_policy: TimeoutPolicy = None, canonicalizer: URLCanonicalizer = None, report_progress: bool = False, limiter=None, status_cache=None, profile=None, metrics=None) -> list[LinkResult]:
+    """Check a batch of (url, type) pairs concurrently, reporting each result as it completes."""
+    canonicalizer = canonicalizer or URLCanonicalizer(base_url)
+    controller = controller or RunController()
+    reporter = as_reporter(reporter)
+    results = []
+
+    def task(link: str, link_type: str, queued: float):
+        # Gate dispatch, not just consumption: paused workers start no new requests
+        proceed = controller.wait_if_paused()
+        if metrics:
+            metrics.add_queue('links', -1)
+        if not proceed:
+            return None
+        if profile:
+            profile.record('queue_wait', time.perf_counter() - queued)
+        return _fetch(link, found_on, _timeout_for(link, timeout, timeout_policy), link_type, auth, headers, controller, limiter, status_cache, canonicalizer.normalize(link), profile, metrics)
+
+    if metrics:
+        metrics.set_capacity(max_workers)
+        metrics.add_queue('links', len(links))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(task, link, link_type, time.perf_counter()) for link, link_type in links]
+        completed = 0
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            if result is None or controller.stopped:
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+
+            completed += 1
+            result.is_external = canonicalizer.is_external(result.url, base_url)
+            if timeout_policy:
+                timeout_policy.record(result)
+            results.append(result)
+
+            with profile.timer('callback') if profile else nullcontext():
+                reporter.result(result, ResultLine(result, completed, len(links)))
+                if report_progress:
+                    reporter.progress(completed / len(links))
+    if metrics:
+        # Links cancelled by a stop never ran their task
+        metrics.add_queue('links', -sum(future.cancelled() for future in futures))
+    return results
+
+def _drain_retries(results: list[LinkResult], max_workers: int, timeout, reporter=None, auth: tuple = None, headers: dict = None, controller: RunController = None, timeout_policy: TimeoutPolicy = None, retry_policy: RetryPolicy = None, limiter=None, profile=None, metrics=None):
+    """
+    Re-check transient failures after the first pass, replacing their results in place.
+
+    Failures wait in a RetryQueue with jittered exponential backoff so they never hold up
+    first-pass checks. Timed-out links are retried with the timeout policy's extended budget.
+    """
+    if retry_policy is None:
+        if not (timeout_policy and timeout_policy.retry_timeouts):
+            return
+        retry_policy = RetryPolicy(max_retries=1, base_delay=0, retryable=is_timeout)
+    controller = controller or RunController()
+    if controller.stopped:
+        return
+
+    queue = RetryQueue(retry_policy)
+    for index, result in enumerate(results):
+        queue.push(index, result)
+    if not len(queue):
+        return
+
+    reporter = as_reporter(reporter)
+    pending = len(queue)
+    msg = f"\n🔁 Retrying {pending} links that failed with transient errors\n"
+    reporter.log(msg)
+
+    def retry(old: LinkResult) -> LinkResult:
+        if not controller.wait_if_paused():
+            return old
+        if timeout_policy and is_timeout(old):
+            budget = timeout_policy.retry_timeout_for(old.url)
+        else:
+            budget = _timeout_for(old.url, timeout, timeout_policy)
+        result = _fetch(old.url, old.found_on, budget, old.link_type, auth, headers, controller, limiter, profile=profile, metrics=metrics)
+        result.is_external = old.is_external
+        result.retries = old.retries + 1
+        return result
+
+    resolved = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(queue):
+            if metrics:
+                metrics.set_queue('retries', len(queue))
+            if controller.stopped:
+                break
+            delay = queue.next_due_in()
+            if delay:
+                controller.sleep(delay)
+                continue
+            due = queue.pop_due()
+            future_to_index = {executor.submit(retry, result): index for index, result in due}
+            for future in concurrent.futures.as_completed(future_to_index):
+                index = future_to_index[future]
+                result = future.result()
+                if controller.stopped:
+                    break
+                results[index] = result
+                if queue.push(index, result):
+                    continue
+                resolved += 1
+                with profile.timer('callback') if profile else nullcontext():
+                    reporter.result(result, ResultLine(result, resolved, pending, prefix=f"🔁 (attempt {result.retries + 1}) "))
+
+def crawl_website(url: str, max_workers: int = 10, timeout: int = 10, max_depth: int = 1, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] | ExclusionMatcher = None, pause_event=None, stop_event=None, check_external: bool = True, timeout_policy: TimeoutPolicy = None, retry_policy: RetryPolicy = None, canonicalizer: URLCanonicalizer = None, controller: RunController = None, limiter=None, status_cache=None, seen_set=None, profile=None, metrics=None) -> list[LinkResult]:
     """Crawl a website recursively and check all links found."""
-    visited_pages = set()
-    checked_links = set()
+    reporter = as_reporter(progress_callback)
+    controller = controller or RunController.from_events(pause_event, stop_event)
+    if profile is not None:
+        controller.profile = profile
+    exclude_patterns = ExclusionMatcher.of(exclude_patterns)
+    canonicalizer = canonicalizer or URLCanonicalizer(url)
+    seen_set = seen_set or set
+    visited_pages = seen_set()
+    checked_links = seen_set()
     all_results = []
 
     pages_to_crawl = [(url, 0)]
 
     msg = f"\n🕷️  Crawling website with max depth: {max_depth}"
-    if progress_callback: progress_callback(msg + "\n")
+    reporter.log(msg + "\n")
 
     while pages_to_crawl:
-        # Check stop event
-        if stop_event and stop_event.is_set():
+        if not controller.wait_if_paused():
             break
 
-        # Check pause event
-        if pause_event:
-            while pause_event.is_set() and not (stop_event and stop_event.is_set()):
-                time.sleep(0.5)
-            if stop_event and stop_event.is_set():
-                break
-
         current_url, current_depth = pages_to_crawl.pop(0)
-        normalized_current = normalize_url(current_url)
+        if metrics:
+            metrics.set_queue('pages', len(pages_to_crawl))
+        normalized_current = canonicalizer.normalize(current_url)
 
         if normalized_current in visited_pages: continue
-        
+
         # Check if current page is excluded
         if should_exclude(current_url, exclude_patterns):
             msg = f"⏭️  Excluding page: {current_url}\n"
-            if progress_callback: progress_callback(msg)
+            reporter.log(msg, verbose=True)
             continue
-            
+
         visited_pages.add(normalized_current)
 
         msg = f"\n{'='*60}\n📄 Page {len(visited_pages)}: {current_url}\n   Depth: {current_depth}/{max_depth}\n{'='*60}\n"
-        if progress_callback: progress_callback(msg)
+        reporter.log(msg)
 
         try:
-            links_with_types, base_url = get_all_links(current_url, timeout, auth=auth, headers=headers)
+            links_with_types, base_url = get_all_links(current_url, _timeout_for(current_url, timeout, timeout_policy), auth=auth, headers=headers, session=controller.session(), profile=profile)
+            if metrics:
+                metrics.page_crawled()
         except Exception as e:
             msg = f"❌ Error scraping {current_url}: {e}"
-            if progress_callback: progress_callback(msg + "\n")
+            reporter.log(msg + "\n")
             continue
 
         new_links = []
         for link, link_type in links_with_types:
-            norm_link = normalize_url(link)
+            norm_link = canonicalizer.normalize(link)
             if norm_link not in checked_links:
                 if should_exclude(link, exclude_patterns):
                     # We still mark it as "checked" so we don't keep excluding it
                     checked_links.add(norm_link)
                     continue
-                if not check_external and is_external_url(link, url):
+                if not check_external and canonicalizer.is_external(link):
                     # Record it as checked but skip actual HTTP validation
                     checked_links.add(norm_link)
                     result = LinkResult(
-                        url=link, 
-                        status_code=200, 
-                        status_text="Skipped (External)", 
-                        response_time=0, 
-                        found_on=current_url, 
-                        is_dead=False, 
-                        is_external=True, 
+                        url=link,
+                        status_code=200,
+                        status_text="Skipped (External)",
+                        response_time=0,
+                        found_on=current_url,
+                        is_dead=False,
+                        is_external=True,
                         link_type=link_type
                     )
                     all_results.append(result)
-                    if progress_callback: progress_callback(result)
+                    reporter.result(result)
+                    if metrics:
+                        metrics.record(result.url, result)
                     continue
-                    
+
                 new_links.append((link, link_type))
 
         if not new_links:
             msg = "   No new links and assets to check on this page"
-            if progress_callback: progress_callback(msg + "\n")
+            reporter.log(msg + "\n")
             continue
 
         msg = f"📋 Found {len(new_links)} new links and assets to check\n"
-        if progress_callback: progress_callback(msg)
-
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_url = {
-                executor.submit(check_link, link, current_url, timeout, link_type, auth=auth, headers=headers): link
-                for link, link_type in new_links
-            }
-
-            completed = 0
-            for future in concurrent.futures.as_completed(future_to_url):
-                # Check stop event
-                if stop_event and stop_event.is_set():
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    break
-
-                # Check pause event
-                if pause_event:
-                    while pause_event.is_set() and not (stop_event and stop_event.is_set()):
-                        time.sleep(0.5)
-                    if stop_event and stop_event.is_set():
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        break
+        reporter.log(msg)
 
-                completed += 1
-                result = future.result()
-                
-                # Check externality
-                result.is_external = is_external_url(result.url, url)
-                
-                results.append(result)
-                checked_links.add(normalize_url(result.url))
-
-                status_icon = "❌" if result.is_dead else "✅"
-                type_icons = {"Link": "🔗", "Image": "🖼️", "Script": "📜", "Stylesheet": "🎨", "Iframe": "🖼️", "Icon": "🔖"}
-                link_icon = type_icons.get(result.link_type, "🔗")
-                loc_icon = "🌐" if result.is_external else "🏠"
-                
-                msg = f"[{completed}/{len(new_links)}] {status_icon} {link_icon} {loc_icon} {result.status_text}: {result.url[:70]}{'...' if len(result.url) > 70 else ''}\n"
-                if progress_callback: 
-                    progress_callback(msg)
-                    progress_callback(result)
+        results = _check_batch(new_links, current_url, url, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, canonicalizer=canonicalizer, limiter=limiter, status_cache=status_cache, profile=profile, metrics=metrics)
+        for result in results:
+            checked_links.add(canonicalizer.normalize(result.url))
 
         all_results.extend(results)
 
         if current_depth < max_depth:
             for result in results:
                 if not result.is_dead and not result.is_external:
-                    normalized_link = normalize_url(result.url)
+                    normalized_link = canonicalizer.normalize(result.url)
                     if normalized_link not in visited_pages:
                         path = urlparse(result.url).path.lower()
-                        skip_extensions = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.tar', '.gz', '.mp4', '.mp3', '.doc', '.docx', '.xls', '.xlsx', '.css', '.js')
-                        if not path.endswith(skip_extensions):
+                        if not path.endswith(PAGE_SKIP_EXTENSIONS):
                             pages_to_crawl.append((result.url, current_depth + 1))
 
+    _drain_retries(all_results, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, retry_policy=retry_policy, limiter=limiter, profile=profile, metrics=metrics)
+
     msg = f"\n{'='*60}\n🏁 Crawling complete!\n   Pages crawled: {len(visited_pages)}\n   Total links checked: {len(all_results)}\n{'='*60}\n"
-    if progress_callback: progress_callback(msg)
+    reporter.log(msg)
+    _close_seen(visited_pages, checked_links)
     return all_results
 
-def get_sitemap_urls(sitemap_url: str, timeout: int = 10, auth: tuple = None, headers: dict = None) -> list[str]:
+def get_sitemap_urls(sitemap_url: str, timeout: int = 10, auth: tuple = None, headers: dict = None, session: requests.Session = None) -> list[str]:
     """Fetch and parse sitemap.xml to get all URLs."""
     default_headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
     if headers:
         default_headers.update(headers)
-        
-    response = requests.get(sitemap_url, headers=default_headers, timeout=timeout, auth=auth)
+
+    response = (session or requests).get(sitemap_url, headers=default_headers, timeout=timeout, auth=auth)
     response.raise_for_status()
     try:
         soup = BeautifulSoup(response.text, 'xml')
@@ -182,189 +292,142 @@ def get_sitemap_urls(sitemap_url: str, timeout: int = 10, auth: tuple = None, he
         all_urls = []
         for sm in sitemaps:
             sm_url = sm.find('loc').text.strip()
-            all_urls.extend(get_sitemap_urls(sm_url, timeout, auth=auth, headers=headers))
+            all_urls.extend(get_sitemap_urls(sm_url, timeout, auth=auth, headers=headers, session=session))
         return list(set(all_urls))
     return list(set(urls))
 
-def crawl_sitemap(sitemap_url: str, max_workers: int = 10, timeout: int = 10, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] = None, pause_event=None, stop_event=None, check_external: bool = True) -> list[LinkResult]:
+def crawl_sitemap(sitemap_url: str, max_workers: int = 10, timeout: int = 10, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] | ExclusionMatcher = None, pause_event=None, stop_event=None, check_external: bool = True, timeout_policy: TimeoutPolicy = None, retry_policy: RetryPolicy = None, canonicalizer: URLCanonicalizer = None, controller: RunController = None, limiter=None, status_cache=None, seen_set=None, profile=None, metrics=None) -> list[LinkResult]:
     """Crawl all pages listed in a sitemap and check their assets."""
+    reporter = as_reporter(progress_callback)
+    controller = controller or RunController.from_events(pause_event, stop_event)
+    if profile is not None:
+        controller.profile = profile
+    exclude_patterns = ExclusionMatcher.of(exclude_patterns)
+    canonicalizer = canonicalizer or URLCanonicalizer(sitemap_url)
     msg = f"\n🗺️  Parsing sitemap: {sitemap_url}"
-    if progress_callback: progress_callback(msg + "\n")
+    reporter.log(msg + "\n")
     try:
-        pages_to_check = get_sitemap_urls(sitemap_url, timeout, auth=auth, headers=headers)
+        pages_to_check = get_sitemap_urls(sitemap_url, _timeout_for(sitemap_url, timeout, timeout_policy), auth=auth, headers=headers, session=controller.session())
     except Exception as e:
         msg = f"❌ Error parsing sitemap: {e}"
-        if progress_callback: progress_callback(msg + "\n")
+        reporter.log(msg + "\n")
         return []
     msg = f"📋 Found {len(pages_to_check)} pages in sitemap to analyze\n"
-    if progress_callback: progress_callback(msg)
+    reporter.log(msg)
     all_results = []
-    checked_assets = set()
+    checked_assets = (seen_set or set)()
     for i, page_url in enumerate(pages_to_check, 1):
-        # Check stop event
-        if stop_event and stop_event.is_set():
+        if not controller.wait_if_paused():
             break
 
-        # Check pause event
-        if pause_event:
-            while pause_event.is_set() and not (stop_event and stop_event.is_set()):
-                time.sleep(0.5)
-            if stop_event and stop_event.is_set():
-                break
-
         if should_exclude(page_url, exclude_patterns):
             msg = f"⏭️  Excluding sitemap page: {page_url}\n"
-            if progress_callback: progress_callback(msg)
+            reporter.log(msg, verbose=True)
             continue
 
         msg = f"\n{'='*60}\n📄 Sitemap Page {i}/{len(pages_to_check)}: {page_url}\n{'='*60}\n"
-        if progress_callback: progress_callback(msg)
+        reporter.log(msg)
+        if metrics:
+            metrics.set_queue('pages', len(pages_to_check) - i)
         try:
-            links_with_types, _ = get_all_links(page_url, timeout, auth=auth, headers=headers)
+            links_with_types, _ = get_all_links(page_url, _timeout_for(page_url, timeout, timeout_policy), auth=auth, headers=headers, session=controller.session(), profile=profile)
+            if metrics:
+                metrics.page_crawled()
             links_with_types.append((page_url, "Link"))
             new_assets = []
             for asset_url, asset_type in links_with_types:
-                norm_asset = normalize_url(asset_url)
+                norm_asset = canonicalizer.normalize(asset_url)
                 if norm_asset not in checked_assets:
                     if should_exclude(asset_url, exclude_patterns):
                         checked_assets.add(norm_asset)
                         continue
-                    if not check_external and is_external_url(asset_url, page_url):
+                    if not check_external and canonicalizer.is_external(asset_url, page_url):
                         checked_assets.add(norm_asset)
                         result = LinkResult(
-                            url=asset_url, 
-                            status_code=200, 
-                            status_text="Skipped (External)", 
-                            response_time=0, 
-                            found_on=page_url, 
-                            is_dead=False, 
-                            is_external=True, 
+                            url=asset_url,
+                            status_code=200,
+                            status_text="Skipped (External)",
+                            response_time=0,
+                            found_on=page_url,
+                            is_dead=False,
+                            is_external=True,
                             link_type=asset_type
                         )
                         all_results.append(result)
-                        if progress_callback: progress_callback(result)
+                        reporter.result(result)
+                        if metrics:
+                            metrics.record(result.url, result)
                         continue
                     new_assets.append((asset_url, asset_type))
             if not new_assets: continue
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_url = {
-                    executor.submit(check_link, asset_url, page_url, timeout, asset_type, auth=auth, headers=headers): asset_url
-                    for asset_url, asset_type in new_assets
-                }
-                completed = 0
-                for future in concurrent.futures.as_completed(future_to_url):
-                    # Check stop event
-                    if stop_event and stop_event.is_set():
-                        executor.shutdown(wait=False, cancel_futures=True)
-                        break
-
-                    # Check pause event
-                    if pause_event:
-                        while pause_event.is_set() and not (stop_event and stop_event.is_set()):
-                            time.sleep(0.5)
-                        if stop_event and stop_event.is_set():
-                            executor.shutdown(wait=False, cancel_futures=True)
-                            break
-
-                    completed += 1
-                    result = future.result()
-                    # Determine is_external
-                    result.is_external = is_external_url(result.url, page_url)
-                    all_results.append(result)
-                    checked_assets.add(normalize_url(result.url))
-                    status_icon = "❌" if result.is_dead else "✅"
-                    type_icons = {"Link": "🔗", "Image": "🖼️", "Script": "📜", "Stylesheet": "🎨", "Iframe": "🖼️", "Icon": "🔖"}
-                    link_icon = type_icons.get(result.link_type, "🔗")
-                    loc_icon = "🌐" if result.is_external else "🏠"
-                    msg = f"[{completed}/{len(new_assets)}] {status_icon} {link_icon} {loc_icon} {result.status_text}: {result.url[:70]}{'...' if len(result.url) > 70 else ''}\n"
-                    if progress_callback: 
-                        progress_callback(msg)
-                        progress_callback(result)
+            results = _check_batch(new_assets, page_url, page_url, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, canonicalizer=canonicalizer, limiter=limiter, status_cache=status_cache, profile=profile, metrics=metrics)
+            for result in results:
+                checked_assets.add(canonicalizer.normalize(result.url))
+            all_results.extend(results)
         except Exception as e:
             msg = f"❌ Error processing {page_url}: {e}\n"
-            if progress_callback: progress_callback(msg)
+            reporter.log(msg)
+    _drain_retries(all_results, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, retry_policy=retry_policy, limiter=limiter, profile=profile, metrics=metrics)
+    _close_seen(checked_assets)
     return all_results
 
-def check_all_links(url: str, max_workers: int = 10, timeout: int = 10, max_depth: int = 1, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] = None, pause_event=None, stop_event=None, check_external: bool = True) -> list[LinkResult]:
+def check_all_links(url: str, max_workers: int = 10, timeout: int = 10, max_depth: int = 1, progress_callback=None, auth: tuple = None, headers: dict = None, exclude_patterns: list[str] | ExclusionMatcher = None, pause_event=None, stop_event=None, check_external: bool = True, timeout_policy: TimeoutPolicy = None, retry_policy: RetryPolicy = None, canonicalizer: URLCanonicalizer = None, controller: RunController = None, limiter=None, status_cache=None, seen_set=None, profile=None, metrics=None) -> list[LinkResult]:
     """Dispatcher for crawling/checking links."""
+    reporter = as_reporter(progress_callback)
+    controller = controller or RunController.from_events(pause_event, stop_event)
+    if profile is not None:
+        controller.profile = profile
+    exclude_patterns = ExclusionMatcher.of(exclude_patterns)
+    canonicalizer = canonicalizer or URLCanonicalizer(url)
+    options = dict(auth=auth, headers=headers, exclude_patterns=exclude_patterns, check_external=check_external, timeout_policy=timeout_policy, retry_policy=retry_policy, canonicalizer=canonicalizer, controller=controller, limiter=limiter, status_cache=status_cache, seen_set=seen_set, profile=profile, metrics=metrics)
     if url.endswith('sitemap.xml') or 'sitemap' in url.lower():
-        return crawl_sitemap(url, max_workers, timeout, progress_callback, auth=auth, headers=headers, exclude_patterns=exclude_patterns, pause_event=pause_event, stop_event=stop_event, check_external=check_external)
+        return crawl_sitemap(url, max_workers, timeout, reporter, **options)
     if max_depth > 1:
-        return crawl_website(url, max_workers, timeout, max_depth, progress_callback, auth=auth, headers=headers, exclude_patterns=exclude_patterns, pause_event=pause_event, stop_event=stop_event, check_external=check_external)
-    
+        return crawl_website(url, max_workers, timeout, max_depth, reporter, **options)
+
     msg = f"\n🔍 Scraping links and assets from: {url}"
-    if progress_callback: progress_callback(msg + "\n")
+    reporter.log(msg + "\n")
     try:
-        links_with_types, base_url = get_all_links(url, timeout, auth=auth, headers=headers)
+        links_with_types, base_url = get_all_links(url, _timeout_for(url, timeout, timeout_policy), auth=auth, headers=headers, session=controller.session(), profile=profile)
+        if metrics:
+            metrics.page_crawled()
     except Exception as e:
         msg = f"❌ Error scraping {url}: {e}"
-        if progress_callback: progress_callback(msg + "\n")
+        reporter.log(msg + "\n")
         return []
     msg = f"📋 Found {len(links_with_types)} links and assets to check\n"
-    if progress_callback: progress_callback(msg)
+    reporter.log(msg)
     if not links_with_types: return []
     results = []
-    
+
     # Filter initial list
     filtered_links = []
     for link, ltype in links_with_types:
         if not should_exclude(link, exclude_patterns):
-            if not check_external and is_external_url(link, url):
+            if not check_external and canonicalizer.is_external(link):
                 result = LinkResult(
-                    url=link, 
-                    status_code=200, 
-                    status_text="Skipped (External)", 
-                    response_time=0, 
-                    found_on=url, 
-                    is_dead=False, 
-                    is_external=True, 
+                    url=link,
+                    status_code=200,
+                    status_text="Skipped (External)",
+                    response_time=0,
+                    found_on=url,
+                    is_dead=False,
+                    is_external=True,
                     link_type=ltype
                 )
                 results.append(result)
-                if progress_callback: progress_callback(result)
+                reporter.result(result)
+                if metrics:
+                    metrics.record(result.url, result)
                 continue
             filtered_links.append((link, ltype))
         else:
              msg = f"⏭️  Excluding: {link}\n"
-             if progress_callback: progress_callback(msg)
+             reporter.log(msg, verbose=True)
 
     if not filtered_links:
         return []
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(check_link, link, base_url, timeout, link_type, auth=auth, headers=headers): link
-            for link, link_type in filtered_links
-        }
-        completed = 0
-        for future in concurrent.futures.as_completed(future_to_url):
-            # Check stop event
-            if stop_event and stop_event.is_set():
-                executor.shutdown(wait=False, cancel_futures=True)
-                break
-
-            # Check pause event
-            if pause_event:
-                while pause_event.is_set() and not (stop_event and stop_event.is_set()):
-                    time.sleep(0.5)
-                if stop_event and stop_event.is_set():
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    break
-
-            completed += 1
-            result = future.result()
-            result.is_external = is_external_url(result.url, url)
-            results.append(result)
-            status_icon = "❌" if result.is_dead else "✅"
-            type_icons = {"Link": "🔗", "Image": "🖼️", "Script": "📜", "Stylesheet": "🎨", "Iframe": "🖼️", "Icon": "🔖"}
-            link_icon = type_icons.get(result.link_type, "🔗")
-            loc_icon = "🌐" if result.is_external else "🏠"
-            msg = f"[{completed}/{len(filtered_links)}] {status_icon} {link_icon} {loc_icon} {result.status_text}: {result.url[:70]}{'...' if len(result.url) > 70 else ''}\n"
-            if progress_callback: 
-                progress_callback(msg)
-                progress_callback(result)
-            if hasattr(progress_callback, '__self__'):
-                try:
-                    progress_callback.__self__.progress_queue.put(('progress', completed / len(filtered_links)))
-                except: pass
+    results.extend(_check_batch(filtered_links, base_url, url, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, canonicalizer=canonicalizer, report_progress=True, limiter=limiter, status_cache=status_cache, profile=profile, metrics=metrics))
+    _drain_retries(results, max_workers, timeout, reporter, auth=auth, headers=headers, controller=controller, timeout_policy=timeout_policy, retry_policy=retry_policy, limiter=limiter, profile=profile, metrics=metrics)
     return results
@@ -1,9 +1,43 @@
 import sqlite3
 import os
+import re
+import time
+import queue
+import itertools
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from .models import LinkResult
+from .trends import ROLLUP_VERSION, create_rollups, update_rollups
+
+# Characters a timestamp search can consist of ("2024-05", "2024-05-01 13:")
+_TIMESTAMP_CHARS = set("0123456789-: ")
+
+def _text_bound(value):
+    # The DATETIME column has numeric affinity, so a bound like '2024' would be
+    # compared as the number 2024; a trailing \x01 keeps it text without
+    # changing which timestamps fall in the range
+    return value + "\x01" if re.fullmatch(r"\s*-?\d+\s*", value) else value
+
+# Applied to every connection. WAL lets History reads run while a check is being saved.
+_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+)
+
+_memory_ids = itertools.count()
 
 class DatabaseManager:
+    """
+    History of finished runs.
+
+    Each thread reads through its own persistent connection; every write
+    (saves, deletes, maintenance) is queued to one writer thread, so
+    concurrent callers never contend for SQLite's write lock.
+    """
+
     def __init__(self, db_path=None):
         if db_path is None:
             # Place database in the parent directory of the current file's package
@@ -11,18 +45,84 @@ class DatabaseManager:
             db_path = os.path.join(base_dir, "deadlink_history.db")
         
         self.db_path = db_path
-        self._shared_conn = None
+        self._local = threading.local()
+        self._writes = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._uri = None
+        self._anchor = None
         
-        # In-memory databases require a persistent connection to keep data
+        # In-memory databases are private to one connection; a named shared-cache
+        # database lets every thread's connection see the same data while the anchor keeps it alive
         if self.db_path == ":memory:":
-            self._shared_conn = sqlite3.connect(self.db_path)
+            self._uri = f"file:deadlink-{os.getpid()}-{next(_memory_ids)}?mode=memory&cache=shared"
+            self._anchor = self._connect()
             
         self._init_db()
 
+    def _connect(self):
+        conn = sqlite3.connect(self._uri or self.db_path, uri=bool(self._uri))
+        if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            # A new database: only settable before the first write, the switch to WAL included.
+            # See deadlink.maintenance for older files.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if self._uri:
+            # Shared-cache readers would otherwise fail with "table is locked" while the writer holds it
+            conn.execute("PRAGMA read_uncommitted = 1")
+        else:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def _get_connection(self):
-        if self._shared_conn:
-            return self._shared_conn
-        return sqlite3.connect(self.db_path)
+        """This thread's connection, opened on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _write(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the writer thread and return its result."""
+        if threading.current_thread() is self._writer:
+            return fn(*args, **kwargs)
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True, name="deadlink-db-writer")
+                self._writer.start()
+        future = Future()
+        self._writes.put((future, fn, args, kwargs))
+        return future.result()
+
+    def _write_loop(self):
+        while True:
+            job = self._writes.get()
+            if job is None:
+                break
+            future, fn, args, kwargs = job
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        """Stop the writer thread and close this thread's connection."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._writes.put(None)
+            writer.join()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
 
     def _init_db(self):
         with self._get_connection() as conn:
@@ -53,12 +153,102 @@ class DatabaseManager:
                     is_dead BOOLEAN,
                     is_external BOOLEAN,
                     link_type TEXT,
+                    retries INTEGER DEFAULT 0,
                     FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
                 )
             """)
+            # Report files written for each session, so History doesn't scan folders
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS report_files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    kind TEXT,
+                    size INTEGER,
+                    FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
+                )
+            """)
+            # Per-phase timing histograms for a session (deadlink.timing.RunProfile as JSON)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS session_profiles (
+                    session_id INTEGER PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    FOREIGN KEY (session_id) REFERENCES sessions (id) ON DELETE CASCADE
+                )
+            """)
+            # Bookkeeping such as when maintenance last ran
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS db_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            # Trend rollups, kept current by save_session (see deadlink.trends)
+            create_rollups(cursor)
+            cursor.execute("SELECT 1 FROM sessions LIMIT 1")
+            if cursor.fetchone() is None:
+                # Nothing to backfill
+                cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('rollup_version', ?)", (str(ROLLUP_VERSION),))
+            self._migrate(cursor)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_url ON sessions (url, timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_results_session ON results (session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_report_files_session ON report_files (session_id)")
+            self.fts = self._init_fts(cursor)
             conn.commit()
 
-    def save_session(self, url, mode, results, session_folder):
+    def _init_fts(self, cursor):
+        """Create the trigram FTS5 index over session URLs. Returns False if this SQLite lacks FTS5/trigram."""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sessions_fts'")
+            exists = cursor.fetchone() is not None
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts
+                USING fts5(url, content='sessions', content_rowid='id', tokenize='trigram')
+            """)
+        except sqlite3.OperationalError:
+            return False
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_insert AFTER INSERT ON sessions BEGIN
+                INSERT INTO sessions_fts (rowid, url) VALUES (new.id, new.url);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_delete AFTER DELETE ON sessions BEGIN
+                INSERT INTO sessions_fts (sessions_fts, rowid, url) VALUES ('delete', old.id, old.url);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_update AFTER UPDATE OF url ON sessions BEGIN
+                INSERT INTO sessions_fts (sessions_fts, rowid, url) VALUES ('delete', old.id, old.url);
+                INSERT INTO sessions_fts (rowid, url) VALUES (new.id, new.url);
+            END
+        """)
+        if not exists:
+            # Index sessions saved before the FTS table existed
+            cursor.execute("INSERT INTO sessions_fts (sessions_fts) VALUES ('rebuild')")
+        return True
+
+    def _migrate(self, cursor):
+        """Add columns introduced after a database file was first created."""
+        cursor.execute("PRAGMA table_info(results)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'retries' not in columns:
+            cursor.execute("ALTER TABLE results ADD COLUMN retries INTEGER DEFAULT 0")
+        cursor.execute("PRAGMA table_info(sessions)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'files_indexed' not in columns:
+            # Older sessions have their report files recorded the first time History shows them
+            cursor.execute("ALTER TABLE sessions ADD COLUMN files_indexed INTEGER DEFAULT 0")
+        if 'downsampled' not in columns:
+            # Set when retention dropped a session's results and kept only its totals
+            cursor.execute("ALTER TABLE sessions ADD COLUMN downsampled INTEGER DEFAULT 0")
+
+    def save_session(self, url, mode, results, session_folder, report_files=None, profile=None):
+        """Save a finished run. A RunProfile passed as `profile` is stored with it, including this save as 'db_save'."""
+        return self._write(self._save_session, time.perf_counter(), url, mode, results, session_folder, report_files, profile)
+
+    def _save_session(self, start, url, mode, results, session_folder, report_files, profile):
         total = len(results)
         broken = len([r for r in results if r.is_dead])
         working = total - broken
@@ -66,48 +256,186 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO sessions (url, mode, total_links, working_links, broken_links, session_folder)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO sessions (url, mode, total_links, working_links, broken_links, session_folder, files_indexed)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
             """, (url, mode, total, working, broken, session_folder))
             
             session_id = cursor.lastrowid
+            self._insert_report_files(cursor, session_id, report_files or [])
             
-            for r in results:
-                cursor.execute("""
-                    INSERT INTO results (session_id, url, status_code, status_text, response_time, found_on, is_dead, is_external, link_type)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    session_id, r.url, r.status_code, r.status_text, 
-                    r.response_time, r.found_on, int(r.is_dead), 
-                    int(r.is_external), r.link_type
-                ))
+            cursor.executemany("""
+                INSERT INTO results (session_id, url, status_code, status_text, response_time, found_on, is_dead, is_external, link_type, retries)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, ((
+                session_id, r.url, r.status_code, r.status_text, 
+                r.response_time, r.found_on, int(r.is_dead), 
+                int(r.is_external), r.link_type, r.retries
+            ) for r in results))
+            cursor.execute("SELECT timestamp FROM sessions WHERE id = ?", (session_id,))
+            update_rollups(cursor, session_id, url, cursor.fetchone()[0],
+                           [(r.url, r.response_time) for r in results if r.response_time is not None and r.status_code is not None])
+            if profile is not None:
+                profile.record('db_save', time.perf_counter() - start)
+                cursor.execute("INSERT INTO session_profiles (session_id, profile) VALUES (?, ?)", (session_id, profile.to_json()))
             conn.commit()
             return session_id
 
+    def _search_conditions(self, search_query):
+        """SQL conditions and params matching sessions by URL substring or timestamp prefix."""
+        if not search_query:
+            return [], []
+        if self.fts and len(search_query) >= 3:
+            phrase = '"' + search_query.replace('"', '""') + '"'
+            url_condition, params = "id IN (SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH ?)", [phrase]
+        else:
+            url_condition, params = "url LIKE ?", [f"%{search_query}%"]
+        if set(search_query) <= _TIMESTAMP_CHARS and search_query.strip():
+            # Timestamp prefix as a range, so the timestamp index is used; digits may still be part of a URL
+            upper = search_query[:-1] + chr(ord(search_query[-1]) + 1)
+            return [f"((timestamp >= ? AND timestamp < ?) OR {url_condition})"], [_text_bound(search_query), _text_bound(upper)] + params
+        return [f"({url_condition} OR timestamp LIKE ?)"], params + [f"%{search_query}%"]
+
     def get_sessions(self, search_query=None):
+        conditions, params = self._search_conditions(search_query)
         query = "SELECT * FROM sessions"
-        params = []
-        if search_query:
-            query += " WHERE url LIKE ? OR timestamp LIKE ?"
-            params = [f"%{search_query}%", f"%{search_query}%"]
-        
-        query += " ORDER BY timestamp DESC"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC"
         
         with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_sessions_page(self, search_query=None, limit=20, after=None):
+        """
+        One page of sessions, newest first, each with its `files` list.
+
+        Pass the `(timestamp, id)` of the last session of a page as `after`
+        to get the next one (keyset pagination, no OFFSET scans).
+        """
+        conditions, params = self._search_conditions(search_query)
+        if after is not None:
+            conditions.append("(timestamp, id) < (?, ?)")
+            params += list(after)
+        query = "SELECT * FROM sessions"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(query, params + [limit])
+            sessions = [dict(row) for row in cursor.fetchall()]
+            files = self._get_report_files(cursor, [s['id'] for s in sessions])
+        for session in sessions:
+            session['files'] = files.get(session['id'], [])
+        return sessions
+
+    def add_report_files(self, session_id, paths):
+        """Record report files for an existing session and mark its files as indexed."""
+        self._write(self._add_report_files, session_id, paths)
+
+    def _add_report_files(self, session_id, paths):
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self._insert_report_files(cursor, session_id, paths)
+            cursor.execute("UPDATE sessions SET files_indexed = 1 WHERE id = ?", (session_id,))
+            conn.commit()
+
+    def _insert_report_files(self, cursor, session_id, paths):
+        rows = []
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = None
+            kind = os.path.splitext(path)[1].lstrip('.').lower()
+            rows.append((session_id, os.path.abspath(path), kind, size))
+        cursor.executemany("INSERT INTO report_files (session_id, path, kind, size) VALUES (?, ?, ?, ?)", rows)
+
+    def _get_report_files(self, cursor, session_ids):
+        files = {}
+        if not session_ids:
+            return files
+        placeholders = ",".join("?" * len(session_ids))
+        cursor.execute(f"SELECT * FROM report_files WHERE session_id IN ({placeholders}) ORDER BY id", session_ids)
+        for row in cursor.fetchall():
+            files.setdefault(row['session_id'], []).append(dict(row))
+        return files
+
     def get_session_results(self, session_id):
         with self._get_connection() as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute("SELECT * FROM results WHERE session_id = ?", (session_id,))
             return [dict(row) for row in cursor.fetchall()]
 
+    def iter_result_batches(self, session_ids=None, url=None, since=None, batch_rows=50000):
+        """
+        Stored results joined with their session's site and timestamp, as
+        lists of tuples in deadlink.columnar.COLUMNS order.
+
+        Filter by session ids, by site `url`, or by timestamp (`since`, e.g. "2024-05-01").
+        """
+        conditions, params = [], []
+        if session_ids is not None:
+            conditions.append(f"r.session_id IN ({','.join('?' * len(session_ids))})")
+            params += list(session_ids)
+        if url:
+            conditions.append("s.url = ?")
+            params.append(url)
+        if since:
+            conditions.append("s.timestamp >= ?")
+            params.append(since)
+        query = """
+            SELECT r.session_id, s.url, s.timestamp, r.url, r.status_code, r.status_text, r.response_time,
+                   r.found_on, r.is_dead, r.is_external, r.link_type, r.retries
+            FROM results r JOIN sessions s ON s.id = r.session_id
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY r.session_id, r.id"
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_rows)
+                if not rows:
+                    break
+                yield rows
+
+    def export_results(self, path, session_ids=None, url=None, since=None, format='auto'):
+        """Write stored results to a columnar file (see deadlink.columnar). Returns (path, format, rows)."""
+        from .columnar import write_columnar
+        return write_columnar(path, self.iter_result_batches(session_ids, url, since), format)
+
+    def get_session_profile(self, session_id):
+        """The RunProfile saved with a session, or None if it was saved without one."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT profile FROM session_profiles WHERE session_id = ?", (session_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        from .timing import RunProfile
+        return RunProfile.from_json(row[0])
+
+    def maintain(self, policy=None, vacuum_pages=None, full=False, force_analyze=False):
+        """Apply a RetentionPolicy, remove orphaned rows, vacuum and analyze (see deadlink.maintenance)."""
+        from .maintenance import run_maintenance
+        return self._write(run_maintenance, self, policy, vacuum_pages=vacuum_pages, full=full, force_analyze=force_analyze)
+
     def delete_session(self, session_id):
+        self._write(self._delete_session, session_id)
+
+    def _delete_session(self, session_id):
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("DELETE FROM report_files WHERE session_id = ?", (session_id,))
+            cursor.execute("DELETE FROM session_profiles WHERE session_id = ?", (session_id,))
             cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
             conn.commit()
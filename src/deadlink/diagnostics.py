@@ -0,0 +1,201 @@
+"""
+CPU and memory profiling around a crawl run.
+
+RunDiagnostics wraps a run (check_all_links, a batch) and writes what it
+found next to the reports:
+
+- cpu='sample': a wall-clock sampling profiler that reads every thread's
+  stack each `interval` seconds. Low overhead, sees the worker threads,
+  and writes flamegraph-compatible collapsed stacks (PREFIX.cpu.collapsed,
+  for flamegraph.pl or speedscope) plus the top frames (PREFIX.cpu.txt).
+- cpu='cprofile': deterministic cProfile over the calling thread and every
+  thread started during the run, merged into PREFIX.cpu.pstats plus the
+  top functions by cumulative time (PREFIX.cpu.txt). Much slower.
+- mem=True: tracemalloc snapshots at start and end; the top allocation
+  sites and the largest growth go to PREFIX.mem.txt.
+
+Only the stdlib is used.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+
+CPU_MODES = ('sample', 'cprofile')
+
+class SamplingProfiler:
+    """Background thread counting the stacks of all other threads."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="deadlink-sampler")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Pool threads share a root so their samples add up (ThreadPoolExecutor-0_3 -> ThreadPoolExecutor-0)
+                stack.append(re.sub(r'_\d+$', '', names.get(ident, f"thread-{ident}")))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """One 'root;...;leaf count' line per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top(self, limit: int = 30) -> str:
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        samples = sum(self.stacks.values()) or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:.1f} ms (wall clock, all threads)", ""]
+        for title, counts in (("Self (where threads were when sampled)", own), ("Inclusive", total)):
+            lines.append(f"{title}:")
+            lines.append(f"{'samples':>8} {'%':>6}  frame")
+            for frame, count in counts.most_common(limit):
+                lines.append(f"{count:8d} {count / samples * 100:6.1f}  {frame}")
+            lines.append("")
+        return "\n".join(lines)
+
+class ThreadedCProfile:
+    """cProfile on the calling thread and on every thread started while it runs."""
+
+    def __init__(self):
+        self._profiles = []
+        self._lock = threading.Lock()
+
+    def _new_profile(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def _start_thread(self, *args):
+        # Called once by each new thread (threading.setprofile); hand over to a cProfile of its own
+        sys.setprofile(None)
+        self._new_profile().enable()
+
+    def start(self):
+        if sys.version_info >= (3, 12):
+            # cProfile runs on sys.monitoring and sees every thread from one profile
+            self._new_profile().enable()
+            return
+        threading.setprofile(self._start_thread)
+        self._new_profile().enable()
+
+    def stop(self):
+        threading.setprofile(None)
+        self._profiles[0].disable()
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            profile.create_stats()
+            stats.add(profile)
+        return stats
+
+class RunDiagnostics:
+    """Context manager profiling the code it wraps; call write(prefix) afterwards."""
+
+    def __init__(self, cpu: str = None, mem: bool = False, interval: float = 0.005, memory_frames: int = 25):
+        if cpu not in (None,) + CPU_MODES:
+            raise ValueError(f"Unknown CPU profiler: {cpu} (expected one of {', '.join(CPU_MODES)})")
+        self.cpu = cpu
+        self.mem = mem
+        self.memory_frames = memory_frames
+        self.profiler = SamplingProfiler(interval) if cpu == 'sample' else ThreadedCProfile() if cpu == 'cprofile' else None
+        self._snapshots = []
+        self.peak_memory = None
+
+    def __enter__(self):
+        if self.mem:
+            tracemalloc.start(self.memory_frames)
+            self._snapshots.append(tracemalloc.take_snapshot())
+        if self.profiler:
+            self.profiler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiler:
+            self.profiler.stop()
+        if self.mem:
+            self._snapshots.append(tracemalloc.take_snapshot())
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def write(self, prefix: str) -> list[str]:
+        """Write the outputs as PREFIX.cpu.* / PREFIX.mem.txt; returns the paths written."""
+        folder = os.path.dirname(prefix)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        paths = []
+        if self.cpu == 'sample':
+            paths.append(_write(prefix + ".cpu.collapsed", self.profiler.collapsed()))
+            paths.append(_write(prefix + ".cpu.txt", self.profiler.top()))
+        elif self.cpu == 'cprofile':
+            stats = self.profiler.stats()
+            stats.dump_stats(prefix + ".cpu.pstats")
+            paths.append(prefix + ".cpu.pstats")
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats('cumulative').print_stats(40)
+            paths.append(_write(prefix + ".cpu.txt", out.getvalue()))
+        if self.mem and len(self._snapshots) == 2:
+            paths.append(_write(prefix + ".mem.txt", self._memory_report()))
+        return paths
+
+    def _memory_report(self, limit: int = 25) -> str:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__),
+                  tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"), tracemalloc.Filter(False, "<unknown>")]
+        start, end = (snapshot.filter_traces(ignore) for snapshot in self._snapshots)
+        current = sum(stat.size for stat in end.statistics('filename'))
+        lines = [f"Peak traced memory: {self.peak_memory / 1e6:.1f} MB", f"Still allocated at the end: {current / 1e6:.1f} MB", "",
+                 f"Top {limit} allocation sites at the end of the run:"]
+        for stat in end.statistics('lineno')[:limit]:
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback[0]}")
+        lines += ["", f"Top {limit} growth since the start of the run:"]
+        for stat in end.compare_to(start, 'lineno')[:limit]:
+            lines.append(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {stat.traceback[0]}")
+        lines += ["", "Largest allocation site, full traceback:"]
+        top = end.statistics('traceback')[:1]
+        if top:
+            lines += ["  " + line for line in top[0].traceback.format()]
+        return "\n".join(lines) + "\n"
+
+def _write(path: str, text: str) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
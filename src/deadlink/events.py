@@ -0,0 +1,180 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from .models import LinkResult
+
+TYPE_ICONS = {"Link": "🔗", "Image": "🖼️", "Script": "📜", "Stylesheet": "🎨", "Iframe": "🖼️", "Icon": "🔖"}
+
+def format_result_line(result: LinkResult, completed: int, total: int) -> str:
+    status_icon = "❌" if result.is_dead else "✅"
+    link_icon = TYPE_ICONS.get(result.link_type, "🔗")
+    loc_icon = "🌐" if result.is_external else "🏠"
+    return f"[{completed}/{total}] {status_icon} {link_icon} {loc_icon} {result.status_text}: {result.url[:70]}{'...' if len(result.url) > 70 else ''}\n"
+
+@dataclass
+class ResultLine:
+    """A per-result log line, formatted only when str() is called on it."""
+    result: LinkResult
+    completed: int
+    total: int
+    prefix: str = ""
+
+    def __str__(self):
+        return self.prefix + format_result_line(self.result, self.completed, self.total)
+
+LogLine = Union[str, ResultLine]
+
+@dataclass
+class ProgressCounters:
+    """Tally of published results; a retried link counts again (ResultModel.counters counts it once)."""
+    total: int = 0
+    working: int = 0
+    broken: int = 0
+    internal: int = 0
+    external: int = 0
+
+    def add(self, result: LinkResult, n: int = 1):
+        self.total += n
+        if result.is_dead:
+            self.broken += n
+        else:
+            self.working += n
+        if result.is_external:
+            self.external += n
+        else:
+            self.internal += n
+
+    def remove(self, result: LinkResult):
+        self.add(result, -1)
+
+    @property
+    def success_rate(self) -> float:
+        return self.working / self.total * 100 if self.total else 0.0
+
+@dataclass
+class ProgressBatch:
+    """Everything published since the previous poll."""
+    results: list[LinkResult] = field(default_factory=list)
+    logs: list[LogLine] = field(default_factory=list)
+    counters: ProgressCounters = field(default_factory=ProgressCounters)
+    progress: Optional[float] = None
+    dropped_logs: int = 0
+
+class CallbackReporter:
+    """Adapts a plain progress_callback(str | LinkResult) to the reporter interface used by the crawler."""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+
+    def log(self, message: str, verbose: bool = False):
+        if self.callback: self.callback(message)
+
+    def result(self, result: LinkResult, line: ResultLine = None):
+        if self.callback:
+            if line is not None:
+                self.callback(str(line))
+            self.callback(result)
+
+    def progress(self, fraction: float):
+        # Legacy hook: GUI-style callbacks bound to an object with a progress_queue
+        if hasattr(self.callback, '__self__'):
+            try:
+                self.callback.__self__.progress_queue.put(('progress', fraction))
+            except: pass
+
+class ProgressChannel:
+    """
+    Thread-safe, batched progress channel between a crawl and a UI.
+
+    Crawler threads publish results and log lines; the UI calls poll() on its
+    own timer and receives one ProgressBatch with everything since the last
+    poll plus running counters. Log lines for individual results are kept
+    unformatted until displayed, and once `max_log_lines` are waiting, new
+    verbose lines are dropped (and counted) rather than queued. Results are
+    never dropped: once `max_pending_results` are waiting, publishers block
+    until the UI catches up. With a `spool` (a LogSpool), every line is also
+    written there as it is published, before any dropping, so the file keeps
+    the full log.
+
+    A channel can be passed anywhere a progress_callback is accepted.
+    """
+
+    def __init__(self, max_log_lines: int = 5000, max_pending_results: int = 100000, spool=None):
+        self.max_log_lines = max_log_lines
+        self.max_pending_results = max_pending_results
+        self.spool = spool
+        self._cond = threading.Condition()
+        self._results: list[LinkResult] = []
+        self._logs: deque = deque()
+        self._dropped = 0
+        self._progress = None
+        self.counters = ProgressCounters()
+
+    def __call__(self, message):
+        """progress_callback-compatible entry point."""
+        if isinstance(message, LinkResult):
+            self.result(message)
+        else:
+            self.log(message)
+
+    def reset(self):
+        with self._cond:
+            self._results.clear()
+            self._logs.clear()
+            self._dropped = 0
+            self._progress = None
+            self.counters = ProgressCounters()
+            self._cond.notify_all()
+
+    def log(self, message: LogLine, verbose: bool = False):
+        with self._cond:
+            if self.spool is not None:
+                self.spool.write(str(message))
+            if verbose and len(self._logs) >= self.max_log_lines:
+                self._dropped += 1
+                return
+            self._logs.append(message)
+
+    def result(self, result: LinkResult, line: ResultLine = None):
+        with self._cond:
+            while len(self._results) >= self.max_pending_results:
+                self._cond.wait()
+            self._results.append(result)
+            self.counters.add(result)
+            if line is not None:
+                if self.spool is not None:
+                    self.spool.write(str(line))
+                if len(self._logs) >= self.max_log_lines:
+                    self._dropped += 1
+                else:
+                    self._logs.append(line)
+
+    def progress(self, fraction: float):
+        with self._cond:
+            self._progress = fraction
+
+    def poll(self) -> Optional[ProgressBatch]:
+        """Take everything published since the last poll, or None if nothing happened."""
+        with self._cond:
+            if not self._results and not self._logs and self._progress is None and not self._dropped:
+                return None
+            batch = ProgressBatch(
+                results=self._results,
+                logs=list(self._logs),
+                counters=ProgressCounters(**vars(self.counters)),
+                progress=self._progress,
+                dropped_logs=self._dropped
+            )
+            self._results = []
+            self._logs.clear()
+            self._dropped = 0
+            self._progress = None
+            self._cond.notify_all()
+            return batch
+
+def as_reporter(progress_callback):
+    """Return `progress_callback` if it is a ProgressChannel, otherwise wrap it in a CallbackReporter."""
+    if isinstance(progress_callback, (ProgressChannel, CallbackReporter)):
+        return progress_callback
+    return CallbackReporter(progress_callback)
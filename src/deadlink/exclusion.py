@@ -0,0 +1,194 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+REGEX_METACHARS = set('.^$*+?{}[]\\|()')
+
+# Constructs whose meaning changes when patterns are merged into one alternation
+_UNCOMBINABLE = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?[aiLmsux]+\)')
+
+# Anchors shorter than this match too many URLs to be a useful prefilter
+MIN_ANCHOR_LENGTH = 3
+
+_DIRECT = -1
+
+def required_literal(pattern: str) -> str:
+    """
+    Return the longest literal run every match of `pattern` must contain, lowercased,
+    or '' if none can be determined. Only top-level ASCII literals are considered.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return ''
+    best, run = '', []
+    for op, arg in list(parsed) + [(None, None)]:
+        if op is _sre_parse.LITERAL and arg < 128:
+            run.append(chr(arg).lower())
+            continue
+        if len(run) > len(best):
+            best = ''.join(run)
+        run = []
+    return best
+
+class _LiteralSet:
+    """Aho-Corasick automaton reporting which of a set of keyed substrings occur in a text."""
+
+    def __init__(self, words: list[tuple[str, int]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for word, key in words:
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (key,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> set[int] | None:
+        """Return the keys found in `text`, or None as soon as a `_DIRECT` key is found."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                if _DIRECT in out[node]:
+                    return None
+                found.update(out[node])
+        return found
+
+class _PrefixTrie:
+    """Trie answering "does the text start with any of these prefixes?"."""
+
+    def __init__(self, prefixes: list[str]):
+        self._root = {}
+        for prefix in prefixes:
+            node = self._root
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[None] = True
+
+    def match(self, text: str) -> bool:
+        node = self._root
+        for ch in text:
+            if None in node:
+                return True
+            node = node.get(ch)
+            if node is None:
+                return False
+        return None in node
+
+class ExclusionMatcher:
+    """
+    Exclusion rules compiled once per run.
+
+    Each pattern is matched case-insensitively against the whole URL, as a
+    regular expression. Plain strings and the literal text each regex
+    requires go into one Aho-Corasick automaton, so a URL is scanned once
+    and only regexes whose required text occurs are run. `^literal` rules use
+    a prefix trie, and regexes without usable literal text are merged into a
+    single alternation. Patterns that fail to compile keep the historical
+    behaviour of a substring match and are listed in `invalid`.
+    """
+
+    def __init__(self, patterns: list[str] = None, strict: bool = False):
+        self.patterns = [p for p in (patterns or []) if p]
+        self.invalid: list[tuple[str, str]] = []
+
+        words, prefixes, unanchored, separate = [], [], [], []
+        self._anchored: list[re.Pattern] = []
+        for pattern in self.patterns:
+            if not REGEX_METACHARS.intersection(pattern):
+                words.append((pattern.lower(), _DIRECT))
+                continue
+            if pattern.startswith('^') and not REGEX_METACHARS.intersection(pattern[1:]):
+                prefixes.append(pattern[1:].lower())
+                continue
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                self.invalid.append((pattern, str(e)))
+                words.append((pattern.lower(), _DIRECT))
+                continue
+            anchor = required_literal(pattern)
+            if len(anchor) >= MIN_ANCHOR_LENGTH:
+                words.append((anchor, len(self._anchored)))
+                self._anchored.append(compiled)
+            elif _UNCOMBINABLE.search(pattern):
+                separate.append(compiled)
+            else:
+                unanchored.append(pattern)
+
+        if strict and self.invalid:
+            raise ValueError("Invalid exclusion pattern(s): " + "; ".join(f"{p!r}: {err}" for p, err in self.invalid))
+
+        self._literals = _LiteralSet(words) if words else None
+        self._prefixes = _PrefixTrie(prefixes) if prefixes else None
+        self._regexes = separate
+        if unanchored:
+            try:
+                self._regexes.insert(0, re.compile('|'.join(f'(?:{p})' for p in unanchored), re.IGNORECASE))
+            except re.error:
+                self._regexes[:0] = [re.compile(p, re.IGNORECASE) for p in unanchored]
+
+    @classmethod
+    def of(cls, patterns) -> 'ExclusionMatcher':
+        """Return `patterns` unchanged if it is already a matcher, otherwise a cached compiled one."""
+        if isinstance(patterns, ExclusionMatcher):
+            return patterns
+        return _compile_cached(tuple(patterns or ()))
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def matches(self, url: str) -> bool:
+        if not self.patterns:
+            return False
+        if self._literals or self._prefixes:
+            lowered = url.lower()
+            if self._prefixes and self._prefixes.match(lowered):
+                return True
+            if self._literals:
+                candidates = self._literals.search(lowered)
+                if candidates is None:
+                    return True
+                for index in candidates:
+                    if self._anchored[index].search(url):
+                        return True
+        for regex in self._regexes:
+            if regex.search(url):
+                return True
+        return False
+
+@lru_cache(maxsize=32)
+def _compile_cached(patterns: tuple) -> ExclusionMatcher:
+    return ExclusionMatcher(list(patterns))
+
+def validate_patterns(patterns: list[str]) -> list[tuple[str, str]]:
+    """Return (pattern, error) pairs for patterns that are not valid regular expressions."""
+    return ExclusionMatcher(patterns).invalid
@@ -0,0 +1,415 @@
+"""
+Shared crawl frontier for splitting one crawl across processes and machines.
+
+The frontier holds the crawl's work items (pages to scrape and links to
+check) together with their dedup keys, so any number of workers can pull
+from it. A worker leases a batch of items, processes it and hands back the
+results plus any newly discovered items in one transaction. If a lease is
+neither completed nor renewed in time (the worker died or hung), it expires
+and its items are queued again. An item whose lease expired `max_attempts`
+times is recorded as failed, so it is not handed out forever.
+
+SQLiteFrontier keeps everything in one SQLite database in WAL mode, which
+processes on the same machine can share. To reach workers on other
+machines, the coordinator serves the database with
+`deadlink_checker.py --serve --frontier crawl.db`, and the remote workers
+use RemoteFrontier, which has the same methods.
+"""
+
+import concurrent.futures
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Optional
+from urllib.parse import urlparse
+from .models import LinkResult
+from .scanner import get_all_links, check_link
+from .canonical import URLCanonicalizer
+from .exclusion import ExclusionMatcher
+from .control import RunController
+from .events import as_reporter
+
+QUEUED, LEASED, DONE, FAILED = 0, 1, 2, 3
+PAGE, LINK = 'page', 'link'
+
+@dataclass
+class WorkItem:
+    """A page to scrape for links, or a link to check. `key` is the canonical URL used for dedup."""
+    kind: str
+    url: str
+    key: str
+    depth: int = 0
+    found_on: str = ''
+    link_type: str = 'Link'
+    id: Optional[int] = None
+
+_RESULT_COLUMNS = ('url', 'status_code', 'status_text', 'response_time', 'found_on', 'is_dead', 'is_external', 'link_type', 'retries')
+
+class SQLiteFrontier:
+    """Frontier in a SQLite database (WAL mode), shared by every process that opens the same file."""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    depth INTEGER NOT NULL DEFAULT 0,
+                    found_on TEXT,
+                    link_type TEXT,
+                    state INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    UNIQUE (kind, key)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    item_id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status_code INTEGER,
+                    status_text TEXT,
+                    response_time REAL,
+                    found_on TEXT,
+                    is_dead BOOLEAN,
+                    is_external BOOLEAN,
+                    link_type TEXT,
+                    retries INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_items_state ON items (state, id)")
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't lease the same rows
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        self._conn.close()
+
+    def configure(self, settings: dict) -> dict:
+        """Store the crawl settings unless the frontier already has some; returns the settings in effect."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+            if row:
+                return json.loads(row[0])
+            conn.execute("INSERT INTO meta (key, value) VALUES ('config', ?)", (json.dumps(settings),))
+            return settings
+
+    def config(self) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add(self, items: list[WorkItem]) -> int:
+        """Queue items not seen before (by kind and key). Returns how many were new."""
+        with self._transaction() as conn:
+            return self._insert(conn, items)
+
+    def _insert(self, conn, items: list[WorkItem]) -> int:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO items (kind, key, url, depth, found_on, link_type) VALUES (?, ?, ?, ?, ?, ?)",
+            [(i.kind, i.key, i.url, i.depth, i.found_on, i.link_type) for i in items]
+        )
+        return conn.total_changes - before
+
+    def lease(self, owner: str, limit: int, ttl: float) -> list[WorkItem]:
+        """Hand up to `limit` queued items to `owner` for `ttl` seconds."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._expire(conn, now)
+            rows = conn.execute(
+                "SELECT id, kind, url, key, depth, found_on, link_type FROM items WHERE state = ? ORDER BY id LIMIT ?",
+                (QUEUED, limit)
+            ).fetchall()
+            conn.executemany("UPDATE items SET state = ?, owner = ?, expires = ? WHERE id = ?",
+                             [(LEASED, owner, now + ttl, row[0]) for row in rows])
+        return [WorkItem(kind, url, key, depth, found_on or '', link_type or 'Link', item_id)
+                for item_id, kind, url, key, depth, found_on, link_type in rows]
+
+    def _expire(self, conn, now: float):
+        conn.execute("UPDATE items SET state = ?, owner = NULL, expires = NULL, attempts = attempts + 1 WHERE state = ? AND expires < ?",
+                     (QUEUED, LEASED, now))
+        failed = conn.execute("SELECT id, kind, url, found_on, link_type FROM items WHERE state = ? AND attempts >= ?",
+                              (QUEUED, self.max_attempts)).fetchall()
+        for item_id, kind, url, found_on, link_type in failed:
+            if kind == LINK:
+                self._store_result(conn, item_id, LinkResult(url, None, "Error: Worker lease expired", None, found_on or '', True, False, link_type or 'Link'))
+        conn.executemany("UPDATE items SET state = ? WHERE id = ?", [(FAILED, row[0]) for row in failed])
+
+    def renew(self, owner: str, ids: list[int], ttl: float) -> int:
+        """Extend `owner`'s leases on `ids`. Returns how many are still held."""
+        expires = time.time() + ttl
+        with self._transaction() as conn:
+            return sum(conn.execute("UPDATE items SET expires = ? WHERE id = ? AND state = ? AND owner = ?",
+                                    (expires, item_id, LEASED, owner)).rowcount for item_id in ids)
+
+    def complete(self, owner: str, results: list[tuple[int, Optional[LinkResult]]], discovered: list[WorkItem] = ()) -> int:
+        """
+        Record finished items and queue newly discovered ones, atomically.
+
+        Items whose lease `owner` no longer holds (it expired and went to
+        another worker) are ignored. Returns how many items were accepted.
+        """
+        with self._transaction() as conn:
+            self._insert(conn, list(discovered))
+            accepted = 0
+            for item_id, result in results:
+                updated = conn.execute("UPDATE items SET state = ?, owner = NULL, expires = NULL WHERE id = ? AND state = ? AND owner = ?",
+                                       (DONE, item_id, LEASED, owner)).rowcount
+                if updated:
+                    accepted += 1
+                    if result is not None:
+                        self._store_result(conn, item_id, result)
+            return accepted
+
+    def _store_result(self, conn, item_id: int, result: LinkResult):
+        conn.execute(f"INSERT OR REPLACE INTO results (item_id, {', '.join(_RESULT_COLUMNS)}) VALUES (?{', ?' * len(_RESULT_COLUMNS)})",
+                     (item_id, *(getattr(result, column) for column in _RESULT_COLUMNS)))
+
+    def release(self, owner: str) -> int:
+        """Put `owner`'s unfinished items back in the queue (e.g. on shutdown)."""
+        with self._transaction() as conn:
+            return conn.execute("UPDATE items SET state = ?, owner = NULL, expires = NULL WHERE state = ? AND owner = ?",
+                                (QUEUED, LEASED, owner)).rowcount
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+        return {name: rows.get(state, 0) for name, state in (('queued', QUEUED), ('leased', LEASED), ('done', DONE), ('failed', FAILED))}
+
+    def finished(self) -> bool:
+        """True once nothing is queued or leased."""
+        counts = self.counts()
+        return not (counts['queued'] or counts['leased'])
+
+    def results(self) -> list[LinkResult]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(_RESULT_COLUMNS)} FROM results ORDER BY item_id").fetchall()
+        return [LinkResult(url, code, text, time_, found_on, bool(dead), bool(external), link_type, retries or 0)
+                for url, code, text, time_, found_on, dead, external, link_type, retries in rows]
+
+class RemoteFrontier:
+    """A frontier served by another machine's `deadlink_checker.py --serve --frontier`."""
+
+    def __init__(self, address: tuple[str, int], timeout: float = 60, token: str = None):
+        self.address = address
+        self.timeout = timeout
+        self.token = token
+
+    def _call(self, op: str, **args):
+        from .server import request
+        response = request(self.address, {'command': 'frontier', 'op': op, 'args': args}, self.timeout, self.token)
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Frontier request failed'))
+        return response['value']
+
+    def close(self):
+        pass
+
+    def configure(self, settings: dict) -> dict:
+        return self._call('configure', settings=settings)
+
+    def config(self) -> Optional[dict]:
+        return self._call('config')
+
+    def add(self, items: list[WorkItem]) -> int:
+        return self._call('add', items=[asdict(i) for i in items])
+
+    def lease(self, owner: str, limit: int, ttl: float) -> list[WorkItem]:
+        return [WorkItem(**i) for i in self._call('lease', owner=owner, limit=limit, ttl=ttl)]
+
+    def renew(self, owner: str, ids: list[int], ttl: float) -> int:
+        return self._call('renew', owner=owner, ids=list(ids), ttl=ttl)
+
+    def complete(self, owner: str, results: list[tuple[int, Optional[LinkResult]]], discovered: list[WorkItem] = ()) -> int:
+        return self._call('complete', owner=owner, results=[(i, asdict(r) if r else None) for i, r in results],
+                          discovered=[asdict(i) for i in discovered])
+
+    def release(self, owner: str) -> int:
+        return self._call('release', owner=owner)
+
+    def counts(self) -> dict:
+        return self._call('counts')
+
+    def finished(self) -> bool:
+        return self._call('finished')
+
+    def results(self) -> list[LinkResult]:
+        return [LinkResult(**r) for r in self._call('results')]
+
+def handle_frontier_request(frontier, op: str, args: dict):
+    """Run one RemoteFrontier call against a local frontier and return a JSON-ready value."""
+    if op == 'add':
+        return frontier.add([WorkItem(**i) for i in args['items']])
+    if op == 'lease':
+        return [asdict(i) for i in frontier.lease(args['owner'], args['limit'], args['ttl'])]
+    if op == 'complete':
+        return frontier.complete(args['owner'], [(i, LinkResult(**r) if r else None) for i, r in args['results']],
+                                 [WorkItem(**i) for i in args['discovered']])
+    if op == 'results':
+        return [asdict(r) for r in frontier.results()]
+    if op in ('configure', 'config', 'renew', 'release', 'counts', 'finished'):
+        return getattr(frontier, op)(**args)
+    raise ValueError(f"Unknown frontier operation: {op}")
+
+def open_frontier(spec: str, token: str = None):
+    """'tcp://HOST:PORT' opens a RemoteFrontier (sending `token`); anything else is the path of a SQLiteFrontier."""
+    if spec.startswith('tcp://'):
+        from .server import parse_address
+        return RemoteFrontier(parse_address(spec[len('tcp://'):]), token=token)
+    return SQLiteFrontier(spec)
+
+def seed_crawl(frontier, url: str, max_depth: int = 1, exclude_patterns: list[str] = None, check_external: bool = True,
+               sort_query: bool = False, timeout: int = 10, auth: tuple = None, headers: dict = None) -> dict:
+    """
+    Set up a crawl of `url` in the frontier, the same way check_all_links would run it.
+
+    Seeding again with the same URL is harmless, so every coordinator
+    process can call it; a frontier holding a crawl of another URL raises
+    ValueError. Returns the crawl settings.
+    """
+    sitemap = url.endswith('sitemap.xml') or 'sitemap' in url.lower()
+    config = frontier.configure({
+        'url': url,
+        'follow_depth': max_depth if max_depth > 1 and not sitemap else 0,
+        'exclude': list(exclude_patterns or []),
+        'check_external': check_external,
+        'sort_query': sort_query,
+    })
+    if config['url'] != url:
+        raise ValueError(f"The frontier already holds a crawl of {config['url']}")
+
+    canonicalizer = URLCanonicalizer(url, sort_query=config['sort_query'])
+    if sitemap:
+        from .crawler import get_sitemap_urls, should_exclude
+        exclude = ExclusionMatcher(config['exclude'])
+        items = []
+        for page in get_sitemap_urls(url, timeout, auth=auth, headers=headers):
+            if not should_exclude(page, exclude):
+                key = canonicalizer.normalize(page)
+                items.append(WorkItem(PAGE, page, key))
+                items.append(WorkItem(LINK, page, key, found_on=page))
+    else:
+        items = [WorkItem(PAGE, url, canonicalizer.normalize(url))]
+    frontier.add(items)
+    return config
+
+def run_worker(frontier, max_workers: int = 10, timeout: int = 10, batch_size: int = 50, lease_seconds: float = 120,
+               progress_callback=None, auth: tuple = None, headers: dict = None, timeout_policy=None,
+               controller: RunController = None, worker_id: str = None, idle_poll: float = 1.0) -> int:
+    """
+    Work on a seeded frontier until the crawl is finished or `controller` stops.
+
+    Leases `batch_size` items at a time and processes them on `max_workers`
+    threads, renewing the lease while a batch is still running. On stop,
+    unfinished items are released for other workers. Returns the number
+    of items completed.
+    """
+    from .crawler import should_exclude, _timeout_for, PAGE_SKIP_EXTENSIONS
+
+    config = frontier.config()
+    if config is None:
+        raise ValueError("The frontier has not been seeded with a crawl")
+    reporter = as_reporter(progress_callback)
+    controller = controller or RunController()
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    canonicalizer = URLCanonicalizer(config['url'], sort_query=config['sort_query'])
+    exclude = ExclusionMatcher(config['exclude'])
+
+    def scrape(item: WorkItem) -> tuple[None, list[WorkItem]]:
+        try:
+            links, _ = get_all_links(item.url, _timeout_for(item.url, timeout, timeout_policy), auth=auth, headers=headers, session=controller.session())
+        except Exception as e:
+            reporter.log(f"❌ Error scraping {item.url}: {e}\n")
+            return None, []
+        return None, [WorkItem(LINK, link, canonicalizer.normalize(link), item.depth, item.url, link_type)
+                      for link, link_type in links if not should_exclude(link, exclude)]
+
+    def check(item: WorkItem) -> tuple[LinkResult, list[WorkItem]]:
+        if not config['check_external'] and canonicalizer.is_external(item.url):
+            return LinkResult(item.url, 200, "Skipped (External)", 0, item.found_on, False, True, item.link_type), []
+        result = check_link(item.url, item.found_on, _timeout_for(item.url, timeout, timeout_policy), item.link_type, auth=auth, headers=headers, session=controller.session())
+        result.is_external = canonicalizer.is_external(result.url, config['url'])
+        if timeout_policy:
+            timeout_policy.record(result)
+        found = []
+        if (item.depth < config['follow_depth'] and not result.is_dead and not result.is_external
+                and not urlparse(result.url).path.lower().endswith(PAGE_SKIP_EXTENSIONS)):
+            found.append(WorkItem(PAGE, result.url, canonicalizer.normalize(result.url), item.depth + 1))
+        return result, found
+
+    def process(item: WorkItem):
+        if not controller.wait_if_paused():
+            return None, []
+        return scrape(item) if item.kind == PAGE else check(item)
+
+    completed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while not controller.stopped:
+            items = frontier.lease(worker_id, batch_size, lease_seconds)
+            if not items:
+                if frontier.finished():
+                    break
+                controller.sleep(idle_poll)
+                continue
+
+            futures = {executor.submit(process, item): item for item in items}
+            pending = set(futures)
+            renew_at = time.monotonic() + lease_seconds / 3
+            while pending:
+                _, pending = concurrent.futures.wait(pending, timeout=max(0, renew_at - time.monotonic()))
+                if pending and time.monotonic() >= renew_at:
+                    frontier.renew(worker_id, [futures[f].id for f in pending], lease_seconds)
+                    renew_at = time.monotonic() + lease_seconds / 3
+            if controller.stopped:
+                break
+
+            finished, discovered = [], []
+            for future, item in futures.items():
+                result, found = future.result()
+                if result is not None:
+                    reporter.result(result)
+                finished.append((item.id, result))
+                discovered.extend(found)
+            completed += frontier.complete(worker_id, finished, discovered)
+            counts = frontier.counts()
+            reporter.log(f"📦 {worker_id}: {len(items)} items done ({counts['done']} total, {counts['queued']} queued, {counts['leased']} leased)\n")
+
+    if controller.stopped:
+        frontier.release(worker_id)
+    return completed
+
+def run_worker_process(spec: str, params: dict, token: str = None) -> int:
+    """Entry point for a local worker process: open the frontier at `spec` and work with CLI-style parameters."""
+    from .server import build_check_options
+    options = build_check_options('', params)
+    frontier = open_frontier(spec, token)
+    try:
+        return run_worker(frontier, max_workers=options['max_workers'], timeout=options['timeout'], timeout_policy=options['timeout_policy'])
+    finally:
+        frontier.close()
@@ -0,0 +1,59 @@
+import os
+import threading
+from typing import Optional
+
+class LogSpool:
+    """
+    Append-only log file for a run, so a UI only has to keep recent lines on screen.
+
+    Text is written as it arrives and newline-counted, letting the caller
+    tell the user how much of the log is on disk versus in the widget.
+    Writes are buffered; flush() is called once per UI tick. All methods
+    are thread-safe, so crawler threads can write while the UI flushes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = None
+        self.lines = 0
+        self._file = None
+        self._lock = threading.Lock()
+        if path:
+            self.open(path)
+
+    def open(self, path: str):
+        """Start a new log file at `path`, closing any previous one."""
+        self.close()
+        with self._lock:
+            self.path = None
+            self.lines = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        f = open(path, 'w', encoding='utf-8')
+        with self._lock:
+            self._file = f
+            self.path = path
+
+    def write(self, text: str):
+        with self._lock:
+            if self._file is None or not text:
+                return
+            self._file.write(text)
+            self.lines += text.count('\n')
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,178 @@
+"""
+Retention and upkeep for the history database.
+
+run_maintenance() (DatabaseManager.maintain) does, in one pass:
+
+- retention: sessions beyond a RetentionPolicy lose their per-link
+  results ("downsampled": the session row with its totals, report files
+  and profile stay) or are deleted outright
+- orphan cleanup: results, report_files and session_profiles rows whose
+  session is gone (left by deletes made before foreign keys were enforced)
+- incremental vacuum: returns free pages to the filesystem. Databases
+  created before auto_vacuum=INCREMENTAL are converted by a full VACUUM
+  the first time (full=True).
+- ANALYZE, at most every `analyze_interval` seconds
+
+Each run is recorded in the db_meta table, so callers can ask whether
+one is due (maintenance_due) before starting it in the background.
+"""
+
+import time
+from dataclasses import dataclass
+
+# ANALYZE at most weekly unless forced
+ANALYZE_INTERVAL = 7 * 24 * 3600
+
+# sqlite's default limit on host parameters is 999
+_CHUNK = 500
+
+class RetentionPolicy:
+    """
+    Which sessions keep their per-link results.
+
+    The newest `keep_last` sessions of each site keep everything, as do
+    sessions younger than `max_age_days`; either limit may be None. The
+    newest session of a site is never touched. Older sessions are
+    downsampled to their summary, or deleted with downsample=False.
+    """
+
+    def __init__(self, keep_last: int = None, max_age_days: float = None, downsample: bool = True):
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self.downsample = downsample
+
+@dataclass
+class MaintenanceReport:
+    sessions_downsampled: int = 0
+    sessions_deleted: int = 0
+    results_deleted: int = 0
+    orphans_deleted: int = 0
+    pages_freed: int = 0
+    analyzed: bool = False
+    converted: bool = False
+    bytes_before: int = 0
+    bytes_after: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        lines = [f"Sessions downsampled: {self.sessions_downsampled}", f"Sessions deleted: {self.sessions_deleted}",
+                 f"Result rows deleted: {self.results_deleted}", f"Orphaned rows deleted: {self.orphans_deleted}",
+                 f"Pages freed: {self.pages_freed}" + (" (converted to incremental auto-vacuum)" if self.converted else ""),
+                 f"ANALYZE: {'run' if self.analyzed else 'not due'}",
+                 f"Size: {self.bytes_before / 1e6:.1f} MB -> {self.bytes_after / 1e6:.1f} MB in {self.elapsed:.1f}s"]
+        return "\n".join(lines)
+
+def _size(cursor) -> int:
+    cursor.execute("PRAGMA page_count")
+    pages = cursor.fetchone()[0]
+    cursor.execute("PRAGMA page_size")
+    return pages * cursor.fetchone()[0]
+
+def _get_meta(cursor, key: str):
+    cursor.execute("SELECT value FROM db_meta WHERE key = ?", (key,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _set_meta(cursor, key: str, value):
+    cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+def maintenance_due(db, interval: float = 24 * 3600) -> bool:
+    """True if run_maintenance hasn't completed on `db` in the last `interval` seconds."""
+    with db._get_connection() as conn:
+        last = _get_meta(conn.cursor(), 'last_maintenance')
+    return last is None or time.time() - float(last) >= interval
+
+def expired_sessions(cursor, policy: RetentionPolicy) -> list[int]:
+    """Ids of sessions `policy` no longer keeps in full (already downsampled ones excluded when downsampling)."""
+    conditions, params = [], []
+    if policy.keep_last is not None:
+        conditions.append("rank > ?")
+        params.append(policy.keep_last)
+    if policy.max_age_days is not None:
+        conditions.append("(rank > 1 AND timestamp < datetime('now', ?))")
+        params.append(f"-{policy.max_age_days} days")
+    if not conditions:
+        return []
+    query = f"""
+        SELECT id FROM (
+            SELECT id, timestamp, downsampled,
+                   ROW_NUMBER() OVER (PARTITION BY url ORDER BY timestamp DESC, id DESC) AS rank
+            FROM sessions
+        ) WHERE ({' OR '.join(conditions)})
+    """
+    if policy.downsample:
+        query += " AND downsampled = 0"
+    cursor.execute(query, params)
+    return [row[0] for row in cursor.fetchall()]
+
+def _delete_in(cursor, table: str, column: str, ids: list) -> int:
+    deleted = 0
+    for i in range(0, len(ids), _CHUNK):
+        chunk = ids[i:i + _CHUNK]
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({','.join('?' * len(chunk))})", chunk)
+        deleted += cursor.rowcount
+    return deleted
+
+def run_maintenance(db, policy: RetentionPolicy = None, vacuum_pages: int = None, full: bool = False,
+                    analyze_interval: float = ANALYZE_INTERVAL, force_analyze: bool = False) -> MaintenanceReport:
+    """
+    Apply `policy`, clean up orphans, vacuum and analyze `db`.
+
+    vacuum_pages bounds how many free pages one run returns (None: all of
+    them), which keeps background runs short. full=True converts a
+    database without incremental auto-vacuum with a one-off VACUUM.
+    """
+    report = MaintenanceReport()
+    start = time.perf_counter()
+    conn = db._get_connection()
+    with conn:
+        cursor = conn.cursor()
+        report.bytes_before = _size(cursor)
+
+        if policy is not None:
+            expired = expired_sessions(cursor, policy)
+            report.results_deleted = _delete_in(cursor, 'results', 'session_id', expired)
+            if policy.downsample:
+                for i in range(0, len(expired), _CHUNK):
+                    chunk = expired[i:i + _CHUNK]
+                    cursor.execute(f"UPDATE sessions SET downsampled = 1 WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+                report.sessions_downsampled = len(expired)
+            else:
+                _delete_in(cursor, 'report_files', 'session_id', expired)
+                _delete_in(cursor, 'session_profiles', 'session_id', expired)
+                report.sessions_deleted = _delete_in(cursor, 'sessions', 'id', expired)
+
+        for table in ('results', 'report_files', 'session_profiles'):
+            cursor.execute(f"DELETE FROM {table} WHERE session_id IS NULL OR session_id NOT IN (SELECT id FROM sessions)")
+            report.orphans_deleted += cursor.rowcount
+
+        if force_analyze or time.time() - float(_get_meta(cursor, 'last_analyze') or 0) >= analyze_interval:
+            cursor.execute("ANALYZE")
+            _set_meta(cursor, 'last_analyze', time.time())
+            report.analyzed = True
+        conn.commit()
+
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] != 2 and full:
+        # Switching an existing database to incremental auto-vacuum takes a full VACUUM
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+        report.converted = True
+    cursor.execute("PRAGMA freelist_count")
+    free = cursor.fetchone()[0]
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] == 2 and free:
+        # executescript steps the pragma to completion; execute() would free a single page
+        conn.executescript("PRAGMA incremental_vacuum" + ("" if vacuum_pages is None else f"({int(vacuum_pages)})"))
+        cursor.execute("PRAGMA freelist_count")
+        report.pages_freed = free - cursor.fetchone()[0]
+
+    with conn:
+        cursor = conn.cursor()
+        _set_meta(cursor, 'last_maintenance', time.time())
+        report.bytes_after = _size(cursor)
+    report.elapsed = time.perf_counter() - start
+    return report
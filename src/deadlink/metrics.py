@@ -0,0 +1,218 @@
+"""
+Live crawl metrics for Prometheus / OpenMetrics scrapers.
+
+A CrawlMetrics instance is passed to the crawler as `metrics` and updated as
+checks run. serve_metrics() exposes it on a local HTTP listener at /metrics
+in the Prometheus text format, or OpenMetrics when the scraper asks for it:
+
+- deadlink_checks_in_flight, deadlink_worker_capacity and
+  deadlink_pool_utilization: requests on the wire against the worker budget
+- deadlink_queue_depth{queue="links|pages|retries"}
+- deadlink_checks_total{status_class}: rate() of it is checks/sec
+- deadlink_host_checks_total / deadlink_host_errors_total{host}: per-host error rates
+- deadlink_check_duration_seconds{host}: per-host latency histograms
+- deadlink_pages_total, process_resident_memory_bytes, deadlink_peak_memory_bytes,
+  deadlink_start_time_seconds
+
+Only the stdlib is used. Hosts beyond `max_hosts` are folded into
+host="other" to keep label cardinality bounded.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+def status_class(result) -> str:
+    """'2xx'..'5xx' for an HTTP status, 'skipped' for unchecked links, 'error' for no response."""
+    if result is None or result.status_code is None:
+        return 'error'
+    if result.status_text.startswith('Skipped'):
+        return 'skipped'
+    return f"{result.status_code // 100}xx"
+
+class _HostStats:
+    __slots__ = ('checks', 'errors', 'buckets', 'total')
+
+    def __init__(self):
+        self.checks = 0
+        self.errors = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+
+class CrawlMetrics:
+    """Thread-safe counters and gauges for one process's crawls."""
+
+    def __init__(self, max_hosts: int = 500):
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.capacity = 0
+        self.queues = {'links': 0, 'pages': 0, 'retries': 0}
+        self.checks = {}
+        self.pages = 0
+        self.hosts = {}
+        self.started = time.time()
+
+    def set_capacity(self, workers: int):
+        with self._lock:
+            self.capacity = workers
+
+    def set_queue(self, name: str, depth: int):
+        with self._lock:
+            self.queues[name] = depth
+
+    def add_queue(self, name: str, delta: int):
+        with self._lock:
+            self.queues[name] = self.queues.get(name, 0) + delta
+
+    def page_crawled(self):
+        with self._lock:
+            self.pages += 1
+
+    def check_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def check_finished(self, url: str, result, seconds: float):
+        """End a check started with check_started(); `result` is None if check_link raised."""
+        self.record(url, result, seconds, in_flight=True)
+
+    def record(self, url: str, result, seconds: float = None, in_flight: bool = False):
+        """Count a result; `seconds` (if timed) goes into the host's latency histogram."""
+        host = urlparse(url).hostname or ''
+        cls = status_class(result)
+        with self._lock:
+            if in_flight:
+                self.in_flight -= 1
+            self.checks[cls] = self.checks.get(cls, 0) + 1
+            if cls == 'skipped':
+                return
+            stats = self.hosts.get(host)
+            if stats is None:
+                if len(self.hosts) >= self.max_hosts:
+                    host = 'other'
+                stats = self.hosts.setdefault(host, _HostStats())
+            stats.checks += 1
+            if result is None or result.is_dead:
+                stats.errors += 1
+            if seconds is not None:
+                stats.total += seconds
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    if seconds <= bound:
+                        stats.buckets[i] += 1
+
+    def render(self, openmetrics: bool = False) -> str:
+        """All metrics in the Prometheus text format (or OpenMetrics)."""
+        rss, peak = _memory()
+        with self._lock:
+            families = [
+                ('deadlink_checks_in_flight', 'gauge', "Link checks currently waiting on the network.", [('', {}, self.in_flight)]),
+                ('deadlink_worker_capacity', 'gauge', "Concurrent checks allowed.", [('', {}, self.capacity)]),
+                ('deadlink_pool_utilization', 'gauge', "Checks in flight as a fraction of the worker capacity.",
+                 [('', {}, self.in_flight / self.capacity if self.capacity else 0)]),
+                ('deadlink_queue_depth', 'gauge', "Items waiting, by queue.",
+                 [('', {'queue': name}, depth) for name, depth in sorted(self.queues.items())]),
+                ('deadlink_checks', 'counter', "Link checks finished, by status class.",
+                 [('_total', {'status_class': cls}, n) for cls, n in sorted(self.checks.items())]),
+                ('deadlink_pages', 'counter', "Pages fetched and parsed for links.", [('_total', {}, self.pages)]),
+                ('deadlink_host_checks', 'counter', "Link checks finished, by host.",
+                 [('_total', {'host': host}, s.checks) for host, s in sorted(self.hosts.items())]),
+                ('deadlink_host_errors', 'counter', "Dead or failed link checks, by host.",
+                 [('_total', {'host': host}, s.errors) for host, s in sorted(self.hosts.items())]),
+                ('deadlink_check_duration_seconds', 'histogram', "Link check latency, by host.", self._histogram_samples()),
+            ]
+        if rss is not None:
+            families.append(('process_resident_memory_bytes', 'gauge', "Resident memory size in bytes.", [('', {}, rss)]))
+        if peak is not None:
+            families.append(('deadlink_peak_memory_bytes', 'gauge', "Peak resident memory size in bytes.", [('', {}, peak)]))
+        families.append(('deadlink_start_time_seconds', 'gauge', "When metrics collection started, in seconds since the epoch.", [('', {}, self.started)]))
+
+        lines = []
+        for name, kind, help_text, samples in families:
+            # Prometheus text names the counter family with its _total suffix, OpenMetrics without
+            family = name if openmetrics or kind != 'counter' else name + '_total'
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _histogram_samples(self) -> list:
+        samples = []
+        for host, s in sorted(self.hosts.items()):
+            for bound, n in zip(LATENCY_BUCKETS, s.buckets):
+                samples.append(('_bucket', {'host': host, 'le': _number(bound)}, n))
+            samples.append(('_bucket', {'host': host, 'le': '+Inf'}, s.checks))
+            samples.append(('_sum', {'host': host}, s.total))
+            samples.append(('_count', {'host': host}, s.checks))
+        return samples
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for key, value in labels.items())
+    return '{' + ','.join(escaped) + '}'
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(value) if not value.is_integer() else f"{value:.1f}"
+    return str(value)
+
+def _memory() -> tuple:
+    """(current RSS, peak RSS) in bytes, None where the platform doesn't say."""
+    rss = peak = None
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        peak = peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    return rss, peak
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = self.server.metrics.render(openmetrics).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP listener serving a CrawlMetrics at /metrics."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], metrics: CrawlMetrics):
+        self.metrics = metrics
+        super().__init__(address, _MetricsHandler)
+
+def serve_metrics(address: tuple[str, int], metrics: CrawlMetrics) -> MetricsServer:
+    """Start a MetricsServer on a daemon thread; call shutdown() on it to stop."""
+    server = MetricsServer(address, metrics)
+    threading.Thread(target=server.serve_forever, daemon=True, name="deadlink-metrics").start()
+    return server
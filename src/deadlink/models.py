@@ -12,3 +12,4 @@ class LinkResult:
     is_dead: bool
     is_external: bool
     link_type: str = "Link"
+    retries: int = 0
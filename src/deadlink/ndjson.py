@@ -0,0 +1,82 @@
+"""
+Newline-delimited JSON output for pipelines.
+
+An NDJSONReporter is passed to the crawler as its progress_callback and
+writes one JSON object per line as each check completes:
+
+    {"type": "result", "url": ..., "status_code": ..., ...LinkResult fields}
+
+followed, once the run is over, by one summary record:
+
+    {"type": "summary", "total": ..., "dead": ..., ...}
+
+A link re-checked at the end of the run (see --retries) appears again
+with a higher `retries`; the last record for a (url, found_on) pair wins.
+Records of a batch run carry a "site" field, and each site ends with a
+"site_summary" record. Lines are flushed as they are written, so a
+consumer can follow a long crawl while it runs. A run that fails still
+ends with a summary record, carrying an "error" field.
+"""
+
+import json
+import threading
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime
+from .events import CallbackReporter, ResultLine
+from .models import LinkResult
+
+def summarize(results: list[LinkResult]) -> dict:
+    """Counts over a finished run, as written in summary records."""
+    dead = sum(1 for r in results if r.is_dead)
+    return {
+        'total': len(results),
+        'working': len(results) - dead,
+        'dead': dead,
+        'external': sum(1 for r in results if r.is_external),
+        'pages': len({r.found_on for r in results}),
+        'retried': sum(1 for r in results if r.retries),
+        'success_rate': round((len(results) - dead) / len(results) * 100, 2) if results else 0.0,
+        'by_type': dict(Counter(r.link_type for r in results)),
+        'by_status': dict(Counter(r.status_text for r in results)),
+    }
+
+class NDJSONReporter(CallbackReporter):
+    """Reporter streaming results as JSON lines to a text stream; log lines are dropped."""
+
+    def __init__(self, stream, site: str = None, lock: threading.Lock = None):
+        super().__init__(None)
+        self.stream = stream
+        self.site = site
+        self._lock = lock or threading.Lock()
+
+    def for_site(self, site: str) -> 'NDJSONReporter':
+        """A reporter for one site of a batch, sharing this one's stream."""
+        return NDJSONReporter(self.stream, site, self._lock)
+
+    def log(self, message: str, verbose: bool = False):
+        pass
+
+    def result(self, result: LinkResult, line: ResultLine = None):
+        self.write({'type': 'result', **asdict(result)})
+
+    def progress(self, fraction: float):
+        pass
+
+    def summary(self, results: list[LinkResult], record_type: str = 'summary', **extra):
+        """Write a summary record for `results`; `extra` fields (url, elapsed_s, error, ...) are added to it."""
+        self.write({'type': record_type, **extra, **summarize(results), 'finished': datetime.now().isoformat(timespec='seconds')})
+
+    def close(self):
+        """Flush and close the stream (for a file opened for this reporter)."""
+        with self._lock:
+            self.stream.flush()
+            self.stream.close()
+
+    def write(self, record: dict):
+        if self.site is not None:
+            record = {'type': record['type'], 'site': self.site, **record}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.stream.write(line)
+            self.stream.flush()
@@ -6,52 +6,63 @@ from collections import defaultdict
 from urllib.parse import urlparse
 from .models import LinkResult
 
-def generate_report(results: list[LinkResult]) -> str:
-    """Generate a formatted report of all link check results."""
-    if not results: return "No links were found to check."
-
-    dead_links = [r for r in results if r.is_dead]
+def _overview_lines(results: list[LinkResult]) -> list[str]:
+    """Summary and breakdown sections shared by the full report and the summary view."""
     alive_links = [r for r in results if not r.is_dead]
-    internal_links = [r for r in results if not r.is_external]
-    external_links = [r for r in results if r.is_external]
-    dead_internal = [r for r in dead_links if not r.is_external]
-    dead_external = [r for r in dead_links if r.is_external]
+    dead_count = len(results) - len(alive_links)
+    external_count = sum(1 for r in results if r.is_external)
     pages_crawled = set(r.found_on for r in results)
 
-    by_type = defaultdict(list)
-    for r in results: by_type[r.link_type].append(r)
-
-    by_status = defaultdict(list)
-    for r in results: by_status[r.status_text].append(r)
+    by_type = defaultdict(int)
+    by_status = defaultdict(int)
+    for r in results:
+        by_type[r.link_type] += 1
+        by_status[r.status_text] += 1
 
     report = []
-    report.append("=" * 80)
-    report.append("                        DEAD LINK CHECKER REPORT")
-    report.append("=" * 80)
-    report.append("")
     report.append("📊 SUMMARY")
     report.append("-" * 40)
     report.append(f"  Pages crawled:       {len(pages_crawled)}")
     report.append(f"  Total items checked: {len(results)}")
     report.append(f"  ✅ Working items:    {len(alive_links)}")
-    report.append(f"  ❌ Dead items:       {len(dead_links)}")
+    report.append(f"  ❌ Dead items:       {dead_count}")
     report.append(f"  Success rate:        {len(alive_links)/len(results)*100:.1f}%" if results else "  Success rate:        0%")
+    retried = [r for r in results if r.retries]
+    if retried:
+        report.append(f"  🔁 Retried items:    {len(retried)} ({sum(r.retries for r in retried)} retries)")
     report.append("")
     report.append("📦 ASSET TYPE BREAKDOWN")
     report.append("-" * 40)
-    for ltype, items in sorted(by_type.items(), key=lambda x: -len(x[1])):
-        report.append(f"  {ltype}: {len(items)}")
+    for ltype, count in sorted(by_type.items(), key=lambda x: -x[1]):
+        report.append(f"  {ltype}: {count}")
     report.append("")
     report.append("🔗 LINK LOCATION BREAKDOWN")
     report.append("-" * 40)
-    report.append(f"  🏠 Internal:   {len(internal_links)}")
-    report.append(f"  🌐 External:   {len(external_links)}")
+    report.append(f"  🏠 Internal:   {len(results) - external_count}")
+    report.append(f"  🌐 External:   {external_count}")
     report.append("")
     report.append("📈 STATUS BREAKDOWN")
     report.append("-" * 40)
-    for status, links in sorted(by_status.items(), key=lambda x: -len(x[1])):
-        report.append(f"  {status}: {len(links)}")
+    for status, count in sorted(by_status.items(), key=lambda x: -x[1]):
+        report.append(f"  {status}: {count}")
+    report.append("")
+    return report
+
+def generate_report(results: list[LinkResult]) -> str:
+    """Generate a formatted report of all link check results."""
+    if not results: return "No links were found to check."
+
+    dead_links = [r for r in results if r.is_dead]
+    alive_links = [r for r in results if not r.is_dead]
+    dead_internal = [r for r in dead_links if not r.is_external]
+    dead_external = [r for r in dead_links if r.is_external]
+
+    report = []
+    report.append("=" * 80)
+    report.append("                        DEAD LINK CHECKER REPORT")
+    report.append("=" * 80)
     report.append("")
+    report.extend(_overview_lines(results))
 
     if dead_internal:
         report.append("❌ DEAD INTERNAL ASSETS (Need Attention)")
@@ -85,6 +96,79 @@ def generate_report(results: list[LinkResult]) -> str:
     report.append("=" * 80)
     return "\n".join(report)
 
+def generate_summary(results: list[LinkResult], max_dead: int = 25) -> str:
+    """Short report for on-screen display: the overview plus the first `max_dead` dead links, internal first."""
+    if not results: return "No links were found to check."
+
+    dead_links = sorted((r for r in results if r.is_dead), key=lambda r: r.is_external)
+
+    report = _overview_lines(results)
+    if dead_links:
+        report.append(f"❌ DEAD ITEMS ({len(dead_links)})")
+        report.append("-" * 40)
+        for i, link in enumerate(dead_links[:max_dead], 1):
+            location = "🌐" if link.is_external else "🏠"
+            report.append(f"  {i}. {location} [{link.link_type}] {link.status_text}: {link.url}")
+            report.append(f"     Found on: {link.found_on}")
+        if len(dead_links) > max_dead:
+            report.append(f"  … and {len(dead_links) - max_dead} more (see the full report or the Grid View)")
+    else:
+        report.append("🎉 No dead links found.")
+    return "\n".join(report)
+
+def generate_batch_summary(runs, reports: dict = None, cache=None) -> str:
+    """
+    Combined report for a batch run: one line per site (deadlink.batch.SiteRun), worst first,
+    then the dead links shared by several sites. `reports` maps a site URL to its report file.
+    """
+    reports = reports or {}
+    total = sum(len(run.results) for run in runs)
+    dead = sum(run.dead for run in runs)
+    failed = [run for run in runs if run.error]
+
+    report = []
+    report.append("=" * 80)
+    report.append("                     DEAD LINK CHECKER BATCH SUMMARY")
+    report.append("=" * 80)
+    report.append("")
+    report.append("📊 SUMMARY")
+    report.append("-" * 40)
+    report.append(f"  Sites checked:       {len(runs) - len(failed)}/{len(runs)}")
+    report.append(f"  Total items checked: {total}")
+    report.append(f"  ❌ Dead items:       {dead}")
+    report.append(f"  Sites with dead:     {sum(1 for run in runs if run.dead)}")
+    if cache is not None:
+        report.append(f"  Shared cache:        {cache.hits} hits, {cache.misses} links fetched")
+    report.append("")
+
+    report.append("🌐 SITES")
+    report.append("-" * 40)
+    for run in sorted(runs, key=lambda run: (run.error is None, -run.dead, run.url)):
+        if run.error:
+            report.append(f"  ⚠️ {run.url}: failed ({run.error})")
+        else:
+            icon = "❌" if run.dead else "✅"
+            report.append(f"  {icon} {run.url}: {run.dead} dead of {len(run.results)} ({run.elapsed:.1f}s)")
+        if run.url in reports:
+            report.append(f"     Report: {reports[run.url]}")
+    report.append("")
+
+    sites_by_dead_url = defaultdict(set)
+    for run in runs:
+        for r in run.results:
+            if r.is_dead:
+                sites_by_dead_url[r.url].add(run.url)
+    shared = sorted(((url, sites) for url, sites in sites_by_dead_url.items() if len(sites) > 1), key=lambda x: (-len(x[1]), x[0]))
+    if shared:
+        report.append("🔗 DEAD LINKS ON SEVERAL SITES")
+        report.append("-" * 40)
+        for url, sites in shared:
+            report.append(f"  {url} ({len(sites)} sites)")
+        report.append("")
+
+    report.append("=" * 80)
+    return "\n".join(report)
+
 def get_report_filename(target_url: str, extension: str = "txt", reports_dir: str = None, session_folder: str = None) -> str:
     """Generate a meaningful filename with domain and datetime."""
     domain = urlparse(target_url).netloc.lower().replace('www.', '')
@@ -0,0 +1,178 @@
+from bisect import bisect_left, insort
+from typing import Callable, Iterable, Optional
+from .models import LinkResult
+from .events import ProgressCounters
+from .search import SearchIndex, Query, parse_query
+
+COLUMNS = ("URL", "Status", "Type", "Time", "Location")
+
+def format_row(result: LinkResult) -> tuple:
+    """Display values for one result, in COLUMNS order."""
+    return (
+        result.url,
+        f"{result.status_code if result.status_code else 'Err'} {result.status_text}",
+        result.link_type,
+        f"{result.response_time}s",
+        "External" if result.is_external else "Internal"
+    )
+
+SORT_KEYS = {
+    "URL": lambda r: r.url,
+    "Status": lambda r: (r.status_code or -1, r.status_text),
+    "Type": lambda r: r.link_type,
+    "Time": lambda r: r.response_time if r.response_time is not None else -1.0,
+    "Location": lambda r: r.is_external,
+}
+
+class ResultModel:
+    """
+    In-memory store behind the results grid.
+
+    Results are kept once in arrival order; the visible view is a list of
+    indices into them, so sorting and filtering never copy results and a
+    virtualized view can ask for any visible row by position. A result for
+    a link that is already present (e.g. after a retry) replaces the old one.
+    Rows are indexed as they arrive so search() does not rescan results.
+    `counters` tallies the current results, so a retry is counted once.
+    """
+
+    # Above this share of new rows, re-sort the view instead of inserting one by one
+    RESORT_RATIO = 0.125
+
+    def __init__(self):
+        self._results: list[LinkResult] = []
+        self._index: dict[tuple, int] = {}
+        self._view: list[int] = []
+        self._filter: Optional[Callable[[int], bool]] = None
+        self._search = SearchIndex()
+        self.counters = ProgressCounters()
+        self.query = Query()
+        self.sort_column: Optional[str] = None
+        self.descending = False
+
+    def __len__(self):
+        """Number of visible (filtered) rows."""
+        return len(self._view)
+
+    @property
+    def total(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        self._results.clear()
+        self._index.clear()
+        self._view.clear()
+        self._search.clear()
+        self.counters = ProgressCounters()
+
+    def results(self) -> list[LinkResult]:
+        """All results in arrival order, ignoring the filter."""
+        return list(self._results)
+
+    def result(self, row: int) -> LinkResult:
+        return self._results[self._view[self._position(row)]]
+
+    def row(self, row: int) -> tuple:
+        return format_row(self.result(row))
+
+    def rows(self, start: int, stop: int) -> list[tuple]:
+        return [self.row(row) for row in range(max(start, 0), min(stop, len(self._view)))]
+
+    def extend(self, results: Iterable[LinkResult]):
+        first = len(self._results)
+        for result in results:
+            key = (result.url, result.found_on, result.link_type)
+            existing = self._index.get(key)
+            if existing is not None:
+                # Rows new in this call are not in the view yet
+                self._replace(existing, result, in_view=existing < first)
+                continue
+            row = len(self._results)
+            self._index[key] = row
+            self._results.append(result)
+            self._search.add(result)
+            self.counters.add(result)
+        added = [row for row in range(first, len(self._results)) if self._visible(row)]
+
+        if not added:
+            return
+        if self.sort_column is None:
+            self._view.extend(added)
+        elif len(added) > len(self._view) * self.RESORT_RATIO:
+            self._view.extend(added)
+            self._sort_view()
+        else:
+            key = self._view_key()
+            for i in added:
+                insort(self._view, i, key=key)
+
+    def sort(self, column: Optional[str], descending: bool = False):
+        """Sort the view by one of COLUMNS (None restores arrival order)."""
+        if column is not None and column not in SORT_KEYS:
+            raise ValueError(f"Unknown column: {column}")
+        self.sort_column = column
+        self.descending = descending and column is not None
+        self._sort_view()
+
+    def set_filter(self, predicate: Optional[Callable[[LinkResult], bool]] = None):
+        """Show only results for which `predicate` is true (None shows everything)."""
+        self.query = Query()
+        if predicate is None:
+            self._filter = None
+            self._view = list(range(len(self._results)))
+        else:
+            results = self._results
+            self._filter = lambda i: predicate(results[i])
+            self._view = [i for i, r in enumerate(results) if predicate(r)]
+        if self.sort_column is not None:
+            self._sort_view()
+
+    def search(self, text: str):
+        """
+        Filter the view with a search query (see deadlink.search.parse_query).
+
+        If the query only got more specific than the previous one, the
+        current view is narrowed in place, which also keeps its sort order.
+        """
+        query = parse_query(text)
+        if not query:
+            self.set_filter(None)
+            return
+        if self.query and query.narrows(self.query):
+            self._view = self._search.search(query, within=self._view)
+        else:
+            self._view = self._search.search(query)
+            if self.sort_column is not None:
+                self._sort_view()
+        self._filter = self._search.matcher(query)
+        self.query = query
+
+    def _visible(self, row: int) -> bool:
+        return self._filter is None or self._filter(row)
+
+    def _position(self, row: int) -> int:
+        # The view is always stored ascending; descending order is read back to front
+        return len(self._view) - 1 - row if self.descending else row
+
+    def _replace(self, index: int, result: LinkResult, in_view: bool = True):
+        key = self._view_key()
+        if in_view and self._visible(index):
+            # Locate the row while the old result still determines its sort position
+            position = bisect_left(self._view, key(index) if key else index, key=key)
+            del self._view[position]
+        self.counters.remove(self._results[index])
+        self.counters.add(result)
+        self._results[index] = result
+        self._search.update(index, result)
+        if in_view and self._visible(index):
+            insort(self._view, index, key=key)
+
+    def _view_key(self):
+        if self.sort_column is None:
+            return None
+        sort_key = SORT_KEYS[self.sort_column]
+        results = self._results
+        return lambda i: (sort_key(results[i]), i)
+
+    def _sort_view(self):
+        self._view.sort(key=self._view_key())
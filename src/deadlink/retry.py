@@ -0,0 +1,80 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Callable, Optional
+from .models import LinkResult
+from .timeouts import TIMEOUT_ERRORS
+
+TRANSIENT_STATUS_CODES = (429, 502, 503, 504)
+TRANSIENT_ERRORS = TIMEOUT_ERRORS + ("Error: ConnectionError", "Error: ChunkedEncodingError", "Error: ProxyError")
+
+def is_transient(result: LinkResult) -> bool:
+    """Check if a failed result is likely to succeed when retried (timeouts, resets, 429, 502/503/504)."""
+    if result.status_code is None:
+        return result.status_text in TRANSIENT_ERRORS
+    return result.status_code in TRANSIENT_STATUS_CODES
+
+class RetryPolicy:
+    """
+    How transient failures are retried.
+
+    Attempt n waits roughly base_delay * 2 ** (n - 1) seconds (capped at
+    max_delay); `jitter` is the fraction of that delay that is randomized so
+    retries against the same host do not arrive in lockstep.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0, jitter: float = 0.5,
+                 retryable: Callable[[LinkResult], bool] = is_transient):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retryable = retryable
+
+    def delay_for(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay - random.uniform(0, delay * self.jitter)
+
+    def should_retry(self, result: LinkResult) -> bool:
+        return result.retries < self.max_retries and self.retryable(result)
+
+class RetryQueue:
+    """Thread-safe queue of results waiting for their next attempt, ordered by when they become due."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    def push(self, key, result: LinkResult) -> bool:
+        """Schedule `result` for another attempt. Returns False if it should not be retried."""
+        if not self.policy.should_retry(result):
+            return False
+        due = time.monotonic() + self.policy.delay_for(result.retries + 1)
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._counter), key, result))
+        return True
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest entry is due (0 if already due), or None if empty."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def pop_due(self) -> list[tuple]:
+        """Remove and return all (key, result) entries that are due now."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, key, result = heapq.heappop(self._heap)
+                due.append((key, result))
+        return due
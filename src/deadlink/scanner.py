@@ -1,17 +1,22 @@
 import requests
 import time
+from contextlib import nullcontext
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from .models import LinkResult
 from .utils import get_status_text
 
-def get_all_links(url: str, timeout: int = 10, auth: tuple = None, headers: dict = None) -> tuple[list[tuple[str, str]], str]:
+def get_all_links(url: str, timeout: float | tuple[float, float] = 10, auth: tuple = None, headers: dict = None, session: requests.Session = None, profile=None) -> tuple[list[tuple[str, str]], str]:
     """
     Scrape all links and assets from a given webpage.
 
+    With a deadlink.timing.RunProfile, the page fetch is recorded as a
+    'request' and link extraction as 'parse'.
+
     Returns:
         Tuple of (list of (absolute URL, type) tuples, base URL)
     """
+    http = session or requests
     default_headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
@@ -19,12 +24,18 @@ def get_all_links(url: str, timeout: int = 10, auth: tuple = None, headers: dict
         default_headers.update(headers)
 
     try:
-        response = requests.get(url, headers=default_headers, timeout=timeout, auth=auth)
+        with profile.timer('request', urlparse(url).hostname) if profile else nullcontext():
+            response = http.get(url, headers=default_headers, timeout=timeout, auth=auth)
         response.raise_for_status()
     except Exception as e:
         raise Exception(f"Failed to fetch {url}: {e}")
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    with profile.timer('parse') if profile else nullcontext():
+        assets = _extract_links(url, response.text)
+    return list(assets), url
+
+def _extract_links(url: str, html: str) -> set[tuple[str, str]]:
+    soup = BeautifulSoup(html, 'html.parser')
     assets = set()
 
     # 1. Find all anchor tags (Links)
@@ -64,15 +75,16 @@ def get_all_links(url: str, timeout: int = 10, auth: tuple = None, headers: dict
         if absolute_url.startswith(('http://', 'https://')):
             assets.add((absolute_url, "Iframe"))
 
-    return list(assets), url
+    return assets
 
-def check_link(url: str, found_on: str, timeout: int = 10, link_type: str = "Link", auth: tuple = None, headers: dict = None) -> LinkResult:
+def check_link(url: str, found_on: str, timeout: float | tuple[float, float] = 10, link_type: str = "Link", auth: tuple = None, headers: dict = None, session: requests.Session = None) -> LinkResult:
     """
     Check if a link is alive or dead.
 
     Returns:
         LinkResult with status information
     """
+    http = session or requests
     default_headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
@@ -82,11 +94,12 @@ def check_link(url: str, found_on: str, timeout: int = 10, link_type: str = "Lin
     start_time = time.time()
     try:
         # Use HEAD request first for efficiency
-        response = requests.head(url, headers=default_headers, timeout=timeout, allow_redirects=True, auth=auth)
+        response = http.head(url, headers=default_headers, timeout=timeout, allow_redirects=True, auth=auth)
         
         # Some servers block HEAD, if so, try GET
         if response.status_code in [404, 405, 403, 501]:
-            response = requests.get(url, headers=default_headers, timeout=timeout, stream=True, auth=auth)
+            response = http.get(url, headers=default_headers, timeout=timeout, stream=True, auth=auth)
+            response.close()
             
         status_code = response.status_code
         status_text = get_status_text(status_code)
@@ -0,0 +1,238 @@
+import shlex
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+from .models import LinkResult
+
+FILTER_ALIASES = {
+    'status': 'status', 'code': 'status',
+    'type': 'type',
+    'external': 'external', 'ext': 'external',
+    'dead': 'dead', 'broken': 'dead',
+}
+
+def _parse_bool(value: str) -> Optional[bool]:
+    """'y', 'ye', 'yes', 'true', '1' -> True; 'n', 'no', 'false', '0' -> False; anything else -> None."""
+    if value == '1' or any(word.startswith(value) for word in ('yes', 'true')):
+        return True
+    if value == '0' or any(word.startswith(value) for word in ('no', 'false')):
+        return False
+    return None
+
+def _status_matcher(value: str) -> Callable[[int], bool]:
+    """
+    Match a status code (-1 for connection errors) against a filter value.
+
+    Codes match by prefix so `4`, `40` and `404` all work while typing;
+    `4xx` is the same as `4`, and `err`/`error` matches failed requests.
+    Alternatives are separated by commas: `status:404,5xx`.
+    """
+    options = [v.rstrip('x') for v in value.split(',') if v]
+    errors = any(o and not o.isdigit() and 'error'.startswith(o) for o in options)
+    prefixes = tuple(o for o in options if o.isdigit())
+    return lambda code: errors if code < 0 else str(code).startswith(prefixes)
+
+@dataclass(frozen=True)
+class Filter:
+    key: str
+    value: str
+    negated: bool = False
+
+@dataclass(frozen=True)
+class Query:
+    """A parsed search: free-text terms plus `key:value` filters. `-` excludes."""
+    terms: tuple = ()
+    excluded: tuple = ()
+    filters: tuple = ()
+
+    def __bool__(self):
+        return bool(self.terms or self.excluded or self.filters)
+
+    def narrows(self, previous: 'Query') -> bool:
+        """True if every result matching this query is known to match `previous`."""
+        if not all(term in self.excluded for term in previous.excluded):
+            return False
+        if not all(any(p in t for t in self.terms) for p in previous.terms):
+            return False
+        for old in previous.filters:
+            if old.negated or ',' in old.value:
+                if old not in self.filters:
+                    return False
+            elif not any(new.key == old.key and not new.negated and ',' not in new.value
+                         and new.value.startswith(old.value)
+                         and (old.key not in ('external', 'dead') or _parse_bool(new.value) == _parse_bool(old.value))
+                         for new in self.filters):
+                return False
+        return True
+
+def parse_query(text: str) -> Query:
+    """
+    Parse a grid search such as `status:404 type:image external:yes blog -cdn`.
+
+    Known filters are status (alias code), type, external (alias ext) and
+    dead (alias broken). Unknown `key:value` tokens are searched as text,
+    and quoted phrases are kept together.
+    """
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+
+    terms, excluded, filters = [], [], []
+    for token in tokens:
+        token = token.lower()
+        negated = token.startswith('-') and len(token) > 1
+        body = token[1:] if negated else token
+        key, sep, value = body.partition(':')
+        if sep and key in FILTER_ALIASES:
+            if value:
+                filters.append(Filter(FILTER_ALIASES[key], value, negated))
+            continue
+        (excluded if negated else terms).append(body)
+    return Query(tuple(terms), tuple(excluded), tuple(filters))
+
+class SearchIndex:
+    """
+    Columnar search index over results, maintained as results arrive.
+
+    Each result gets a row id (its position in arrival order). The index
+    keeps one lowercase text line per row for free-text terms, the status,
+    type and flags as columns, and posting lists of row ids per status
+    code and per type, so structured filters start from the matching rows
+    instead of scanning everything.
+    """
+
+    def __init__(self):
+        self._text: list[str] = []
+        self._status: list[int] = []
+        self._type: list[str] = []
+        self._external = bytearray()
+        self._dead = bytearray()
+        self._by_status: dict[int, list[int]] = {}
+        self._by_type: dict[str, list[int]] = {}
+        self._types: dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._text)
+
+    def clear(self):
+        # Cleared in place so matchers handed out earlier keep working on new rows
+        for column in (self._text, self._status, self._type, self._external, self._dead):
+            del column[:]
+        self._by_status.clear()
+        self._by_type.clear()
+
+    def add(self, result: LinkResult) -> int:
+        row = len(self._text)
+        self._text.append(None)
+        self._status.append(0)
+        self._type.append(None)
+        self._external.append(0)
+        self._dead.append(0)
+        self._store(row, result)
+        return row
+
+    def extend(self, results: Iterable[LinkResult]):
+        for result in results:
+            self.add(result)
+
+    def update(self, row: int, result: LinkResult):
+        """Re-index `row` with a new result (e.g. after a retry)."""
+        for postings, key in ((self._by_status, self._status[row]), (self._by_type, self._type[row])):
+            ids = postings[key]
+            del ids[bisect_left(ids, row)]
+        self._store(row, result)
+
+    def _store(self, row: int, result: LinkResult):
+        status = result.status_code if result.status_code else -1
+        link_type = self._types.setdefault(result.link_type.lower(), result.link_type.lower())
+        location = "external" if result.is_external else "internal"
+        self._text[row] = f"{result.url}\x1f{status} {result.status_text}\x1f{link_type}\x1f{location}".lower()
+        self._status[row] = status
+        self._type[row] = link_type
+        self._external[row] = result.is_external
+        self._dead[row] = result.is_dead
+        for postings, key in ((self._by_status, status), (self._by_type, link_type)):
+            ids = postings.setdefault(key, [])
+            if ids and ids[-1] > row:
+                ids.insert(bisect_left(ids, row), row)
+            else:
+                ids.append(row)
+
+    def matcher(self, query) -> Callable[[int], bool]:
+        """Return a predicate over row ids, usable for rows added later."""
+        checks = self._checks(parse_query(query) if isinstance(query, str) else query)
+        return lambda row: all(check(row) for check in checks)
+
+    def search(self, query, within: Iterable[int] = None) -> list[int]:
+        """
+        Row ids matching `query`, in the order of `within` (default: all rows in id order).
+
+        Pass the previous result as `within` when the query only got more
+        specific (see Query.narrows) to filter that instead of the whole index.
+        """
+        query = parse_query(query) if isinstance(query, str) else query
+        rows = within if within is not None else self._seed(query)
+        for check in self._checks(query, include_text=False):
+            rows = [row for row in rows if check(row)]
+        text = self._text
+        for term in query.terms:
+            if isinstance(rows, range):
+                rows = [row for row, line in enumerate(text) if term in line]
+            else:
+                rows = [row for row in rows if term in text[row]]
+        for term in query.excluded:
+            rows = [row for row in rows if term not in text[row]]
+        return rows if isinstance(rows, list) else list(rows)
+
+    def _seed(self, query: Query):
+        """Rows for the most selective positive status/type filter, or every row."""
+        best = None
+        for f in query.filters:
+            if f.negated or f.key not in ('status', 'type'):
+                continue
+            postings = self._by_status if f.key == 'status' else self._by_type
+            match = self._value_matcher(f)
+            lists = [ids for key, ids in postings.items() if match(key)]
+            size = sum(len(ids) for ids in lists)
+            if best is None or size < best[0]:
+                best = (size, lists)
+        if best is None:
+            return range(len(self._text))
+        lists = best[1]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(row for ids in lists for row in ids)
+
+    def _value_matcher(self, f: Filter) -> Callable:
+        if f.key == 'status':
+            return _status_matcher(f.value)
+        if f.key == 'type':
+            options = tuple(v for v in f.value.split(',') if v)
+            return lambda link_type: link_type.startswith(options)
+        wanted = _parse_bool(f.value)
+        return lambda flag: wanted is not None and bool(flag) == wanted
+
+    def _checks(self, query: Query, include_text: bool = True) -> list:
+        checks = []
+        for f in query.filters:
+            column = {'status': self._status, 'type': self._type, 'external': self._external, 'dead': self._dead}[f.key]
+            match = self._value_matcher(f)
+            memo = {}
+
+            def check(row, column=column, match=match, memo=memo, negated=f.negated):
+                value = column[row]
+                hit = memo.get(value)
+                if hit is None:
+                    hit = memo[value] = match(value)
+                return hit != negated
+
+            checks.append(check)
+        if not include_text:
+            return checks
+        text = self._text
+        for term in query.terms:
+            checks.append(lambda row, term=term: term in text[row])
+        for term in query.excluded:
+            checks.append(lambda row, term=term: term not in text[row])
+        return checks
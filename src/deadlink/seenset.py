@@ -0,0 +1,201 @@
+"""
+Seen-sets: the crawler's record of visited pages and checked links.
+
+The crawler only needs `key in seen`, `seen.add(key)` and `len(seen)`, so
+any of these can stand in for the default Python set:
+
+- set (mode 'memory'): exact, but keeps every URL string in memory.
+- DiskSeenSet (mode 'disk'): exact. Recent keys stay in a bounded
+  in-memory hot set and everything is written to a scratch SQLite file as
+  16-byte hashes, with a Bloom filter in front so that most lookups of new
+  URLs never touch the disk. Memory use stays flat however large the crawl
+  grows. Two different URLs would only collide if their 128-bit BLAKE2b
+  hashes matched, which is negligible in practice.
+- BloomSeenSet (mode 'bloom'): a fixed-size Bloom filter with no disk use.
+  It has false positives but no false negatives. A new URL is wrongly
+  reported as seen with probability `error_rate` while the set holds up to
+  `capacity` keys, and that rate grows if the set is filled past capacity.
+  A false positive means the link is skipped. Use this mode only when
+  skipping roughly one link in a thousand is acceptable.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable
+
+SEEN_SET_MODES = ('memory', 'disk', 'bloom')
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+class BloomFilter:
+    """Bloom filter over 16-byte digests, sized for `capacity` keys at `error_rate` false positives."""
+
+    def __init__(self, capacity: int = 5_000_000, error_rate: float = 0.001):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, digest: bytes):
+        # Double hashing: the two halves of the digest generate all k positions
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add_digest(self, digest: bytes) -> bool:
+        """Set the bits for `digest`. Returns True if any bit was new (the key was definitely absent)."""
+        bits = self._bits
+        new = False
+        for position in self._positions(digest):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        return new
+
+    def contains_digest(self, digest: bytes) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(digest))
+
+    def add(self, key: str) -> bool:
+        return self.add_digest(_digest(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_digest(_digest(key))
+
+class BloomSeenSet:
+    """Approximate seen-set in fixed memory (see the module docstring for its false positives)."""
+
+    def __init__(self, capacity: int = 5_000_000, error_rate: float = 0.001):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.bloom
+
+    def add(self, key: str):
+        with self._lock:
+            if self.bloom.add(key):
+                self._len += 1
+
+    def close(self):
+        pass
+
+def _close_store(conn: sqlite3.Connection, path: str = None):
+    conn.close()
+    if path:
+        for suffix in ('', '-journal', '-wal', '-shm'):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+class DiskSeenSet:
+    """
+    Exact seen-set with bounded memory: a hot set of recent keys in front of a SQLite file.
+
+    New keys are buffered and written `flush_every` at a time. When the hot
+    set grows past `hot_size`, its oldest keys are dropped from memory; they
+    remain on disk. Without a `path`, a temporary file in `directory` is used
+    and deleted on close().
+    """
+
+    def __init__(self, path: str = None, hot_size: int = 100_000, bloom: BloomFilter = None, flush_every: int = 5000, directory: str = None):
+        temporary = path is None
+        if temporary:
+            fd, path = tempfile.mkstemp(prefix='deadlink-seen-', suffix='.db', dir=directory)
+            os.close(fd)
+        self.path = path
+        self.hot_size = max(hot_size, flush_every)
+        self.flush_every = flush_every
+        self.bloom = bloom
+        self._hot: OrderedDict[bytes, None] = OrderedDict()
+        self._pending: list[bytes] = []
+        self._len = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        # Scratch data: no journal, no fsync
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._len = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self._finalizer = weakref.finalize(self, _close_store, self._conn, path if temporary else None)
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._contains(_digest(key))
+
+    def _contains(self, digest: bytes) -> bool:
+        if digest in self._hot:
+            self._hot.move_to_end(digest)
+            return True
+        if self.bloom is not None and not self.bloom.contains_digest(digest):
+            return False
+        return self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (digest,)).fetchone() is not None
+
+    def add(self, key: str):
+        digest = _digest(key)
+        with self._lock:
+            if self._contains(digest):
+                return
+            self._hot[digest] = None
+            self._pending.append(digest)
+            self._len += 1
+            if self.bloom is not None:
+                self.bloom.add_digest(digest)
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+            if len(self._hot) > self.hot_size:
+                # Keys leaving memory must already be on disk
+                self._flush()
+                while len(self._hot) > self.hot_size:
+                    self._hot.popitem(last=False)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        self._conn.execute("BEGIN")
+        self._conn.executemany("INSERT OR IGNORE INTO seen (key) VALUES (?)", [(d,) for d in self._pending])
+        self._conn.execute("COMMIT")
+        self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Close the store; a temporary file is deleted."""
+        self._finalizer()
+
+def seen_set_factory(mode: str = 'memory', directory: str = None, hot_size: int = 100_000,
+                     capacity: int = 5_000_000, error_rate: float = 0.001) -> Callable[[], object]:
+    """Return a callable making empty seen-sets of the given mode (one of SEEN_SET_MODES)."""
+    if mode == 'memory':
+        return set
+    if mode == 'disk':
+        return lambda: DiskSeenSet(hot_size=hot_size, bloom=BloomFilter(capacity, error_rate), directory=directory)
+    if mode == 'bloom':
+        return lambda: BloomSeenSet(capacity, error_rate)
+    raise ValueError(f"Unknown seen-set mode: {mode} (expected one of {', '.join(SEEN_SET_MODES)})")
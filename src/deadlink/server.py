@@ -0,0 +1,176 @@
+"""
+Warm check server for repeated command-line use.
+
+`deadlink_checker.py --serve` keeps one process with the crawler already
+imported and answers check requests on a local TCP socket, so callers such
+as CI hooks using `--connect` skip the interpreter and import cost of a cold
+start. Each connection carries one newline-terminated JSON request and gets
+one JSON line back.
+
+A server bound to anything but a loopback address needs a shared token:
+without one, anyone who can reach the port could make it fetch arbitrary
+URLs or tamper with a served frontier. Clients send the token with every
+request; the CLI reads it from --token or $DEADLINK_TOKEN.
+
+Only the stdlib is imported here; the crawler loads when a check first runs
+(or at serve() start), so the client side stays cheap.
+"""
+
+import hmac
+import ipaddress
+import json
+import socket
+import socketserver
+from dataclasses import asdict
+from .models import LinkResult
+
+DEFAULT_ADDRESS = ("127.0.0.1", 8765)
+
+# Environment variable the CLI reads the shared token from
+TOKEN_ENV = 'DEADLINK_TOKEN'
+
+# Parameters accepted from a client, with the CLI defaults
+CHECK_DEFAULTS = {
+    'workers': 10,
+    'timeout': 10,
+    'depth': 1,
+    'connect_timeout': 5,
+    'adaptive_timeout': False,
+    'retry_timeouts': False,
+    'retries': 0,
+    'retry_delay': 1.0,
+    'exclude': [],
+    'sort_query': False,
+    'seen_set': 'memory',
+}
+
+def parse_address(text: str) -> tuple[str, int]:
+    """'8765' or 'host:8765' -> (host, port); the host defaults to 127.0.0.1."""
+    host, sep, port = text.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid address (expected [HOST:]PORT): {text}")
+    return (host if sep and host else DEFAULT_ADDRESS[0]), int(port)
+
+def is_loopback(host: str) -> bool:
+    """True for 'localhost' and loopback IPs; other names and wildcard binds ('', 0.0.0.0) are not."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def build_check_options(url: str, params: dict) -> dict:
+    """
+    Turn CLI-style parameters into check_all_links keyword arguments.
+
+    Raises ValueError for invalid exclusion patterns or unknown parameters.
+    """
+    unknown = set(params) - set(CHECK_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown check parameters: {', '.join(sorted(unknown))}")
+    p = {**CHECK_DEFAULTS, **params}
+
+    from .timeouts import TimeoutPolicy
+    from .retry import RetryPolicy
+    from .exclusion import ExclusionMatcher
+    from .canonical import URLCanonicalizer
+    from .seenset import seen_set_factory
+
+    timeout_policy = None
+    if p['adaptive_timeout'] or p['retry_timeouts']:
+        timeout_policy = TimeoutPolicy(
+            connect_timeout=min(p['connect_timeout'], p['timeout']),
+            min_read_timeout=1 if p['adaptive_timeout'] else p['timeout'],
+            max_read_timeout=p['timeout'],
+            retry_timeouts=p['retry_timeouts']
+        )
+    retry_policy = RetryPolicy(max_retries=p['retries'], base_delay=p['retry_delay']) if p['retries'] > 0 else None
+
+    return dict(
+        max_workers=p['workers'],
+        timeout=p['timeout'],
+        max_depth=p['depth'],
+        timeout_policy=timeout_policy,
+        retry_policy=retry_policy,
+        exclude_patterns=ExclusionMatcher(p['exclude'], strict=True),
+        canonicalizer=URLCanonicalizer(url, sort_query=p['sort_query']),
+        seen_set=seen_set_factory(p['seen_set'])
+    )
+
+def run_check(url: str, params: dict = None, **options) -> list[LinkResult]:
+    """Check `url` in this process with CLI-style parameters; `options` (progress_callback, profile, metrics) go to check_all_links."""
+    from .crawler import check_all_links
+    return check_all_links(url, **options, **build_check_options(url, params or {}))
+
+class _CheckHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get('command', 'check')
+            token = self.server.token
+            if token is not None and not hmac.compare_digest(str(request.get('token', '')).encode('utf-8'), token.encode('utf-8')):
+                response = {'ok': False, 'error': "Unauthorized: missing or wrong token"}
+            elif command == 'ping':
+                response = {'ok': True}
+            elif command == 'check':
+                results = run_check(request['url'], request.get('params'), metrics=self.server.metrics)
+                response = {'ok': True, 'results': [asdict(r) for r in results]}
+            elif command == 'frontier' and self.server.frontier is not None:
+                from .frontier import handle_frontier_request
+                response = {'ok': True, 'value': handle_frontier_request(self.server.frontier, request['op'], request.get('args', {}))}
+            else:
+                response = {'ok': False, 'error': f"Unknown command: {command}"}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {'ok': False, 'error': f"Bad request: {e}"}
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+
+class CheckServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded server running one request per connection.
+
+    With a `frontier` (see deadlink.frontier), it also serves that frontier
+    to RemoteFrontier workers on other machines. With `metrics` (a
+    deadlink.metrics.CrawlMetrics), every check it runs feeds those metrics.
+    With a `token`, requests without it are refused; binding to a
+    non-loopback address without one raises ValueError.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int] = DEFAULT_ADDRESS, frontier=None, metrics=None, token: str = None):
+        if not token and not is_loopback(address[0]):
+            raise ValueError(f"Serving on {address[0] or 'all interfaces'} needs a shared token (--token or ${TOKEN_ENV})")
+        self.frontier = frontier
+        self.metrics = metrics
+        self.token = token or None
+        super().__init__(address, _CheckHandler)
+
+def serve(address: tuple[str, int] = DEFAULT_ADDRESS, ready=None, frontier=None, metrics=None, token: str = None):
+    """Preload the crawler and serve check (and frontier) requests until interrupted."""
+    from . import crawler  # noqa: F401 - warm the import before the first request
+    with CheckServer(address, frontier, metrics, token) as server:
+        if ready:
+            ready(server)
+        server.serve_forever()
+
+def request(address: tuple[str, int], payload: dict, timeout: float = None, token: str = None) -> dict:
+    """Send one request (with `token`, if the server needs one) to a running server and return its decoded response."""
+    if token:
+        payload = {**payload, 'token': token}
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall(json.dumps(payload).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Server closed the connection without a response")
+    return json.loads(line)
+
+def remote_check(address: tuple[str, int], url: str, params: dict = None, timeout: float = None, token: str = None) -> list[LinkResult]:
+    """Run a check on a warm server. Raises RuntimeError with the server's message on failure."""
+    response = request(address, {'command': 'check', 'url': url, 'params': params or {}}, timeout, token)
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error', 'Check failed'))
+    return [LinkResult(**r) for r in response['results']]
@@ -0,0 +1,80 @@
+import threading
+from collections import deque
+from typing import Optional
+from urllib.parse import urlparse
+from .models import LinkResult
+
+TIMEOUT_ERRORS = ("Error: ReadTimeout", "Error: ConnectTimeout", "Error: Timeout")
+
+def is_timeout(result: LinkResult) -> bool:
+    """Check if a result failed because the request timed out."""
+    return result.status_code is None and result.status_text in TIMEOUT_ERRORS
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+class TimeoutPolicy:
+    """
+    Derives per-host (connect, read) timeouts from observed response times.
+
+    Until a host has `min_samples` successful responses it gets the full
+    `max_read_timeout`. After that its read timeout is its p95 latency times
+    `latency_multiplier`, clamped to [min_read_timeout, max_read_timeout].
+    """
+
+    def __init__(self, connect_timeout: float = 5.0, min_read_timeout: float = 2.0, max_read_timeout: float = 10.0,
+                 latency_multiplier: float = 4.0, min_samples: int = 5, window: int = 200,
+                 retry_timeouts: bool = False, retry_factor: float = 2.0):
+        self.connect_timeout = connect_timeout
+        self.min_read_timeout = min_read_timeout
+        self.max_read_timeout = max(max_read_timeout, min_read_timeout)
+        self.latency_multiplier = latency_multiplier
+        self.min_samples = min_samples
+        self.window = window
+        self.retry_timeouts = retry_timeouts
+        self.retry_factor = retry_factor
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def record(self, result: LinkResult):
+        """Record the response time of a completed check."""
+        if result.status_code is None or result.response_time is None:
+            return
+        host = self.host_of(result.url)
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(result.response_time)
+
+    def host_stats(self, host: str) -> Optional[dict]:
+        """Return p50/p95 latency and sample count for a host, or None if unseen."""
+        with self._lock:
+            samples = sorted(self._samples.get(host.lower(), ()))
+        if not samples:
+            return None
+        return {'count': len(samples), 'p50': _percentile(samples, 50), 'p95': _percentile(samples, 95)}
+
+    def all_host_stats(self) -> dict[str, dict]:
+        with self._lock:
+            hosts = list(self._samples)
+        return {host: self.host_stats(host) for host in hosts}
+
+    def timeout_for(self, url: str) -> tuple[float, float]:
+        """Return the (connect, read) timeout to use for a request to `url`."""
+        stats = self.host_stats(self.host_of(url))
+        if stats is None or stats['count'] < self.min_samples:
+            return (self.connect_timeout, self.max_read_timeout)
+        read = stats['p95'] * self.latency_multiplier
+        read = max(self.min_read_timeout, min(self.max_read_timeout, read))
+        return (self.connect_timeout, round(read, 2))
+
+    def retry_timeout_for(self, url: str) -> tuple[float, float]:
+        """Return the extended (connect, read) budget used when re-checking a timed-out link."""
+        return (self.connect_timeout * self.retry_factor, self.max_read_timeout * self.retry_factor)
@@ -0,0 +1,201 @@
+"""
+Per-phase timing for a run.
+
+A RunProfile collects durations into fixed-bucket histograms, overall and
+per host, so a finished run can say where its time went:
+
+- dns, connect, tls, ttfb: per connection/response, timed by the
+  RunController's HTTP connections
+- request: each check_link call (HEAD plus any GET fallback) and each page fetch
+- parse: extracting links from a fetched page
+- queue_wait: from a link being queued for checking to its request starting
+- callback: reporting a result (console output, GUI progress channel)
+- report, db_save: writing reports and saving the session
+
+Recording is a lock and a bucket increment, cheap enough to leave on.
+"""
+
+import json
+import threading
+from bisect import bisect_left, bisect_right
+import time
+from contextlib import contextmanager
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'request', 'parse', 'queue_wait', 'callback', 'report', 'db_save')
+
+# Phases that are also broken down by host
+HOST_PHASES = ('dns', 'connect', 'tls', 'ttfb', 'request')
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+class Histogram:
+    """Count, sum, min, max and bucketed distribution of durations in seconds."""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds: float):
+        self.buckets[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def add_many(self, seconds: list):
+        """add() for each of `seconds`, bucketing them with one sort instead of a bisect each."""
+        if not seconds:
+            return
+        values = sorted(seconds)
+        milliseconds = [v * 1000 for v in values]
+        previous = 0
+        for index, bound in enumerate(BUCKETS_MS):
+            position = bisect_right(milliseconds, bound, previous)
+            self.buckets[index] += position - previous
+            previous = position
+        self.buckets[-1] += len(values) - previous
+        self.count += len(values)
+        self.total += sum(values)
+        self.min = values[0] if self.min is None else min(self.min, values[0])
+        self.max = values[-1] if self.max is None else max(self.max, values[-1])
+
+    def merge(self, other: 'Histogram'):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile in seconds: the upper bound of the bucket holding it, capped at max."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                if index == len(BUCKETS_MS):
+                    return self.max
+                return min(BUCKETS_MS[index] / 1000, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max, 'buckets': list(self.buckets)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Histogram':
+        histogram = cls()
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        histogram.buckets = list(data['buckets'])
+        return histogram
+
+class RunProfile:
+    """Thread-safe phase histograms for one run, overall and per host."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases = {}
+        self.hosts = {}
+        self.started = time.time()
+        self.finished = None
+
+    def record(self, phase: str, seconds: float, host: str = None):
+        with self._lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram()
+            histogram.add(seconds)
+            if host and phase in HOST_PHASES:
+                by_phase = self.hosts.setdefault(host, {})
+                histogram = by_phase.get(phase)
+                if histogram is None:
+                    histogram = by_phase[phase] = Histogram()
+                histogram.add(seconds)
+
+    @contextmanager
+    def timer(self, phase: str, host: str = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, host)
+
+    def finish(self):
+        self.finished = time.time()
+
+    def merge(self, other: 'RunProfile'):
+        with self._lock:
+            for phase, histogram in other.phases.items():
+                self.phases.setdefault(phase, Histogram()).merge(histogram)
+            for host, by_phase in other.hosts.items():
+                mine = self.hosts.setdefault(host, {})
+                for phase, histogram in by_phase.items():
+                    mine.setdefault(phase, Histogram()).merge(histogram)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'started': self.started,
+                'finished': self.finished,
+                'buckets_ms': list(BUCKETS_MS),
+                'phases': {phase: h.to_dict() for phase, h in self.phases.items()},
+                'hosts': {host: {phase: h.to_dict() for phase, h in by_phase.items()} for host, by_phase in self.hosts.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RunProfile':
+        profile = cls()
+        profile.started = data.get('started', profile.started)
+        profile.finished = data.get('finished')
+        profile.phases = {phase: Histogram.from_dict(h) for phase, h in data.get('phases', {}).items()}
+        profile.hosts = {host: {phase: Histogram.from_dict(h) for phase, h in by_phase.items()}
+                         for host, by_phase in data.get('hosts', {}).items()}
+        return profile
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'RunProfile':
+        return cls.from_dict(json.loads(text))
+
+    def summary(self, top_hosts: int = 10) -> str:
+        """Text table of every phase, then the hosts with the most request time."""
+        lines = ["=" * 80, "⏱️  RUN PROFILE", "=" * 80]
+        if self.finished:
+            lines.append(f"Wall time: {self.finished - self.started:.2f}s")
+        lines.append(f"{'phase':12} {'count':>8} {'total s':>9} {'mean ms':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>9}")
+        for phase in sorted(self.phases, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            lines.append(_row(phase, self.phases[phase]))
+
+        ranked = sorted(self.hosts.items(), key=lambda item: -item[1]['request'].total if 'request' in item[1] else 0)
+        if ranked:
+            lines.append("")
+            lines.append(f"Slowest hosts by total request time (top {min(top_hosts, len(ranked))} of {len(ranked)}):")
+            for host, by_phase in ranked[:top_hosts]:
+                lines.append(f"  {host}")
+                for phase in HOST_PHASES:
+                    if phase in by_phase:
+                        lines.append("  " + _row(phase, by_phase[phase]))
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+def _row(phase: str, h: Histogram) -> str:
+    return (f"{phase:12} {h.count:8d} {h.total:9.2f} {h.mean * 1000:9.1f} {h.quantile(0.5) * 1000:8.1f} "
+            f"{h.quantile(0.9) * 1000:8.1f} {h.quantile(0.99) * 1000:8.1f} {(h.max or 0) * 1000:9.1f}")
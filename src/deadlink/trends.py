@@ -0,0 +1,249 @@
+"""
+Trends over the run history.
+
+save_session keeps two rollup tables up to date in the same transaction,
+so trend queries never scan the results table:
+
+- link_state: one row per (site, link) with its current state, the run
+  and time that state began, how often it flipped, and the total time it
+  spent broken before each fix. Links found on several pages count as dead
+  in a run if any of their checks failed. Only rows of new links and links
+  that changed state are written: a link's check count is the runs of its
+  site (site_runs) since it was first seen, and the checks of its current
+  broken stretch are the runs since that began.
+- host_latency: a timing.Histogram of response times per host and day.
+
+Broken-link counts over time come from the sessions table itself, which
+holds one row of totals per run.
+
+The rollups keep what was observed: deleting or downsampling a session
+(see deadlink.maintenance) leaves them as they are. Databases that had
+history before the rollups existed are backfilled by rebuild_rollups(),
+which the query functions run on first use.
+"""
+
+import json
+from datetime import datetime
+from urllib.parse import urlparse
+from .timing import Histogram
+
+ROLLUP_VERSION = 2
+
+BUCKETS = {
+    'day': "substr(timestamp, 1, 10)",
+    'week': "strftime('%Y-W%W', timestamp)",
+    'month': "substr(timestamp, 1, 7)",
+}
+
+def create_rollups(cursor):
+    cursor.execute("SELECT value FROM db_meta WHERE key = 'rollup_version'")
+    row = cursor.fetchone()
+    if row is not None and int(row[0]) != ROLLUP_VERSION:
+        # Tables of an older layout; ensure_rollups() rebuilds them on first use
+        for table in ('site_runs', 'link_state', 'host_latency'):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("DELETE FROM db_meta WHERE key = 'rollup_version'")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS site_runs (
+            site TEXT PRIMARY KEY,
+            runs INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS link_state (
+            site TEXT NOT NULL,
+            url TEXT NOT NULL,
+            first_run INTEGER NOT NULL,
+            since_run INTEGER NOT NULL,
+            dead_checks INTEGER NOT NULL,
+            is_dead INTEGER NOT NULL,
+            since TEXT NOT NULL,
+            transitions INTEGER NOT NULL,
+            fixes INTEGER NOT NULL,
+            fix_seconds REAL NOT NULL,
+            PRIMARY KEY (site, url)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS host_latency (
+            host TEXT NOT NULL,
+            day TEXT NOT NULL,
+            histogram TEXT NOT NULL,
+            PRIMARY KEY (host, day)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_state_dead ON link_state (site, is_dead)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_link_state_flaps ON link_state (transitions)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_host_latency_day ON host_latency (day)")
+
+def _seconds_between(start: str, end: str) -> float:
+    fmt = "%Y-%m-%d %H:%M:%S"
+    return max(0.0, (datetime.strptime(end[:19], fmt) - datetime.strptime(start[:19], fmt)).total_seconds())
+
+def update_rollups(cursor, session_id: int, site: str, timestamp: str, timings=None):
+    """
+    Fold a saved session into the rollups.
+
+    `timings` are the (url, response_time) pairs of its answered checks;
+    None reads them from the results table.
+    """
+    cursor.execute("SELECT 1 FROM results WHERE session_id = ? LIMIT 1", (session_id,))
+    if cursor.fetchone() is None:
+        return
+    cursor.execute("INSERT INTO site_runs (site, runs) VALUES (?, 1) ON CONFLICT (site) DO UPDATE SET runs = runs + 1", (site,))
+    cursor.execute("SELECT runs FROM site_runs WHERE site = ?", (site,))
+    run = cursor.fetchone()[0]
+
+    # Join the session's results on link_state, so the cost follows this run and
+    # not the site's history, and only new links and state changes come back
+    cursor.execute("""
+        SELECT r.url, r.is_dead, l.first_run, l.since_run, l.dead_checks, l.since, l.transitions, l.fixes, l.fix_seconds
+        FROM results r LEFT JOIN link_state l ON l.site = ? AND l.url = r.url
+        WHERE r.session_id = ? AND (l.url IS NULL OR l.is_dead != r.is_dead)
+    """, (site, session_id))
+    links = {}
+    for row in cursor.fetchall():
+        # A link listed on several pages is dead if any of its checks failed
+        if row[1] or row[0] not in links:
+            links[row[0]] = row
+    fixed = {url for url, row in links.items() if row[2] is not None and not row[1]}
+    if fixed:
+        # Links still broken on another page of this run aren't fixed
+        cursor.execute("SELECT DISTINCT url FROM results WHERE session_id = ? AND is_dead = 1", (session_id,))
+        for (url,) in cursor.fetchall():
+            if url in fixed:
+                del links[url]
+
+    rows = []
+    for url, is_dead, first_run, since_run, dead_checks, since, transitions, fixes, fix_seconds in links.values():
+        if first_run is None:
+            rows.append((site, url, run, run, 0, is_dead, timestamp, 0, 0, 0.0))
+        elif is_dead:
+            rows.append((site, url, first_run, run, dead_checks, 1, timestamp, transitions + 1, fixes, fix_seconds))
+        else:
+            rows.append((site, url, first_run, run, dead_checks + run - since_run, 0, timestamp, transitions + 1, fixes + 1,
+                         fix_seconds + _seconds_between(since, timestamp)))
+    cursor.executemany("INSERT OR REPLACE INTO link_state VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    if timings is None:
+        cursor.execute("SELECT url, response_time FROM results WHERE session_id = ? AND response_time IS NOT NULL AND status_code IS NOT NULL",
+                       (session_id,))
+        timings = cursor.fetchall()
+    # Links share a few scheme://netloc prefixes; group by those, then parse each once
+    by_prefix = {}
+    for url, response_time in timings:
+        end = url.find('/', url.find('//') + 2)
+        prefix = url if end < 0 else url[:end]
+        times = by_prefix.get(prefix)
+        if times is None:
+            times = by_prefix[prefix] = []
+        times.append(response_time)
+    latency = {}
+    for prefix, times in by_prefix.items():
+        latency.setdefault(urlparse(prefix).hostname or '', []).extend(times)
+    day = timestamp[:10]
+    for host, times in latency.items():
+        cursor.execute("SELECT histogram FROM host_latency WHERE host = ? AND day = ?", (host, day))
+        row = cursor.fetchone()
+        histogram = Histogram.from_dict(json.loads(row[0])) if row else Histogram()
+        histogram.add_many(times)
+        cursor.execute("INSERT OR REPLACE INTO host_latency (host, day, histogram) VALUES (?, ?, ?)",
+                       (host, day, json.dumps(histogram.to_dict())))
+
+def _rebuild(db):
+    with db._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM site_runs")
+        cursor.execute("DELETE FROM link_state")
+        cursor.execute("DELETE FROM host_latency")
+        cursor.execute("SELECT id, url, timestamp FROM sessions ORDER BY timestamp, id")
+        for session_id, site, timestamp in cursor.fetchall():
+            update_rollups(cursor, session_id, site, timestamp)
+        cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('rollup_version', ?)", (str(ROLLUP_VERSION),))
+        conn.commit()
+
+def rebuild_rollups(db):
+    """Recompute the rollups from the stored results of every session, oldest first."""
+    db._write(_rebuild, db)
+
+def ensure_rollups(db):
+    """Backfill the rollups if this database has history from before they existed."""
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT value FROM db_meta WHERE key = 'rollup_version'").fetchone()
+    if row is None or int(row[0]) != ROLLUP_VERSION:
+        rebuild_rollups(db)
+
+def _rows(db, query: str, params: list) -> list[dict]:
+    with db._get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def broken_link_trend(db, site: str = None, since: str = None, bucket: str = 'day') -> list[dict]:
+    """
+    Broken links per site and period ('day', 'week' or 'month'), oldest first.
+
+    `broken` and `total` are from the last run in the period; `broken_max`
+    and `broken_avg` cover all of its runs.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket} (expected one of {', '.join(BUCKETS)})")
+    conditions, params = [], []
+    if site:
+        conditions.append("url = ?")
+        params.append(site)
+    if since:
+        conditions.append("timestamp >= ?")
+        params.append(since)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return _rows(db, f"""
+        SELECT url AS site, period, count(*) AS runs,
+               max(CASE WHEN latest = 1 THEN broken_links END) AS broken,
+               max(broken_links) AS broken_max, round(avg(broken_links), 1) AS broken_avg,
+               max(CASE WHEN latest = 1 THEN total_links END) AS total
+        FROM (
+            SELECT url, broken_links, total_links, {BUCKETS[bucket]} AS period,
+                   ROW_NUMBER() OVER (PARTITION BY url, {BUCKETS[bucket]} ORDER BY timestamp DESC, id DESC) AS latest
+            FROM sessions{where}
+        )
+        GROUP BY url, period
+        ORDER BY url, period
+    """, params)
+
+def mean_time_to_fix(db, site: str = None, min_fixes: int = 1, limit: int = 50) -> list[dict]:
+    """Links by mean time from breaking to working again (slowest first), with how often that happened."""
+    ensure_rollups(db)
+    condition, params = ("AND site = ?", [site]) if site else ("", [])
+    return _rows(db, f"""
+        SELECT site, url, fixes, round(fix_seconds / fixes, 1) AS mean_fix_seconds, is_dead AS broken_now, since
+        FROM link_state WHERE fixes >= ? {condition}
+        ORDER BY fix_seconds / fixes DESC LIMIT ?
+    """, [min_fixes] + params + [limit])
+
+def flapping_links(db, site: str = None, min_transitions: int = 3, limit: int = 50) -> list[dict]:
+    """Links that keep switching between working and broken, most changes first."""
+    ensure_rollups(db)
+    condition, params = ("AND site = ?", [site]) if site else ("", [])
+    return _rows(db, f"""
+        SELECT site, url, transitions, checks, dead_checks, round(transitions * 1.0 / max(checks - 1, 1), 2) AS flap_rate,
+               is_dead AS broken_now, since
+        FROM (SELECT l.site, l.url, l.transitions, l.is_dead, l.since, r.runs - l.first_run + 1 AS checks,
+                     l.dead_checks + CASE WHEN l.is_dead THEN r.runs - l.since_run + 1 ELSE 0 END AS dead_checks
+              FROM link_state l JOIN site_runs r ON r.site = l.site)
+        WHERE transitions >= ? {condition}
+        ORDER BY transitions DESC, flap_rate DESC LIMIT ?
+    """, [min_transitions] + params + [limit])
+
+def slow_hosts(db, quantile: float = 0.95, since: str = None, min_checks: int = 20, limit: int = 20) -> list[dict]:
+    """Hosts by their `quantile` response time (from the day histograms since `since`), slowest first."""
+    ensure_rollups(db)
+    condition, params = ("WHERE day >= ?", [since[:10]]) if since else ("", [])
+    merged = {}
+    for row in _rows(db, f"SELECT host, histogram FROM host_latency {condition}", params):
+        merged.setdefault(row['host'], Histogram()).merge(Histogram.from_dict(json.loads(row['histogram'])))
+    hosts = [{'host': host, 'checks': h.count, 'quantile': round(h.quantile(quantile), 3),
+              'median': round(h.quantile(0.5), 3), 'mean': round(h.mean, 3), 'max': h.max}
+             for host, h in merged.items() if h.count >= min_checks]
+    hosts.sort(key=lambda h: (h['quantile'], h['mean']), reverse=True)
+    return hosts[:limit]
@@ -1,5 +1,6 @@
 import sys
 import io
+from functools import lru_cache
 from urllib.parse import urlparse
 
 def setup_windows_encoding():
@@ -10,16 +11,14 @@ def setup_windows_encoding():
         if hasattr(sys.stderr, 'buffer') and sys.stderr.buffer is not None:
             sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-def is_external_url(url: str, base_url: str) -> bool:
-    """Check if a URL is external (different domain) compared to the base URL."""
-    base_domain = urlparse(base_url).netloc.lower()
-    link_domain = urlparse(url).netloc.lower()
-
+@lru_cache(maxsize=65536)
+def _domain_of(url: str) -> str:
     # Remove 'www.' prefix for comparison
-    base_domain = base_domain.replace('www.', '')
-    link_domain = link_domain.replace('www.', '')
+    return urlparse(url).netloc.lower().replace('www.', '')
 
-    return base_domain != link_domain
+def is_external_url(url: str, base_url: str) -> bool:
+    """Check if a URL is external (different domain) compared to the base URL."""
+    return _domain_of(base_url) != _domain_of(url)
 
 def get_status_text(status_code: int) -> str:
     """Get human-readable status text for HTTP status codes."""
@@ -47,9 +46,9 @@ def get_status_text(status_code: int) -> str:
     }
     return status_map.get(status_code, f"{status_code} Unknown")
 
+@lru_cache(maxsize=65536)
 def normalize_url(url: str) -> str:
     """Normalize URL by removing fragments and trailing slashes."""
-    from urllib.parse import urlparse
     parsed = urlparse(url)
     path = parsed.path
     if path.endswith('/') and len(path) > 1:
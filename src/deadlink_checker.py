@@ -4,57 +4,453 @@ Dead Link Checker - Legacy Wrapper
 Now imports from the modular deadlink package.
 """
 
+import os
 import sys
+import time
 import argparse
-from deadlink import (
-    setup_windows_encoding,
-    check_all_links,
-    generate_report,
-    get_report_filename,
-    save_report,
-    generate_csv_report,
-    generate_pdf_report
-)
+from contextlib import nullcontext
+
+# Only cheap modules are imported up front. The crawler (requests, bs4) is
+# imported when a local check runs, and reporting modules when reports are
+# written, so --help, argument errors and --connect start quickly.
+from deadlink import setup_windows_encoding
 
 def main():
     setup_windows_encoding()
     
     parser = argparse.ArgumentParser(description='Check a website for dead links.')
-    parser.add_argument('url', help='The URL of the website to check')
+    parser.add_argument('url', nargs='?', help='The URL of the website to check')
     parser.add_argument('--workers', type=int, default=10, help='Number of concurrent workers (default: 10)')
     parser.add_argument('--timeout', type=int, default=10, help='Timeout in seconds for each request (default: 10)')
+    parser.add_argument('--connect-timeout', type=float, default=5, help='Connect timeout in seconds (default: 5)')
+    parser.add_argument('--adaptive-timeout', action='store_true', help='Derive per-host read timeouts from observed latency, capped at --timeout')
+    parser.add_argument('--retry-timeouts', action='store_true', help='Re-check timed-out links at the end of the run with a longer budget')
+    parser.add_argument('--retries', type=int, default=0, help='Retry transient failures (timeouts, resets, 429, 502-504) up to N times (default: 0)')
+    parser.add_argument('--retry-delay', type=float, default=1.0, help='Base delay in seconds for exponential retry backoff (default: 1)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN', help='Skip URLs matching this regex (repeatable)')
+    parser.add_argument('--sort-query', action='store_true', help='Treat URLs that differ only in query parameter order as the same link')
+    parser.add_argument('--seen-set', choices=['memory', 'disk', 'bloom'], default='memory', help='How visited pages and checked links are remembered: memory (exact), disk (exact, bounded memory) or bloom (fixed memory, may skip ~0.1%% of links) (default: memory)')
     parser.add_argument('--depth', type=int, default=1, help='Crawl depth (1=page only, 2+=recursive) (default: 1)')
     parser.add_argument('--pdf', action='store_true', help='Generate a PDF report')
     parser.add_argument('--csv', action='store_true', help='Generate a CSV report')
     parser.add_argument('--output-dir', help='Custom directory for reports')
+    parser.add_argument('--format', choices=['text', 'ndjson'], default='text', help='ndjson: also stream one JSON object per result as it completes, then a summary record (default: text)')
+    parser.add_argument('--output', metavar='FILE', default='-', help="Where --format ndjson writes ('-' for stdout, the default; other output then goes to stderr)")
+    parser.add_argument('--serve', nargs='?', const='8765', metavar='[HOST:]PORT', help='Run a warm check server on a local socket (default: 127.0.0.1:8765; other hosts need --token)')
+    parser.add_argument('--connect', nargs='?', const='8765', metavar='[HOST:]PORT', help='Send the check to a server started with --serve instead of running it here')
+    parser.add_argument('--token', help='Shared token for --serve, --connect and tcp:// --frontier; required to serve on a non-loopback address (default: $DEADLINK_TOKEN)')
+    parser.add_argument('--batch', metavar='FILE', help="Check every URL listed in FILE ('-' for stdin) under one shared worker budget")
+    parser.add_argument('--sites', type=int, default=4, help='Sites crawled at once in --batch mode; --workers is shared between them (default: 4)')
+    parser.add_argument('--frontier', metavar='PATH|tcp://HOST:PORT', help='Share the crawl through a frontier database (or a coordinator serving one): with a url, seed it and report when done; without, join as a worker')
+    parser.add_argument('--processes', type=int, default=1, help='Worker processes to run on this machine with --frontier (default: 1)')
+    parser.add_argument('--metrics', nargs='?', const='9464', metavar='[HOST:]PORT', help='Expose live Prometheus/OpenMetrics crawl metrics at http://HOST:PORT/metrics while checking or serving (default: 127.0.0.1:9464)')
+    parser.add_argument('--profile', action='store_true', help='Time each phase (DNS, connect, TLS, TTFB, parse, queue wait, callbacks, reports) and print a profile summary')
+    parser.add_argument('--profile-cpu', nargs='?', const='sample', choices=['sample', 'cprofile'], help='Profile CPU during the check and write collapsed stacks (sample, the default) or pstats (cprofile) next to the reports')
+    parser.add_argument('--profile-mem', action='store_true', help='Trace allocations during the check and write the top allocation sites next to the reports')
+    parser.add_argument('--history-db', metavar='PATH', help="History database used by --export-history, --maintain and --trends (default: the GUI's history)")
+    parser.add_argument('--export-history', metavar='FILE', help='Export stored results (of the given url only, if one is given) to a columnar file for analytics, then exit')
+    parser.add_argument('--export-format', choices=['auto', 'parquet', 'dlcol'], default='auto', help='Columnar format for --export-history: parquet needs pyarrow, dlcol is the built-in fallback (default: auto)')
+    parser.add_argument('--since', metavar='DATE', help='Only export (or chart with --trends) sessions from DATE on (e.g. 2024-05-01)')
+    parser.add_argument('--trends', action='store_true', help='Print broken-link trends, slowest fixes, flapping links and slow hosts from the history (of the given url only, if one is given), then exit')
+    parser.add_argument('--trend-period', choices=['day', 'week', 'month'], default='week', help='Period the --trends broken-link counts are grouped by (default: week)')
+    parser.add_argument('--maintain', action='store_true', help='Apply history retention, remove orphaned rows, vacuum and ANALYZE the history database, then exit')
+    parser.add_argument('--keep-last', type=int, metavar='N', help='With --maintain: keep full results for the newest N sessions of each site')
+    parser.add_argument('--max-age', type=float, metavar='DAYS', help='With --maintain: keep full results for sessions younger than DAYS')
+    parser.add_argument('--drop-old', action='store_true', help='With --maintain: delete sessions past retention instead of keeping their totals')
+    parser.add_argument('--full-vacuum', action='store_true', help='With --maintain: VACUUM once to enable incremental vacuum on databases created by older versions')
     
     args = parser.parse_args()
     
+    if args.export_history:
+        export_history(parser, args)
+        return
+    if args.maintain:
+        maintain_history(parser, args)
+        return
+    if args.trends:
+        print_trends(args)
+        return
+    if args.keep_last or args.max_age or args.drop_old or args.full_vacuum:
+        parser.error("--keep-last, --max-age, --drop-old and --full-vacuum are only used with --maintain")
+    
+    from deadlink.server import parse_address, is_loopback, CHECK_DEFAULTS, TOKEN_ENV
+    args.token = args.token or os.environ.get(TOKEN_ENV) or None
+    
+    for flag, value in (('--profile', args.profile), ('--profile-cpu', args.profile_cpu), ('--profile-mem', args.profile_mem)):
+        if value and (args.connect or args.frontier or args.serve):
+            parser.error(f"{flag} needs a check run in this process (not --connect, --frontier or --serve)")
+    if args.metrics and (args.connect or args.frontier):
+        parser.error("--metrics needs checks run in this process (not --connect or --frontier)")
+    if args.format == 'ndjson' and args.serve:
+        parser.error("--format ndjson needs a check (not --serve)")
+    if args.output != '-' and args.format != 'ndjson':
+        parser.error("--output is only used with --format ndjson")
+    metrics = start_metrics(parser, args)
+    ndjson = open_ndjson(parser, args)
+    
+    if args.serve:
+        try:
+            address = parse_address(args.serve)
+        except ValueError as e:
+            parser.error(str(e))
+        if not args.token and not is_loopback(address[0]):
+            parser.error(f"--serve {args.serve} listens beyond this machine and needs a shared token (--token or ${TOKEN_ENV})")
+        frontier = None
+        if args.frontier:
+            if args.frontier.startswith('tcp://'):
+                parser.error("--serve needs a local --frontier database")
+            from deadlink.frontier import SQLiteFrontier
+            frontier = SQLiteFrontier(args.frontier)
+        serve_forever(address, frontier, metrics, args.token)
+        return
+    
+    try:
+        if args.batch:
+            if args.url or args.connect:
+                parser.error("--batch cannot be combined with a url or --connect")
+            run_batch(parser, args, {name: getattr(args, name) for name in CHECK_DEFAULTS}, metrics, ndjson)
+            return
+    
+        if args.frontier:
+            if args.connect:
+                parser.error("--frontier cannot be combined with --connect")
+            run_frontier(parser, args, {name: getattr(args, name) for name in CHECK_DEFAULTS}, ndjson)
+            return
+    
+        if not args.url:
+            parser.error("the following arguments are required: url")
+    
+        url = args.url
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+
+        from deadlink.exclusion import ExclusionMatcher
+        try:
+            ExclusionMatcher(args.exclude, strict=True)
+        except ValueError as e:
+            parser.error(str(e))
+
+        params = {name: getattr(args, name) for name in CHECK_DEFAULTS}
+        profile = new_profile(args)
+        diagnostics = new_diagnostics(args)
+
+        results = []
+        try:
+            started = time.perf_counter()
+            if args.connect:
+                from deadlink.server import remote_check
+                try:
+                    address = parse_address(args.connect)
+                except ValueError as e:
+                    parser.error(str(e))
+                results = remote_check(address, url, params, token=args.token)
+                # The server answers once the check is done, so results stream only now
+                for result in results if ndjson else []:
+                    ndjson.result(result)
+            else:
+                from deadlink.server import run_check
+                with diagnostics or nullcontext():
+                    results = run_check(url, params, profile=profile, metrics=metrics, progress_callback=ndjson)
+            elapsed = time.perf_counter() - started
+        
+            with profile.timer('report') if profile else nullcontext():
+                txt_filename = write_reports(url, results, args)
+            print_profile(profile)
+            write_diagnostics(diagnostics, os.path.splitext(txt_filename)[0])
+            if ndjson:
+                ndjson.summary(results, url=url, elapsed_s=round(elapsed, 3))
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+            if ndjson:
+                ndjson.summary(results, url=url, error=str(e))
+            sys.exit(1)
+    finally:
+        # The summary record is the last write; make sure a file gets it even when the run fails
+        if ndjson and args.output != '-':
+            ndjson.close()
+
+def export_history(parser, args):
+    """Write the history database's results to a columnar file (--export-history)."""
+    from deadlink.database import DatabaseManager
     url = args.url
-    if not url.startswith(('http://', 'https://')):
+    if url and not url.startswith(('http://', 'https://')):
         url = 'https://' + url
+    started = time.perf_counter()
+    try:
+        path, fmt, rows = DatabaseManager(args.history_db).export_results(args.export_history, url=url, since=args.since, format=args.export_format)
+    except ImportError as e:
+        parser.error(str(e))
+    print(f"💾 Exported {rows} results to {path} ({fmt}) in {time.perf_counter() - started:.1f}s")
+
+def maintain_history(parser, args):
+    """Run retention and upkeep on the history database (--maintain)."""
+    from deadlink.database import DatabaseManager
+    from deadlink.maintenance import RetentionPolicy
+    policy = None
+    if args.keep_last or args.max_age:
+        try:
+            policy = RetentionPolicy(args.keep_last, args.max_age, downsample=not args.drop_old)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.drop_old:
+        parser.error("--drop-old needs --keep-last or --max-age")
+    report = DatabaseManager(args.history_db).maintain(policy, full=args.full_vacuum, force_analyze=True)
+    print(report.summary())
+
+def print_trends(args):
+    """Print trend tables from the history database (--trends)."""
+    from deadlink.database import DatabaseManager
+    from deadlink import trends
+    db = DatabaseManager(args.history_db)
+    url = args.url
+    if url and not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    
+    print(f"Broken links per {args.trend_period}:")
+    for row in trends.broken_link_trend(db, url, args.since, args.trend_period):
+        print(f"  {row['period']:<10} {row['broken']:>6} of {row['total']:<7} (max {row['broken_max']}, {row['runs']} runs)  {row['site']}")
+    print("\nSlowest fixes:")
+    for row in trends.mean_time_to_fix(db, url, limit=10):
+        print(f"  {row['mean_fix_seconds'] / 3600:8.1f}h  x{row['fixes']:<3} {'(broken now) ' if row['broken_now'] else ''}{row['url']}")
+    print("\nFlapping links:")
+    for row in trends.flapping_links(db, url, limit=10):
+        print(f"  {row['transitions']:>4} changes in {row['checks']} runs  {row['url']}")
+    print("\nSlowest hosts (p95):")
+    for row in trends.slow_hosts(db, since=args.since, limit=10):
+        print(f"  {row['quantile']:7.2f}s p95  {row['median']:6.2f}s median  {row['checks']:>7} checks  {row['host']}")
+
+def open_ndjson(parser, args):
+    """The NDJSONReporter for --format ndjson, or None. On stdout, the CLI's own output moves to stderr."""
+    if args.format != 'ndjson':
+        return None
+    from deadlink.ndjson import NDJSONReporter
+    if args.output == '-':
+        stream, sys.stdout = sys.stdout, sys.stderr
+        return NDJSONReporter(stream)
+    try:
+        return NDJSONReporter(open(args.output, 'w', encoding='utf-8'))
+    except OSError as e:
+        parser.error(f"--output: {e}")
+
+def start_metrics(parser, args):
+    """Start the --metrics listener and return its CrawlMetrics, or None without --metrics."""
+    if not args.metrics:
+        return None
+    from deadlink.server import parse_address
+    from deadlink.metrics import CrawlMetrics, serve_metrics
+    try:
+        address = parse_address(args.metrics)
+        metrics = CrawlMetrics()
+        server = serve_metrics(address, metrics)
+    except (ValueError, OSError) as e:
+        parser.error(f"--metrics: {e}")
+    host, port = server.server_address[:2]
+    print(f"📈 Metrics at http://{host}:{port}/metrics")
+    return metrics
+
+def new_profile(args):
+    """A RunProfile when --profile is given, else None."""
+    if not args.profile:
+        return None
+    from deadlink.timing import RunProfile
+    return RunProfile()
+
+def new_diagnostics(args):
+    """A RunDiagnostics for --profile-cpu/--profile-mem, else None."""
+    if not (args.profile_cpu or args.profile_mem):
+        return None
+    from deadlink.diagnostics import RunDiagnostics
+    return RunDiagnostics(cpu=args.profile_cpu, mem=args.profile_mem)
+
+def write_diagnostics(diagnostics, prefix):
+    if diagnostics is not None:
+        for path in diagnostics.write(prefix):
+            print(f"🔬 Profile saved to: {path}")
+
+def print_profile(profile):
+    if profile is not None:
+        profile.finish()
+        print("\n" + profile.summary())
+
+def write_reports(url, results, args):
+    """Print the report and save it as TXT, plus PDF/CSV if requested. Returns the TXT path."""
+    from deadlink.reporter import generate_report, get_report_filename, save_report, generate_csv_report, generate_pdf_report
+    
+    report = generate_report(results)
+    print("\n" + report)
+    
+    # Always save TXT report
+    reports_dir = args.output_dir
+    txt_filename = get_report_filename(url, "txt", reports_dir)
+    save_report(report, txt_filename)
+    
+    if args.pdf:
+        pdf_filename = get_report_filename(url, "pdf", reports_dir)
+        generate_pdf_report(results, pdf_filename, url)
         
+    if args.csv:
+        csv_filename = get_report_filename(url, "csv", reports_dir)
+        generate_csv_report(results, csv_filename, url)
+    return txt_filename
+
+def run_frontier(parser, args, params, ndjson=None):
+    """Seed and/or work on a shared frontier; the seeding process reports once the crawl is drained."""
+    import multiprocessing
+    from deadlink.exclusion import ExclusionMatcher
+    from deadlink.frontier import open_frontier, seed_crawl, run_worker, run_worker_process
+    from deadlink.server import build_check_options
+    
+    try:
+        ExclusionMatcher(args.exclude, strict=True)
+        frontier = open_frontier(args.frontier, args.token)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    
+    url = args.url
     try:
-        results = check_all_links(url, args.workers, args.timeout, args.depth)
+        if url:
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+            seed_crawl(frontier, url, max_depth=args.depth, exclude_patterns=args.exclude, sort_query=args.sort_query, timeout=args.timeout)
+            print(f"🌱 Frontier {args.frontier} seeded with {url}")
+        elif frontier.config() is None:
+            parser.error(f"{args.frontier} has not been seeded; pass a url to start a crawl")
         
-        report = generate_report(results)
-        print("\n" + report)
+        # Extra local processes; this one works too and waits for the crawl to drain
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=run_worker_process, args=(args.frontier, params, args.token)) for _ in range(args.processes - 1)]
+        for process in processes:
+            process.start()
         
-        # Always save TXT report
-        reports_dir = args.output_dir
-        txt_filename = get_report_filename(url, "txt", reports_dir)
-        save_report(report, txt_filename)
+        options = build_check_options(url or '', params)
+        completed = run_worker(frontier, max_workers=options['max_workers'], timeout=options['timeout'],
+                               timeout_policy=options['timeout_policy'],
+                               progress_callback=lambda message: print(message, end='') if isinstance(message, str) else None)
+        for process in processes:
+            process.join()
+        print(f"✅ Worker finished after {completed} items")
         
+        if url:
+            results = frontier.results()
+            write_reports(url, results, args)
+            if ndjson:
+                for result in results:
+                    ndjson.result(result)
+                ndjson.summary(results, url=url)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped; leased items will be requeued when their leases expire.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        if ndjson and url:
+            ndjson.summary([], url=url, error=str(e))
+        sys.exit(1)
+    finally:
+        frontier.close()
+
+def run_batch(parser, args, params, metrics=None, ndjson=None):
+    """Check every site listed in --batch, writing per-site reports and a combined summary."""
+    from datetime import datetime
+    from deadlink.batch import read_targets
+    from deadlink.exclusion import ExclusionMatcher
+    
+    try:
+        if args.batch == '-':
+            targets = read_targets(sys.stdin)
+        else:
+            with open(args.batch, encoding='utf-8') as f:
+                targets = read_targets(f)
+        ExclusionMatcher(args.exclude, strict=True)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not targets:
+        parser.error(f"no URLs found in {args.batch}")
+    
+    from deadlink.batch import check_batch, StatusCache
+    from deadlink.server import build_check_options
+    from deadlink.reporter import generate_report, generate_batch_summary, get_report_filename, save_report, generate_csv_report, generate_pdf_report
+    
+    reports_dir = args.output_dir
+    profile = new_profile(args)
+    diagnostics = new_diagnostics(args)
+    session_folder = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    reports = {}
+    used = set()
+    
+    def report_name(url, extension):
+        # Sites on the same domain finishing in the same second would share a name
+        filename = get_report_filename(url, extension, reports_dir, session_folder)
+        base, ext = filename[:-len(extension) - 1], filename[-len(extension) - 1:]
+        n = 1
+        while filename in used:
+            n += 1
+            filename = f"{base}_{n}{ext}"
+        used.add(filename)
+        return filename
+    
+    def site_done(run, done, total):
+        if ndjson:
+            ndjson.for_site(run.url).summary(run.results, 'site_summary', elapsed_s=round(run.elapsed, 3), error=run.error)
+        if run.error:
+            print(f"⚠️ [{done}/{total}] {run.url}: {run.error}")
+            return
+        icon = "❌" if run.dead else "✅"
+        print(f"{icon} [{done}/{total}] {run.url}: {run.dead} dead of {len(run.results)} ({run.elapsed:.1f}s)")
+        with profile.timer('report') if profile else nullcontext():
+            write_site_reports(run)
+    
+    def write_site_reports(run):
+        txt_filename = report_name(run.url, "txt")
+        with open(txt_filename, 'w', encoding='utf-8') as f:
+            f.write(generate_report(run.results))
+        reports[run.url] = txt_filename
         if args.pdf:
-            pdf_filename = get_report_filename(url, "pdf", reports_dir)
-            generate_pdf_report(results, pdf_filename, url)
-            
+            generate_pdf_report(run.results, report_name(run.url, "pdf"), run.url)
         if args.csv:
-            csv_filename = get_report_filename(url, "csv", reports_dir)
-            generate_csv_report(results, csv_filename, url)
-            
+            generate_csv_report(run.results, report_name(run.url, "csv"), run.url)
+    
+    print(f"🌐 Checking {len(targets)} sites, {min(args.sites, len(targets))} at a time, {args.workers} requests in flight")
+    cache = StatusCache()
+    try:
+        with diagnostics or nullcontext():
+            runs = check_batch(targets, max_workers=args.workers, max_sites=args.sites,
+                               site_options=lambda url: dict(build_check_options(url, params), profile=profile, metrics=metrics,
+                                                             progress_callback=ndjson.for_site(url) if ndjson else None),
+                               on_site_done=site_done, status_cache=cache)
     except Exception as e:
         print(f"\n❌ Error: {e}")
+        if ndjson:
+            ndjson.summary([], error=str(e))
+        sys.exit(1)
+    
+    summary = generate_batch_summary(runs, reports, cache)
+    print("\n" + summary)
+    session_dir = os.path.dirname(get_report_filename(targets[0], "txt", reports_dir, session_folder))
+    save_report(summary, os.path.join(session_dir, "batch_summary.txt"))
+    print_profile(profile)
+    if ndjson:
+        ndjson.summary([r for run in runs for r in run.results], sites=len(runs), failed_sites=sum(1 for run in runs if run.error))
+    write_diagnostics(diagnostics, os.path.join(session_dir, "batch_profile"))
+
+def serve_forever(address, frontier=None, metrics=None, token=None):
+    """Run the warm check server (optionally serving a frontier and feeding metrics) until interrupted."""
+    from deadlink.server import serve
+    
+    def ready(server):
+        host, port = server.server_address[:2]
+        print(f"🚀 Dead Link Checker server listening on {host}:{port} (Ctrl+C to stop)")
+        print(f"   Check with: python deadlink_checker.py --connect {host}:{port} <url>")
+        if frontier is not None:
+            print(f"   Join the crawl with: python deadlink_checker.py --frontier tcp://{host}:{port}")
+        if token:
+            print("   Clients need the same --token (or $DEADLINK_TOKEN)")
+    
+    try:
+        serve(address, ready=ready, frontier=frontier, metrics=metrics, token=token)
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    except OSError as e:
+        print(f"\n❌ Could not start server on {address[0]}:{address[1]}: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -5,34 +5,42 @@ A modern, professional desktop application for checking dead links on websites.
 """
 
 import customtkinter as ctk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import threading
 import queue
+import time
+from contextlib import nullcontext
 from datetime import datetime
 import os
 from pathlib import Path
 import webbrowser
-from PIL import Image
-import pystray
-from pystray import MenuItem as item
-from plyer import notification
-from CTkTable import *
-
-# Import the core functionality from deadlink_checker
-# Import the core functionality from the modular deadlink package
+
+# Import the core functionality from the modular deadlink package.
+# Only what the first window needs is imported here: the crawler (requests,
+# bs4), the history database and the tray/notification backends are loaded
+# on first use or by warm_up() once the window is showing.
+import deadlink
 from deadlink import (
     setup_windows_encoding,
     open_file,
-    check_all_links, 
     generate_report, 
+    generate_summary,
     save_report, 
     generate_pdf_report,
     generate_csv_report,
     get_report_filename,
     LinkResult,
-    DatabaseManager,
+    TimeoutPolicy,
+    RetryPolicy,
+    validate_patterns,
+    URLCanonicalizer,
+    ProgressChannel,
+    ResultModel,
+    LogSpool,
+    RunProfile,
     VERSION
 )
+from deadlink.resultmodel import COLUMNS
 
 import json
 
@@ -42,6 +50,23 @@ ctk.set_default_color_theme("blue")
 
 CONFIG_FILE = "config.json"
 
+# How often (ms) the UI drains the progress channel
+PROGRESS_INTERVAL_MS = 100
+
+# Pause after the last keystroke before the grid filter is applied
+SEARCH_DEBOUNCE_MS = 150
+
+# Lines kept in the log widget; the full log of each run is written to disk
+LOG_VIEW_LINES = 5000
+
+# History window: sessions per page, and how often to check whether the next page is needed
+HISTORY_PAGE_SIZE = 20
+HISTORY_SCROLL_POLL_MS = 250
+
+# Background history upkeep: at most once a day, returning at most this many free pages per run
+HISTORY_MAINTENANCE_INTERVAL = 24 * 3600
+HISTORY_VACUUM_PAGES = 2000
+
 DEFAULT_CONFIG = {
     "workers": 10,
     "depth": 1,
@@ -56,7 +81,14 @@ DEFAULT_CONFIG = {
     "password": "",
     "cookies": "",
     "exclude_rules": "",
-    "check_external": True
+    "check_external": True,
+    "adaptive_timeouts": False,
+    "retry_timeouts": False,
+    "retry_transient": False,
+    "sort_query_params": False,
+    "debug_profiling": False,
+    "history_maintenance": True,
+    "history_keep_runs": 0
 }
 
 def load_config():
@@ -78,6 +110,160 @@ def save_config(config):
         pass
 
 
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Results table that only creates widgets for the rows on screen.
+
+    The Treeview holds a fixed pool of items, one per visible line; scrolling
+    moves an offset into the ResultModel and rewrites those items' values,
+    so the cost of drawing does not grow with the number of results.
+    """
+
+    ROW_HEIGHT = 26
+    WHEEL_ROWS = 3
+    COLUMN_WIDTHS = {"URL": 480, "Status": 140, "Type": 90, "Time": 90, "Location": 90}
+
+    def __init__(self, master, model: ResultModel, **kwargs):
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.offset = 0
+        self.follow = True  # keep the newest rows in view while results stream in
+        self.selected = None  # selected model row, independent of which item shows it
+        self._items = []
+
+        style = ttk.Style(self)
+        style.configure("Results.Treeview", background="#2c3e50", fieldbackground="#2c3e50",
+                        foreground="white", rowheight=self.ROW_HEIGHT, borderwidth=0)
+        style.configure("Results.Treeview.Heading", background="#1a5276", foreground="white", relief="flat")
+        style.map("Results.Treeview", background=[("selected", "#2980b9")])
+        style.map("Results.Treeview.Heading", background=[("active", "#21618c")])
+
+        self.tree = ttk.Treeview(self, columns=COLUMNS, show="headings", selectmode="browse", style="Results.Treeview")
+        for column in COLUMNS:
+            self.tree.heading(column, text=column, anchor="w", command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=self.COLUMN_WIDTHS[column], stretch=(column == "URL"), anchor="w")
+        self.tree.tag_configure("odd", background="#34495e")
+        self.tree.tag_configure("dead", foreground="#e74c3c")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-self.WHEEL_ROWS if e.delta > 0 else self.WHEEL_ROWS))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(self.WHEEL_ROWS))
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-len(self._items)))
+        self.tree.bind("<Next>", lambda e: self.scroll(len(self._items)))
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Double-1>", self.open_selected)
+
+    def on_resize(self, event=None):
+        """Grow or shrink the item pool to exactly fill the widget."""
+        visible = max(1, self.tree.winfo_height() // self.ROW_HEIGHT - 1)
+        while len(self._items) < visible:
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > visible:
+            self.tree.delete(self._items.pop())
+        self.refresh()
+
+    def refresh(self):
+        """Redraw after the model changed (new results, filter or sort)."""
+        total = len(self.model)
+        page = len(self._items)
+        if self.follow:
+            self.offset = total - page
+        self.offset = max(0, min(self.offset, total - page))
+
+        for i, item in enumerate(self._items):
+            row = self.offset + i
+            if row < total:
+                result = self.model.result(row)
+                tags = ("odd",) if row % 2 else ()
+                if result.is_dead:
+                    tags += ("dead",)
+                self.tree.item(item, values=self.model.row(row), tags=tags)
+            else:
+                self.tree.item(item, values=(), tags=())
+
+        item = self._item_for(self.selected)
+        if item is not None:
+            self.tree.selection_set(item)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + page) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows: int):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def scroll_to(self, offset: int):
+        total = len(self.model)
+        self.offset = max(0, min(offset, total - len(self._items)))
+        self.follow = self.offset + len(self._items) >= total
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif action == "scroll":
+            step = len(self._items) if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def sort_by(self, column: str):
+        """Sort by `column`; clicking the sorted column again reverses the order."""
+        descending = self.model.sort_column == column and not self.model.descending
+        self.model.sort(column, descending)
+        for name in COLUMNS:
+            arrow = (" ▼" if descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+        self.selected = None
+        self.follow = False
+        self.scroll_to(0)
+
+    def reset(self):
+        self.offset = 0
+        self.follow = True
+        self.selected = None
+        self.refresh()
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            row = self.offset + self._items.index(selection[0])
+            if row < len(self.model):
+                self.selected = row
+
+    def move_selection(self, step: int):
+        """Arrow keys move through the whole model, scrolling the pool as needed."""
+        if not len(self.model):
+            return "break"
+        row = 0 if self.selected is None else max(0, min(self.selected + step, len(self.model) - 1))
+        self.selected = row
+        if row < self.offset:
+            self.scroll_to(row)
+        elif row >= self.offset + len(self._items):
+            self.scroll_to(row - len(self._items) + 1)
+        else:
+            self.refresh()
+        return "break"
+
+    def open_selected(self, event=None):
+        if self.selected is not None and self.selected < len(self.model):
+            webbrowser.open(self.model.result(self.selected).url)
+
+    def _item_for(self, row):
+        if row is None or not self.offset <= row < self.offset + len(self._items) or row >= len(self.model):
+            return None
+        return self._items[row - self.offset]
+
+
 class DeadLinkCheckerGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -102,9 +288,12 @@ class DeadLinkCheckerGUI(ctk.CTk):
         self.results = []
         self.current_url = ""
         self.progress_queue = queue.Queue()
-        self.pause_event = threading.Event()
-        self.stop_event = threading.Event()
-        self.db = DatabaseManager()
+        self.log_spool = LogSpool()
+        self.progress_channel = ProgressChannel(spool=self.log_spool)
+        self._search_job = None
+        self.controller = None
+        self._db = None
+        self._db_lock = threading.Lock()
         self.tray_icon = None
         
         # Create UI
@@ -114,10 +303,46 @@ class DeadLinkCheckerGUI(ctk.CTk):
         # Use a small delay to let the main window render first
         self.after(100, self.setup_tray)
         self.after(200, self.monitor_progress)
+        self.after(300, self.warm_up)
         
         # Protocol
         self.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
         
+    @property
+    def db(self):
+        """History database, opened on first use (normally by warm_up)"""
+        with self._db_lock:
+            if self._db is None:
+                self._db = deadlink.DatabaseManager()
+            return self._db
+
+    def warm_up(self):
+        """Open the database and load the crawler in the background so the first check starts without a pause"""
+        def _warm_up():
+            try:
+                self.db
+                deadlink.check_all_links
+                deadlink.RunController
+            except Exception as e:
+                print(f"Warm-up error: {e}")
+            self.maintain_history()
+        
+        threading.Thread(target=_warm_up, daemon=True).start()
+
+    def maintain_history(self):
+        """Clean up, vacuum and analyze the history database once a day (background thread); retention only if set in Settings"""
+        if not self.config.get("history_maintenance", True):
+            return
+        from deadlink.maintenance import RetentionPolicy, maintenance_due
+        try:
+            if not maintenance_due(self.db, HISTORY_MAINTENANCE_INTERVAL):
+                return
+            keep_last = int(self.config.get("history_keep_runs") or 0)
+            policy = RetentionPolicy(keep_last=keep_last) if keep_last > 0 else None
+            self.db.maintain(policy, vacuum_pages=HISTORY_VACUUM_PAGES)
+        except Exception as e:
+            print(f"History maintenance error: {e}")
+
     def create_widgets(self):
         """Create all UI widgets"""
         
@@ -490,8 +715,21 @@ class DeadLinkCheckerGUI(ctk.CTk):
         self.tab_view.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 10))
         self.tab_view.add("Log View")
         self.tab_view.add("Grid View")
+        self.tab_view.add("Summary")
         self.tab_view.set("Grid View") # Set Grid View as default
         
+        log_header = ctk.CTkFrame(self.tab_view.tab("Log View"), fg_color="transparent")
+        log_header.pack(fill="x", pady=(0, 5))
+        
+        self.log_info_label = ctk.CTkLabel(log_header, text="", anchor="w", text_color="gray60", font=ctk.CTkFont(size=11))
+        self.log_info_label.pack(side="left", fill="x", expand=True)
+        
+        self.open_log_button = ctk.CTkButton(
+            log_header, text="📄 Open Full Log", width=120, height=26,
+            command=self.open_full_log, state="disabled"
+        )
+        self.open_log_button.pack(side="right")
+        
         self.status_text = ctk.CTkTextbox(
             self.tab_view.tab("Log View"),
             font=ctk.CTkFont(family="Consolas", size=12),
@@ -499,6 +737,15 @@ class DeadLinkCheckerGUI(ctk.CTk):
         )
         self.status_text.pack(fill="both", expand=True)
         
+        # Summary View
+        self.summary_text = ctk.CTkTextbox(
+            self.tab_view.tab("Summary"),
+            font=ctk.CTkFont(family="Consolas", size=12),
+            wrap="word",
+            state="disabled"
+        )
+        self.summary_text.pack(fill="both", expand=True)
+        
         # Grid View
         self.grid_frame = ctk.CTkFrame(self.tab_view.tab("Grid View"))
         self.grid_frame.pack(fill="both", expand=True)
@@ -507,14 +754,13 @@ class DeadLinkCheckerGUI(ctk.CTk):
         filter_frame = ctk.CTkFrame(self.grid_frame, fg_color="transparent")
         filter_frame.pack(fill="x", pady=5, padx=5)
         
-        self.grid_search = ctk.CTkEntry(filter_frame, placeholder_text="Filter results...", height=30)
+        self.grid_search = ctk.CTkEntry(filter_frame, placeholder_text="Filter results...  e.g. blog status:404 type:image external:no", height=30)
         self.grid_search.pack(side="left", fill="x", expand=True, padx=(0, 5))
         self.grid_search.bind("<KeyRelease>", self.filter_grid)
         
-        self.grid_table_container = ctk.CTkScrollableFrame(self.grid_frame)
-        self.grid_table_container.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        self.table = None # Will be initialized on first result
+        self.result_model = ResultModel()
+        self.results_grid = VirtualGrid(self.grid_frame, self.result_model, fg_color="transparent")
+        self.results_grid.pack(fill="both", expand=True, padx=5, pady=5)
         
         # Statistics Frame
         stats_frame = ctk.CTkFrame(right_panel)
@@ -661,8 +907,8 @@ class DeadLinkCheckerGUI(ctk.CTk):
         self.is_checking = True
         self.is_paused = False
         self.current_url = url
-        self.pause_event.clear()
-        self.stop_event.clear()
+        self.controller = deadlink.RunController()
+        self.progress_channel.reset()
         
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
@@ -671,14 +917,15 @@ class DeadLinkCheckerGUI(ctk.CTk):
         
         # Clear previous results
         self.results = []
-        if self.table:
-            self.table.destroy()
-            self.table = None
+        self.result_model.clear()
+        self.results_grid.reset()
         
         self.status_text.configure(state="normal")
         self.status_text.delete("1.0", "end")
         self.status_text.configure(state="disabled")
+        self.show_summary("")
         self.progress_bar.set(0)
+        self.start_log_file(url)
         
         # Start checking in a separate thread
         thread = threading.Thread(
@@ -720,6 +967,7 @@ class DeadLinkCheckerGUI(ctk.CTk):
     def check_links_thread(self, url, depth, workers, timeout, check_external=True):
         """Thread function to check links"""
         headers, auth = self.get_headers_and_auth()
+        controller = self.controller
         try:
             mode = self.analysis_mode.get()
             self.log_message(f"🚀 Starting {mode} analysis of: {url}\n")
@@ -737,22 +985,43 @@ class DeadLinkCheckerGUI(ctk.CTk):
             headers, auth = self.get_headers_and_auth()
             exclude_patterns = [p.strip() for p in self.config.get("exclude_rules", "").split('\n') if p.strip()]
             
+            timeout_policy = None
+            if self.config.get("adaptive_timeouts") or self.config.get("retry_timeouts"):
+                timeout_policy = TimeoutPolicy(
+                    connect_timeout=min(5, timeout),
+                    min_read_timeout=1 if self.config.get("adaptive_timeouts") else timeout,
+                    max_read_timeout=timeout,
+                    retry_timeouts=self.config.get("retry_timeouts", False)
+                )
+            retry_policy = RetryPolicy() if self.config.get("retry_transient") else None
+            # Phase timings, saved with the session
+            profile = RunProfile()
+            diagnostics = None
+            if self.config.get("debug_profiling"):
+                from deadlink.diagnostics import RunDiagnostics
+                diagnostics = RunDiagnostics(cpu='sample', mem=True)
+                self.log_message("🔬 CPU and memory profiling enabled\n")
+            
             # Check links with progress callback
-            results = check_all_links(
-                url, 
-                max_workers=workers, 
-                timeout=timeout, 
-                max_depth=depth, 
-                progress_callback=self.log_message,
-                auth=auth,
-                headers=headers,
-                exclude_patterns=exclude_patterns,
-                pause_event=self.pause_event,
-                stop_event=self.stop_event,
-                check_external=check_external
-            )
+            with diagnostics or nullcontext():
+                results = deadlink.check_all_links(
+                    url, 
+                    max_workers=workers, 
+                    timeout=timeout, 
+                    max_depth=depth, 
+                    progress_callback=self.progress_channel,
+                    auth=auth,
+                    headers=headers,
+                    exclude_patterns=exclude_patterns,
+                    controller=controller,
+                    check_external=check_external,
+                    timeout_policy=timeout_policy,
+                    retry_policy=retry_policy,
+                    canonicalizer=URLCanonicalizer(url, sort_query=self.config.get("sort_query_params", False)),
+                    profile=profile
+                )
             
-            if self.stop_event.is_set():
+            if controller.stopped:
                 self.log_message("\n⚠️  Analysis stopped by user.\n")
                 self.show_notification("Analysis Stopped", f"The analysis for {url} was stopped.")
                 return
@@ -764,32 +1033,44 @@ class DeadLinkCheckerGUI(ctk.CTk):
             # Generate report
             self.log_message("\n" + "=" * 60 + "\n")
             self.log_message("📊 Generating reports...\n\n")
+            report_started = time.perf_counter()
             
             report = generate_report(results)
-            self.log_message(report + "\n")
+            self.after(0, self.show_summary, generate_summary(results))
+            self.log_message("📊 Summary is available in the Summary tab.\n")
             
             # Save reports
             report_dir = self.config.get("report_dir", "reports")
             from datetime import datetime
             session_folder = f"report_{datetime.now().strftime('%y_%m_%d_%H%M%S')}"
+            report_files = []
             
             if self.generate_txt.get():
                 txt_filename = get_report_filename(url, "txt", report_dir, session_folder)
                 save_report(report, txt_filename)
+                report_files.append(txt_filename)
                 self.log_message(f"\n✅ Text report saved: {txt_filename}\n")
             
             if self.generate_pdf.get():
                 pdf_filename = get_report_filename(url, "pdf", report_dir, session_folder)
                 generate_pdf_report(results, pdf_filename, url)
+                report_files.append(pdf_filename)
                 self.log_message(f"✅ PDF report saved: {pdf_filename}\n")
             
             if self.generate_csv.get():
                 csv_filename = get_report_filename(url, "csv", report_dir, session_folder)
                 generate_csv_report(results, csv_filename, url)
+                report_files.append(csv_filename)
                 self.log_message(f"✅ CSV report saved: {csv_filename}\n")
             
+            if diagnostics:
+                for path in diagnostics.write(os.path.join(report_dir, session_folder, "profile")):
+                    self.log_message(f"🔬 Profile saved: {path}\n")
+            
             # Save to Database
-            self.db.save_session(url, mode, results, session_folder)
+            profile.record('report', time.perf_counter() - report_started)
+            profile.finish()
+            self.db.save_session(url, mode, results, session_folder, report_files, profile)
             
             # Update statistics
             self.update_statistics(results)
@@ -807,8 +1088,8 @@ class DeadLinkCheckerGUI(ctk.CTk):
     def stop_check(self):
         """Stop the checking process"""
         self.is_checking = False
-        self.stop_event.set()
-        self.pause_event.clear()
+        if self.controller:
+            self.controller.stop()
         self.log_message("\n⏹ Stopping analysis...\n")
         self.reset_ui()
     
@@ -819,12 +1100,12 @@ class DeadLinkCheckerGUI(ctk.CTk):
             
         if not self.is_paused:
             self.is_paused = True
-            self.pause_event.set()
+            self.controller.pause()
             self.pause_button.configure(text="▶ Resume", fg_color=("#27ae60", "#1e8449"), hover_color=("#2ecc71", "#27ae60"))
             self.log_message("\n⏸ Analysis paused.\n")
         else:
             self.is_paused = False
-            self.pause_event.clear()
+            self.controller.resume()
             self.pause_button.configure(text="⏸ Pause", fg_color=("#f39c12", "#d35400"), hover_color=("#f1c40f", "#f39c12"))
             self.log_message("\n▶ Analysis resumed.\n")
 
@@ -832,6 +1113,10 @@ class DeadLinkCheckerGUI(ctk.CTk):
         """Setup system tray icon"""
         def init_tray():
             try:
+                from PIL import Image
+                import pystray
+                from pystray import MenuItem as item
+                
                 # Use a default icon if assets/icon.png is missing
                 icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "icon.png")
                 if os.path.exists(icon_path):
@@ -861,12 +1146,14 @@ class DeadLinkCheckerGUI(ctk.CTk):
         """Exit the application completely"""
         if self.tray_icon:
             self.tray_icon.stop()
+        self.log_spool.close()
         self.quit()
 
     def show_notification(self, title, message):
         """Show system notification in a non-blocking way"""
         def _notify():
             try:
+                from plyer import notification
                 notification.notify(
                     title=title,
                     message=message,
@@ -881,30 +1168,19 @@ class DeadLinkCheckerGUI(ctk.CTk):
 
     def update_grid(self, result: LinkResult):
         """Update the interactive grid with a new result"""
-        self.progress_queue.put(('grid', result))
+        self.progress_channel.result(result)
 
     def filter_grid(self, event=None):
-        """Filter the grid results based on search text"""
-        search_query = self.grid_search.get().lower()
-        if not self.table:
-            return
-            
-        # Implementation of filtering for CTkTable
-        # Since CTkTable doesn't have native filtering, we'll have to redraw or manage data
-        # To keep it simple and performant, we'll filter from self.results
-        filtered_data = [["URL", "Status", "Type", "Time", "Location"]] # Header
-        for r in self.results:
-            row = [
-                r.url, 
-                f"{r.status_code} {r.status_text}", 
-                r.link_type, 
-                f"{r.response_time}s",
-                "External" if r.is_external else "Internal"
-            ]
-            if any(search_query in str(cell).lower() for cell in row):
-                filtered_data.append(row)
-        
-        self.table.update_values(filtered_data)
+        """Schedule a grid search once typing pauses"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_grid_search)
+
+    def apply_grid_search(self):
+        """Filter the grid with the search box query (free text plus status:/type:/external:/dead: filters)"""
+        self._search_job = None
+        self.result_model.search(self.grid_search.get())
+        self.results_grid.reset()
 
     def reset_ui(self):
         """Reset UI to initial state"""
@@ -921,10 +1197,7 @@ class DeadLinkCheckerGUI(ctk.CTk):
     
     def log_message(self, message):
         """Add message or LinkResult to status text/grid"""
-        if isinstance(message, LinkResult):
-            self.progress_queue.put(('grid', message))
-        else:
-            self.progress_queue.put(('log', message))
+        self.progress_channel(message)
     
     def update_statistics(self, results):
         """Update statistics display"""
@@ -944,26 +1217,15 @@ class DeadLinkCheckerGUI(ctk.CTk):
         }))
     
     def monitor_progress(self):
-        """Monitor progress queue and update UI in a controlled manner"""
-        processed_count = 0
-        max_per_tick = 20 # Limit processing to keep UI responsive
-        
+        """Apply everything published since the last tick in one batch"""
         try:
-            while processed_count < max_per_tick:
+            while True:
                 try:
                     msg_type, data = self.progress_queue.get_nowait()
                 except queue.Empty:
                     break
                 
-                processed_count += 1
-                
-                if msg_type == 'log':
-                    self.status_text.configure(state="normal")
-                    self.status_text.insert("end", str(data))
-                    self.status_text.see("end")
-                    self.status_text.configure(state="disabled")
-                
-                elif msg_type == 'stats':
+                if msg_type == 'stats':
                     self.total_label.configure(text=str(data['total']))
                     self.working_label.configure(text=str(data['working']))
                     self.broken_label.configure(text=str(data['broken']))
@@ -972,47 +1234,81 @@ class DeadLinkCheckerGUI(ctk.CTk):
                 elif msg_type == 'progress':
                     self.progress_bar.set(data)
 
-                elif msg_type == 'grid':
-                    self.results.append(data)
-                    self.add_result_to_grid(data)
+            batch = self.progress_channel.poll()
+            if batch:
+                self.apply_progress_batch(batch)
                     
         except Exception as e:
             print(f"Error in monitor_progress: {e}")
         
         # Schedule next check
-        self.after(50, self.monitor_progress)
-
-    def add_result_to_grid(self, result: LinkResult):
-        """Add a single result row to the table grid"""
-        row_data = [
-            result.url, 
-            f"{result.status_code if result.status_code else 'Err'} {result.status_text}", 
-            result.link_type, 
-            f"{result.response_time}s",
-            "External" if result.is_external else "Internal"
-        ]
-        
-        if not self.table:
-            # Initialize table with headers
-            headers = [["URL", "Status", "Type", "Time", "Location"]]
-            self.table = CTkTable(
-                master=self.grid_table_container, 
-                values=headers + [row_data],
-                colors=("#2c3e50", "#34495e"),
-                header_color="#1a5276",
-                hover_color="#34495e",
-                anchor="w" # Left align data
+        self.after(PROGRESS_INTERVAL_MS, self.monitor_progress)
+
+    def apply_progress_batch(self, batch):
+        """Render one ProgressBatch: a single log insert, grid rows and live counters"""
+        if batch.logs or batch.dropped_logs:
+            text = "".join(str(line) for line in batch.logs)
+            if batch.dropped_logs:
+                text += f"   … {batch.dropped_logs} log lines skipped here to keep up (all are in the full log) …\n"
+            self.append_log(text)
+            self.log_spool.flush()
+        
+        if batch.results:
+            # Retried links replace their earlier result in the model, so the
+            # totals come from it rather than from every result published
+            self.result_model.extend(batch.results)
+            self.results_grid.refresh()
+            counters = self.result_model.counters
+            self.total_label.configure(text=str(counters.total))
+            self.working_label.configure(text=str(counters.working))
+            self.broken_label.configure(text=str(counters.broken))
+            self.success_label.configure(text=f"{counters.success_rate:.1f}%")
+        
+        if batch.progress is not None:
+            self.progress_bar.set(batch.progress)
+
+    def append_log(self, text):
+        """Append to the log widget, keeping only the last LOG_VIEW_LINES lines on screen (the channel writes the full log file)"""
+        self.status_text.configure(state="normal")
+        self.status_text.insert("end", text)
+        lines = int(self.status_text.index("end-1c").split(".")[0])
+        if lines > LOG_VIEW_LINES:
+            self.status_text.delete("1.0", f"{lines - LOG_VIEW_LINES + 1}.0")
+            self.log_info_label.configure(
+                text=f"Showing the last {LOG_VIEW_LINES:,} of {self.log_spool.lines:,} lines"
+                     + (f" · full log: {self.log_spool.path}" if self.log_spool.path else "")
             )
-            self.table.pack(fill="both", expand=True)
-        else:
-            self.table.add_row(values=row_data)
-        
-        # Scroll to bottom
+        self.status_text.see("end")
+        self.status_text.configure(state="disabled")
+
+    def start_log_file(self, url):
+        """Begin a new on-disk log for this run under <report_dir>/logs"""
+        self.log_info_label.configure(text="")
         try:
-            self.grid_table_container._parent_canvas.yview_moveto(1.0)
-        except:
-            pass
-    
+            self.log_spool.open(get_report_filename(url, "log", self.config.get("report_dir", "reports"), "logs"))
+            self.open_log_button.configure(state="normal")
+        except OSError as e:
+            self.open_log_button.configure(state="disabled")
+            self.log_info_label.configure(text=f"Full log not saved: {e}")
+
+    def open_full_log(self):
+        """Open the current run's full log file"""
+        if not self.log_spool.path or not os.path.exists(self.log_spool.path):
+            messagebox.showinfo("Info", "No log file for this run.")
+            return
+        self.log_spool.flush()
+        try:
+            open_file(self.log_spool.path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open log:\n{str(e)}")
+
+    def show_summary(self, summary):
+        """Replace the Summary tab contents"""
+        self.summary_text.configure(state="normal")
+        self.summary_text.delete("1.0", "end")
+        self.summary_text.insert("1.0", summary)
+        self.summary_text.configure(state="disabled")
+
     def open_reports_folder(self):
         """Open the reports folder"""
         reports_dir = self.config.get("report_dir", "reports")
@@ -1040,6 +1336,10 @@ class DeadLinkCheckerGUI(ctk.CTk):
         self.broken_label.configure(text="0")
         self.success_label.configure(text="0%")
         self.results = []
+        self.result_model.clear()
+        self.results_grid.reset()
+        self.show_summary("")
+        self.log_info_label.configure(text="")
         self.show_welcome_message()
 
 class SettingsWindow(ctk.CTkToplevel):
@@ -1088,6 +1388,36 @@ class SettingsWindow(ctk.CTkToplevel):
         self.check_ext_default = ctk.CTkCheckBox(container, text="Check External Links by Default")
         self.check_ext_default.pack(fill="x", padx=10, pady=5)
         if self.parent.config.get("check_external", True): self.check_ext_default.select()
+
+        # Adaptive Timeouts
+        self.adaptive_timeouts = ctk.CTkCheckBox(container, text="Adapt Timeouts to Host Latency")
+        self.adaptive_timeouts.pack(fill="x", padx=10, pady=5)
+        if self.parent.config.get("adaptive_timeouts", False): self.adaptive_timeouts.select()
+
+        self.retry_timeouts = ctk.CTkCheckBox(container, text="Retry Timed-out Links at End of Run")
+        self.retry_timeouts.pack(fill="x", padx=10, pady=5)
+        if self.parent.config.get("retry_timeouts", False): self.retry_timeouts.select()
+
+        self.retry_transient = ctk.CTkCheckBox(container, text="Retry Transient Failures (429, 502-504, resets)")
+        self.retry_transient.pack(fill="x", padx=10, pady=5)
+        if self.parent.config.get("retry_transient", False): self.retry_transient.select()
+
+        self.debug_profiling = ctk.CTkCheckBox(container, text="Debug: Profile CPU and Memory (saved in the report folder)")
+        self.debug_profiling.pack(fill="x", padx=10, pady=5)
+        if self.parent.config.get("debug_profiling", False): self.debug_profiling.select()
+
+        # History retention
+        ctk.CTkLabel(container, text="History:", font=ctk.CTkFont(weight="bold")).pack(pady=(10, 0), padx=10, anchor="w")
+        self.history_maintenance = ctk.CTkCheckBox(container, text="Clean up and compact the history database in the background (daily)")
+        self.history_maintenance.pack(fill="x", padx=10, pady=5)
+        if self.parent.config.get("history_maintenance", True): self.history_maintenance.select()
+        keep_frame = ctk.CTkFrame(container, fg_color="transparent")
+        keep_frame.pack(fill="x", padx=10, pady=(0, 5))
+        ctk.CTkLabel(keep_frame, text="Keep full results for the last").pack(side="left")
+        self.history_keep_runs = ctk.CTkEntry(keep_frame, width=60, height=28)
+        self.history_keep_runs.pack(side="left", padx=5)
+        self.history_keep_runs.insert(0, str(self.parent.config.get("history_keep_runs", 0)))
+        ctk.CTkLabel(keep_frame, text="runs per site (0 = all; older runs keep only their totals)").pack(side="left")
         
         # Default Formats
         ctk.CTkLabel(container, text="Default Report Formats:", font=ctk.CTkFont(weight="bold")).pack(pady=(10, 0), padx=10, anchor="w")
@@ -1185,8 +1515,15 @@ class SettingsWindow(ctk.CTkToplevel):
             self.user_entry.configure(state="disabled")
             self.pass_entry.configure(state="disabled")
 
+    def keep_runs_value(self):
+        try:
+            return max(0, int(self.history_keep_runs.get()))
+        except ValueError:
+            return self.parent.config.get("history_keep_runs", 0)
+
     def save(self):
         new_config = {
+            **self.parent.config,
             "workers": int(self.workers_slider.get()),
             "depth": int(self.depth_slider.get()),
             "timeout": self.parent.config.get("timeout", 10),
@@ -1199,7 +1536,13 @@ class SettingsWindow(ctk.CTkToplevel):
             "username": self.user_entry.get(),
             "password": self.pass_entry.get(),
             "cookies": self.cookies_entry.get(),
-            "check_external": self.check_ext_default.get()
+            "check_external": self.check_ext_default.get(),
+            "adaptive_timeouts": self.adaptive_timeouts.get() == 1,
+            "retry_timeouts": self.retry_timeouts.get() == 1,
+            "retry_transient": self.retry_transient.get() == 1,
+            "debug_profiling": self.debug_profiling.get() == 1,
+            "history_maintenance": self.history_maintenance.get() == 1,
+            "history_keep_runs": self.keep_runs_value()
         }
         
         self.parent.config = new_config
@@ -1227,7 +1570,13 @@ class SettingsWindow(ctk.CTkToplevel):
         self.parent.config["exclude_rules"] = self.exclude_rules_text.get("1.0", "end-1c")
         save_config(self.parent.config)
         
-        messagebox.showinfo("Success", "Settings saved successfully!")
+        rules = [p.strip() for p in self.parent.config["exclude_rules"].split('\n') if p.strip()]
+        invalid = validate_patterns(rules)
+        if invalid:
+            details = "\n".join(f"• {pattern}  ({error})" for pattern, error in invalid)
+            messagebox.showwarning("Exclusion Rules", f"Settings saved, but these rules are not valid regular expressions and will be matched as plain text:\n\n{details}")
+        else:
+            messagebox.showinfo("Success", "Settings saved successfully!")
         self.destroy()
 
 class HistoryWindow(ctk.CTkToplevel):
@@ -1271,60 +1620,106 @@ class HistoryWindow(ctk.CTkToplevel):
         self.geometry(f'+{x}+{y}')
 
     def load_history(self):
-        """Load history sessions asynchronously to avoid blocking UI"""
+        """Start a new (possibly filtered) history listing from the newest session"""
         # Clear current list
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
-            
-        search_query = self.search_entry.get().strip()
         
-        # Loading indicator
-        ctk.CTkLabel(self.scroll_frame, text="Loading history...", name="loading_label").pack(pady=20)
+        self.search_query = self.search_entry.get().strip()
+        self.next_page = None
+        self.has_more = True
+        self.loading = False
+        self.generation = getattr(self, "generation", 0) + 1
+        self.card_count = 0
+        self.footer = None
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Fetch the next page of sessions in the background"""
+        if self.loading or not self.has_more:
+            return
+        self.loading = True
+        self.set_footer("Loading history...")
+        
+        generation = self.generation
+        search_query, after = self.search_query, self.next_page
+        reports_dir = self.reports_dir()
         
         def fetch_task():
             try:
-                sessions = self.parent.db.get_sessions(search_query)
-                self.after(0, lambda: self.render_sessions(sessions))
+                sessions = self.parent.db.get_sessions_page(search_query, HISTORY_PAGE_SIZE, after)
+                for session in sessions:
+                    self.resolve_files(session, reports_dir)
+                self.after(0, lambda: self.render_page(generation, sessions))
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Database Error", str(e)))
 
         threading.Thread(target=fetch_task, daemon=True).start()
 
-    def render_sessions(self, sessions):
-        """Render session cards progressively"""
-        # Remove loading label
-        for widget in self.scroll_frame.winfo_children():
-            if getattr(widget, "_name", "") == "loading_label":
-                widget.destroy()
-
-        if not sessions:
-            ctk.CTkLabel(self.scroll_frame, text="No matches found in history.", font=ctk.CTkFont(slant="italic")).pack(pady=20)
-            return
-
-        # Process in chunks to keep UI responsive
-        def render_chunk(remaining_sessions):
-            if not remaining_sessions or not self.winfo_exists():
+    def resolve_files(self, session, reports_dir):
+        """Runs on the fetch thread: folder status, plus a one-time file scan for sessions saved before files were recorded"""
+        folder = os.path.join(reports_dir, session['session_folder'] or "")
+        if session['files']:
+            folder = os.path.dirname(session['files'][0]['path'])
+        session['folder'] = folder
+        session['folder_exists'] = os.path.isdir(folder)
+        if not session['files_indexed'] and session['folder_exists']:
+            try:
+                paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if os.path.isfile(os.path.join(folder, f))]
+            except OSError:
                 return
-            
-            chunk_size = 5
-            chunk = remaining_sessions[:chunk_size]
-            rest = remaining_sessions[chunk_size:]
-            
-            for session in chunk:
-                self.add_session_card(session)
-            
-            if rest:
-                self.after(10, lambda: render_chunk(rest))
-
-        render_chunk(sessions)
+            self.parent.db.add_report_files(session['id'], paths)
+            session['files'] = [{'path': os.path.abspath(p), 'kind': os.path.splitext(p)[1].lstrip('.').lower()} for p in paths]
 
-    def add_session_card(self, session):
+    def reports_dir(self):
         reports_dir = self.parent.config.get("report_dir", "reports")
         if not os.path.isabs(reports_dir):
             reports_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), reports_dir)
-            
-        session_folder = session['session_folder']
-        session_path = os.path.join(reports_dir, session_folder)
+        return reports_dir
+
+    def render_page(self, generation, sessions):
+        """Add one page of cards; more pages load when the list is scrolled near its end"""
+        if generation != self.generation or not self.winfo_exists():
+            return  # a newer search replaced this listing
+        self.loading = False
+        if self.footer is not None:
+            self.footer.destroy()
+            self.footer = None
+        
+        for session in sessions:
+            self.add_session_card(session)
+        self.card_count += len(sessions)
+        
+        if len(sessions) < HISTORY_PAGE_SIZE:
+            self.has_more = False
+            if not self.card_count:
+                self.set_footer("No matches found in history.")
+        else:
+            last = sessions[-1]
+            self.next_page = (last['timestamp'], last['id'])
+            self.after(HISTORY_SCROLL_POLL_MS, lambda: self.watch_scroll(generation))
+
+    def watch_scroll(self, generation):
+        """Load the next page once the user scrolls near the bottom"""
+        if generation != self.generation or not self.has_more or not self.winfo_exists():
+            return
+        try:
+            near_end = self.scroll_frame._parent_canvas.yview()[1] >= 0.9
+        except Exception:
+            near_end = True
+        if near_end:
+            self.load_next_page()
+        else:
+            self.after(HISTORY_SCROLL_POLL_MS, lambda: self.watch_scroll(generation))
+
+    def set_footer(self, text):
+        if self.footer is not None:
+            self.footer.destroy()
+        self.footer = ctk.CTkLabel(self.scroll_frame, text=text, font=ctk.CTkFont(slant="italic"))
+        self.footer.pack(pady=20)
+
+    def add_session_card(self, session):
+        session_path = session['folder']
         
         # Display Info
         timestamp = session['timestamp'] # SQLite DATETIME
@@ -1343,7 +1738,7 @@ class HistoryWindow(ctk.CTkToplevel):
         title_lbl = ctk.CTkLabel(header, text=f"{timestamp} | {url}", font=ctk.CTkFont(size=13, weight="bold"))
         title_lbl.pack(side="left", padx=15, pady=8)
         
-        if os.path.exists(session_path):
+        if session['folder_exists']:
             open_btn = ctk.CTkButton(header, text="📂 Open Folder", width=100, height=28, 
                                     fg_color="#34495e", hover_color="#2c3e50",
                                     command=lambda p=session_path: open_file(p))
@@ -1356,27 +1751,23 @@ class HistoryWindow(ctk.CTkToplevel):
         stats_text = f"Mode: {mode.capitalize()} | Total: {total} | ✅ Working: {working} | ❌ Broken: {broken}"
         ctk.CTkLabel(stats_frame, text=stats_text, font=ctk.CTkFont(size=11, slant="italic")).pack(side="left")
 
-        # Files list if exists
-        if os.path.exists(session_path):
-            try:
-                files = [f for f in os.listdir(session_path) if os.path.isfile(os.path.join(session_path, f))]
-                for filename in files:
-                    file_path = os.path.join(session_path, filename)
-                    f_frame = ctk.CTkFrame(card, fg_color="transparent")
-                    f_frame.pack(fill="x", padx=25, pady=2)
-                    
-                    icon = "📄"
-                    if filename.lower().endswith(".pdf"): icon = "📕"
-                    elif filename.lower().endswith(".csv"): icon = "📊"
-                    
-                    ctk.CTkLabel(f_frame, text=f"{icon} {filename}", font=ctk.CTkFont(size=12)).pack(side="left")
-                    
-                    f_btn = ctk.CTkButton(f_frame, text="View Report", width=80, height=22, 
-                                         font=ctk.CTkFont(size=11),
-                                         command=lambda p=file_path: open_file(p))
-                    f_btn.pack(side="right")
-            except:
-                pass
+        # Report files recorded for the session
+        if session['folder_exists']:
+            for report_file in session['files']:
+                file_path = report_file['path']
+                f_frame = ctk.CTkFrame(card, fg_color="transparent")
+                f_frame.pack(fill="x", padx=25, pady=2)
+                
+                icon = "📄"
+                if report_file['kind'] == "pdf": icon = "📕"
+                elif report_file['kind'] == "csv": icon = "📊"
+                
+                ctk.CTkLabel(f_frame, text=f"{icon} {os.path.basename(file_path)}", font=ctk.CTkFont(size=12)).pack(side="left")
+                
+                f_btn = ctk.CTkButton(f_frame, text="View Report", width=80, height=22, 
+                                     font=ctk.CTkFont(size=11),
+                                     command=lambda p=file_path: open_file(p))
+                f_btn.pack(side="right")
         else:
              ctk.CTkLabel(card, text="⚠️ Folder no longer exists", font=ctk.CTkFont(size=11, slant="italic"), text_color="orange").pack(pady=5)
 
@@ -0,0 +1,129 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.batch import read_targets, FairScheduler, StatusCache, SiteRun, check_batch
+from deadlink.reporter import generate_batch_summary
+from unittest.mock import patch
+
+def make_result(url, found_on="https://a.com", dead=False, status=200):
+    return LinkResult(url, status, "OK" if not dead else "Not Found", 0.1, found_on, dead, False, "Link")
+
+class TestReadTargets(unittest.TestCase):
+    def test_parses_list(self):
+        lines = ["# sites\n", "\n", "a.com\n", "https://b.com/blog  # main blog\n", "http://c.com\n", "a.com\n"]
+        self.assertEqual(read_targets(lines), ["https://a.com", "https://b.com/blog", "http://c.com"])
+
+class TestFairScheduler(unittest.TestCase):
+    def test_capacity_is_global(self):
+        scheduler = FairScheduler(3)
+        peak = [0]
+        lock = threading.Lock()
+
+        def work(site):
+            with scheduler.lane(site).slot():
+                with lock:
+                    peak[0] = max(peak[0], scheduler.in_use)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=work, args=(f"site{i % 4}",)) for i in range(20)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertLessEqual(peak[0], 3)
+        self.assertEqual(scheduler.in_use, 0)
+        self.assertEqual(sum(scheduler.granted.values()), 20)
+
+    def test_waiting_sites_take_turns(self):
+        scheduler = FairScheduler(1)
+        order = []
+        scheduler.acquire("holder")
+
+        def work(site):
+            with scheduler.lane(site).slot():
+                order.append(site)
+
+        def queued():
+            return sum(len(q) for q in scheduler._waiting.values())
+
+        # A big site queues many requests before a small one queues its only request
+        threads = [threading.Thread(target=work, args=(site,)) for site in ["big"] * 5 + ["small"]]
+        for i, t in enumerate(threads, 1):
+            t.start()
+            while queued() < i:
+                time.sleep(0.001)
+        scheduler.release()
+        for t in threads: t.join()
+        self.assertEqual(order[:2], ["big", "small"])
+        self.assertEqual(len(order), 6)
+
+class TestStatusCache(unittest.TestCase):
+    def test_fetches_once_per_key(self):
+        cache = StatusCache()
+        calls = []
+        release = threading.Event()
+
+        def check(site):
+            def fetch():
+                calls.append(1)
+                release.wait(5)
+                return make_result("https://cdn.com/x.js", site)
+            results.append(cache.get("https://cdn.com/x.js", "https://cdn.com/x.js", site, "Script", fetch))
+
+        results = []
+        threads = [threading.Thread(target=check, args=(f"https://site{i}.com",)) for i in range(4)]
+        for t in threads: t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads: t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(r.found_on for r in results), [f"https://site{i}.com" for i in range(4)])
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_transient_failures_are_not_cached(self):
+        cache = StatusCache()
+        timeout = LinkResult("https://x.com", None, "Error: Timeout", 10, "https://a.com", True, True, "Link")
+        cache.get("https://x.com", "https://x.com", "https://a.com", "Link", lambda: timeout)
+        fresh = cache.get("https://x.com", "https://x.com", "https://b.com", "Link", lambda: make_result("https://x.com"))
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(cache.misses, 2)
+
+class TestCheckBatch(unittest.TestCase):
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_shared_links_checked_once(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.side_effect = lambda url, *args, **kwargs: ([(f"{url}/page", "Link"), ("https://cdn.com/lib.js", "Script")], url)
+        mock_check_link.side_effect = lambda url, found_on, *args, **kwargs: make_result(url, found_on, dead=url.endswith("/page"), status=404 if url.endswith("/page") else 200)
+        done = []
+        runs = check_batch(["https://a.com", "https://b.com", "https://c.com"], max_workers=2, max_sites=2,
+                           on_site_done=lambda run, n, total: done.append((n, total)))
+        self.assertEqual([run.url for run in runs], ["https://a.com", "https://b.com", "https://c.com"])
+        self.assertEqual(sorted(done), [(1, 3), (2, 3), (3, 3)])
+        self.assertEqual(mock_check_link.call_count, 4)
+        for run in runs:
+            self.assertEqual(run.dead, 1)
+            cdn = [r for r in run.results if r.url == "https://cdn.com/lib.js"][0]
+            self.assertEqual(cdn.found_on, run.url)
+            self.assertTrue(cdn.is_external)
+
+    def test_batch_summary(self):
+        runs = [
+            SiteRun("https://a.com", [make_result("https://a.com/x"), make_result("https://dead.com", dead=True, status=404)], elapsed=1.0),
+            SiteRun("https://b.com", [make_result("https://dead.com", "https://b.com", dead=True, status=404)], elapsed=2.0),
+            SiteRun("https://c.com", error="boom"),
+        ]
+        summary = generate_batch_summary(runs, {"https://a.com": "/tmp/a.txt"})
+        self.assertIn("Sites checked:       2/3", summary)
+        self.assertIn("❌ Dead items:       2", summary)
+        self.assertIn("https://c.com: failed (boom)", summary)
+        self.assertIn("Report: /tmp/a.txt", summary)
+        self.assertIn("https://dead.com (2 sites)", summary)
+        self.assertLess(summary.index("c.com"), summary.index("a.com: 1 dead"))
+
+if __name__ == '__main__':
+    unittest.main()
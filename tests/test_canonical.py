@@ -0,0 +1,66 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.canonical import URLCanonicalizer, URLKey
+from deadlink.utils import is_external_url
+
+class TestURLCanonicalizer(unittest.TestCase):
+    def setUp(self):
+        self.canon = URLCanonicalizer("https://www.example.com/")
+
+    def test_key_fields(self):
+        key = self.canon.key("HTTPS://Example.COM:443/a/b/?q=1#frag")
+        self.assertEqual(key, URLKey("https", "example.com", None, "/a/b", "q=1"))
+        self.assertEqual(str(key), "https://example.com/a/b?q=1")
+
+    def test_matches_legacy_normalization(self):
+        self.assertEqual(self.canon.normalize("https://example.com/path/"), "https://example.com/path")
+        self.assertEqual(self.canon.normalize("https://example.com/path/?q=1#frag"), "https://example.com/path?q=1")
+        self.assertEqual(self.canon.normalize("https://example.com/"), "https://example.com/")
+        self.assertEqual(self.canon.normalize("https://example.com"), "https://example.com/")
+
+    def test_ports_and_percent_encoding(self):
+        self.assertEqual(self.canon.normalize("http://example.com:80/x"), "http://example.com/x")
+        self.assertEqual(self.canon.normalize("http://example.com:8080/x"), "http://example.com:8080/x")
+        self.assertEqual(self.canon.normalize("https://example.com/%7euser/a%2fb"), "https://example.com/~user/a%2Fb")
+        self.assertEqual(self.canon.normalize("https://example.com/a b"), "https://example.com/a%20b")
+
+    def test_query_sorting_is_opt_in(self):
+        self.assertEqual(self.canon.normalize("https://example.com/?b=2&a=1"), "https://example.com/?b=2&a=1")
+        sorted_canon = URLCanonicalizer(sort_query=True)
+        self.assertEqual(sorted_canon.key("https://example.com/?b=2&a=1"), sorted_canon.key("https://example.com/?a=1&b=2"))
+
+    def test_external_classification(self):
+        self.assertFalse(self.canon.is_external("https://example.com/about"))
+        self.assertFalse(self.canon.is_external("https://EXAMPLE.com:443/about"))
+        self.assertTrue(self.canon.is_external("https://google.com"))
+        self.assertTrue(self.canon.is_external("https://blog.example.com/"))
+        self.assertFalse(self.canon.is_external("https://blog.example.com/x", "https://blog.example.com/"))
+
+    def test_external_matches_legacy_helper(self):
+        cases = [
+            ("http://a.com:8080/x", "http://a.com:9090/"),
+            ("http://a.com:8080/x", "http://a.com:8080/"),
+            ("http://localhost:3000/", "http://localhost:8000/"),
+            ("http://user@a.com/", "http://a.com/"),
+            ("http://user@a.com/x", "http://user@a.com/"),
+            ("https://sub.www.a.com/", "https://sub.a.com/"),
+            ("https://www.a.com/", "https://a.com/"),
+            ("https://b.a.com/", "https://a.com/"),
+        ]
+        for url, base in cases:
+            with self.subTest(url=url, base=base):
+                self.assertEqual(URLCanonicalizer(base).is_external(url), is_external_url(url, base))
+                self.assertEqual(self.canon.is_external(url, base), is_external_url(url, base))
+
+    def test_parses_are_memoized(self):
+        for _ in range(3):
+            self.canon.normalize("https://example.com/cached")
+        self.assertGreaterEqual(self.canon.cache_info().hits, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import os
+import re
+import subprocess
+import unittest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Generous enough for a loaded CI machine; a cold import of the full checker is ~200ms+
+IMPORT_BUDGET_MS = 100
+HEAVY = ('requests', 'urllib3', 'bs4', 'sqlite3', 'reportlab', 'deadlink.crawler', 'deadlink.database')
+IMPORTTIME = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)', re.M)
+
+def importtime(args: list[str]) -> dict:
+    """Run python -X importtime with `args`; returns {module: cumulative ms} for everything imported."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *args], capture_output=True, text=True, cwd=SRC)
+    return {name: int(us) / 1000 for us, name in IMPORTTIME.findall(proc.stderr)}
+
+class TestCLIStartup(unittest.TestCase):
+    def test_module_import_within_budget(self):
+        best = min(importtime(['-c', 'import deadlink_checker'])['deadlink_checker'] for _ in range(3))
+        self.assertLess(best, IMPORT_BUDGET_MS)
+
+    def test_help_imports_nothing_heavy(self):
+        modules = importtime(['deadlink_checker.py', '--help'])
+        for name in HEAVY:
+            self.assertNotIn(name, modules)
+
+    def test_connect_mode_skips_crawler(self):
+        # Nothing listens on port 1, so this fails fast after the client-side imports
+        modules = importtime(['deadlink_checker.py', '--connect', '127.0.0.1:1', 'https://example.com'])
+        self.assertIn('deadlink.server', modules)
+        for name in HEAVY:
+            self.assertNotIn(name, modules)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.columnar import ColumnarReader, COLUMNS, have_pyarrow, write_columnar
+from deadlink.database import DatabaseManager
+from deadlink.models import LinkResult
+
+def make_results(n, site):
+    return [LinkResult(f"{site}/link{i}", None if i % 7 == 0 else 200 + (i % 2) * 204,
+                       "Error: ConnectTimeout" if i % 7 == 0 else "OK" if i % 2 == 0 else "Not Found",
+                       None if i % 7 == 0 else i / 100, f"{site}/page{i % 3}", i % 2 == 1, i % 5 == 0,
+                       "Image" if i % 4 == 0 else "Link", i % 3)
+            for i in range(n)]
+
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.db = DatabaseManager(":memory:")
+        self.first = self.db.save_session("https://a.com", "single", make_results(50, "https://a.com"), "f1")
+        self.db.save_session("https://b.com", "single", make_results(20, "https://b.com"), "f2")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_round_trip(self):
+        path = os.path.join(self.folder, "history.dlcol")
+        written, fmt, rows = write_columnar(path, self.db.iter_result_batches(batch_rows=16), 'dlcol')
+        self.assertEqual((written, fmt, rows), (path, 'dlcol', 70))
+
+        reader = ColumnarReader(path)
+        self.assertEqual(reader.num_rows, 70)
+        self.assertEqual(reader.columns, [name for name, kind in COLUMNS])
+        data = reader.read()
+        stored = self.db.get_session_results(self.first)
+        for i, row in enumerate(stored):
+            self.assertEqual(data['url'][i], row['url'])
+            self.assertEqual(data['status_code'][i], row['status_code'])
+            self.assertEqual(data['response_time'][i], row['response_time'])
+            self.assertEqual(data['status_text'][i], row['status_text'])
+            self.assertEqual(data['found_on'][i], row['found_on'])
+            self.assertEqual(data['is_dead'][i], bool(row['is_dead']))
+            self.assertEqual(data['retries'][i], row['retries'])
+        self.assertEqual(data['site'].count("https://b.com"), 20)
+
+    def test_dictionary_columns_and_projection(self):
+        path = os.path.join(self.folder, "history.dlcol")
+        self.db.export_results(path, format='dlcol')
+        reader = ColumnarReader(path)
+        self.assertEqual(sorted(reader.dictionary('link_type')), ["Image", "Link"])
+        self.assertEqual(len(reader.dictionary('found_on')), 6)
+        batches = list(reader.iter_batches(['status_text'], decode=False))
+        self.assertEqual(list(batches[0]), ['status_text'])
+        self.assertTrue(all(isinstance(code, int) for code in batches[0]['status_text']))
+        with self.assertRaises(KeyError):
+            list(reader.iter_batches(['nope']))
+
+    def test_filters(self):
+        path = os.path.join(self.folder, "a.dlcol")
+        self.assertEqual(self.db.export_results(path, url="https://a.com", format='dlcol')[2], 50)
+        self.assertEqual(self.db.export_results(path, session_ids=[], format='dlcol')[2], 0)
+        self.assertEqual(ColumnarReader(path).read()['url'], [])
+        self.assertEqual(self.db.export_results(path, since="2999-01-01", format='dlcol')[2], 0)
+
+    @unittest.skipIf(have_pyarrow(), "pyarrow is installed")
+    def test_auto_falls_back_without_pyarrow(self):
+        path, fmt, rows = self.db.export_results(os.path.join(self.folder, "history.parquet"))
+        self.assertEqual(fmt, 'dlcol')
+        self.assertTrue(path.endswith("history.dlcol"))
+        self.assertEqual(ColumnarReader(path).num_rows, rows)
+        with self.assertRaises(ImportError):
+            self.db.export_results(os.path.join(self.folder, "x.parquet"), format='parquet')
+
+    @unittest.skipUnless(have_pyarrow(), "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow.parquet as pq
+        path, fmt, rows = self.db.export_results(os.path.join(self.folder, "history.parquet"))
+        table = pq.read_table(path)
+        self.assertEqual(table.num_rows, 70)
+        self.assertTrue(str(table.schema.field('link_type').type).startswith('dictionary'))
+
+if __name__ == '__main__':
+    unittest.main()
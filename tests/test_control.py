@@ -0,0 +1,89 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.control import RunController
+from deadlink.scanner import check_link
+from deadlink.crawler import check_all_links
+from unittest.mock import patch
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        time.sleep(5)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+class TestRunController(unittest.TestCase):
+    def test_resume_wakes_waiters_immediately(self):
+        controller = RunController()
+        controller.pause()
+        woke = []
+        waiter = threading.Thread(target=lambda: woke.append(controller.wait_if_paused()))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertEqual(woke, [])
+        start = time.monotonic()
+        controller.resume()
+        waiter.join(1)
+        self.assertEqual(woke, [True])
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    def test_stop_releases_paused_waiters_and_sleepers(self):
+        controller = RunController()
+        controller.pause()
+        threading.Timer(0.05, controller.stop).start()
+        self.assertFalse(controller.wait_if_paused())
+        self.assertFalse(controller.sleep(5))
+
+    def test_legacy_events_are_honoured(self):
+        pause_event, stop_event = threading.Event(), threading.Event()
+        controller = RunController.from_events(pause_event, stop_event)
+        self.assertTrue(controller.wait_if_paused())
+        stop_event.set()
+        self.assertTrue(controller.stopped)
+        self.assertFalse(controller.wait_if_paused())
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_pause_gates_dispatch(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([(f"https://test.com/{i}", "Link") for i in range(5)], "https://test.com")
+        mock_check_link.side_effect = lambda url, *args, **kwargs: LinkResult(url, 200, "200 OK", 0.1, "base", False, False)
+        controller = RunController()
+        controller.pause()
+        results = []
+        runner = threading.Thread(target=lambda: results.extend(check_all_links("https://test.com", controller=controller)))
+        runner.start()
+        time.sleep(0.1)
+        self.assertEqual(mock_check_link.call_count, 0)
+        controller.resume()
+        runner.join(2)
+        self.assertEqual(len(results), 5)
+
+    def test_stop_aborts_in_flight_request(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            controller = RunController()
+            url = f"http://127.0.0.1:{server.server_address[1]}/slow"
+            threading.Timer(0.2, controller.stop).start()
+            start = time.monotonic()
+            result = check_link(url, "base", timeout=10, session=controller.session())
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertIsNone(result.status_code)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
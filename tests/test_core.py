@@ -9,7 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 
 from deadlink.utils import is_external_url, normalize_url, get_status_text
 from deadlink.models import LinkResult
-from deadlink.reporter import generate_report, get_report_filename
+from deadlink.reporter import generate_report, generate_summary, get_report_filename
 from deadlink.database import DatabaseManager
 from deadlink.scanner import get_all_links
 from deadlink.version import VERSION
@@ -86,6 +86,17 @@ class TestCore(unittest.TestCase):
         self.assertIn("Internal:   2", report)
         self.assertIn("External:   1", report)
 
+    def test_summary_generation(self):
+        results = [LinkResult(f"https://a.com/{i}", 404, "Not Found", 0.1, "base", True, i % 2 == 0) for i in range(30)]
+        results.append(LinkResult("https://a.com/ok", 200, "OK", 0.1, "base", False, False))
+        summary = generate_summary(results, max_dead=10)
+        self.assertIn("Total items checked: 31", summary)
+        self.assertIn("DEAD ITEMS (30)", summary)
+        self.assertIn("and 20 more", summary)
+        self.assertIn("1. 🏠", summary)
+        self.assertNotIn("https://a.com/ok", summary)
+        self.assertIn("No dead links found", generate_summary(results[-1:]))
+
     def test_report_filename_generation(self):
         url = "https://www.Example-Site.com/page"
         filename = get_report_filename(url, "csv", reports_dir=self.test_dir)
@@ -0,0 +1,177 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import shutil
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.database import DatabaseManager
+
+RESULTS = [LinkResult("https://a.com", 200, "OK", 0.1, "base", False, False)]
+
+class TestSessionQueries(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        for i in range(25):
+            session_id = self.db.save_session(f"https://site{i}.example.com/", "website", RESULTS, f"folder_{i}")
+            conn = self.db._get_connection()
+            conn.execute("UPDATE sessions SET timestamp = ? WHERE id = ?", (f"2024-01-{i + 1:02d} 10:00:00", session_id))
+            conn.commit()
+
+    def test_keyset_pages_cover_all_sessions_once(self):
+        seen = []
+        after = None
+        while True:
+            page = self.db.get_sessions_page(limit=10, after=after)
+            seen.extend(s['id'] for s in page)
+            if len(page) < 10:
+                break
+            after = (page[-1]['timestamp'], page[-1]['id'])
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        self.assertEqual(seen[0], 25)
+
+    def test_url_search_uses_fts_and_like_fallback(self):
+        self.assertTrue(self.db.fts)
+        self.assertEqual([s['url'] for s in self.db.get_sessions_page("site12.")], ["https://site12.example.com/"])
+        self.assertEqual(len(self.db.get_sessions("site1")), 11)
+        self.db.fts = False
+        self.assertEqual(len(self.db.get_sessions("site1")), 11)
+        self.assertEqual(len(self.db.get_sessions_page("e1", limit=100)), 11)
+
+    def test_timestamp_prefix_search(self):
+        self.assertEqual(len(self.db.get_sessions("2024-01-2")), 6)
+        self.assertEqual(len(self.db.get_sessions_page("2024-01", limit=5, after=("2024-01-10 10:00:00", 10))), 5)
+
+    def test_numeric_search_matches_urls(self):
+        self.db.save_session("https://example.com/2024-archive", "website", RESULTS, "archive")
+        self.db.save_session("https://shop-404.com", "website", RESULTS, "shop")
+        self.assertIn("https://example.com/2024-archive", [s['url'] for s in self.db.get_sessions("2024")])
+        self.assertEqual(len(self.db.get_sessions_page("2024", limit=100)), 26)
+        self.assertEqual([s['url'] for s in self.db.get_sessions("404")], ["https://shop-404.com"])
+        self.assertEqual([s['url'] for s in self.db.get_sessions_page("404")], ["https://shop-404.com"])
+        self.assertEqual([s['url'] for s in self.db.get_sessions_page("-4")], ["https://shop-404.com"])
+        self.db.fts = False
+        self.assertEqual([s['url'] for s in self.db.get_sessions_page("404")], ["https://shop-404.com"])
+
+    def test_deleted_sessions_leave_search_index(self):
+        session_id = self.db.get_sessions("site7.")[0]['id']
+        self.db.delete_session(session_id)
+        self.assertEqual(self.db.get_sessions("site7."), [])
+
+class TestReportFiles(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_files_recorded_with_session(self):
+        path = os.path.join(self.test_dir, "report.csv")
+        with open(path, "w") as f:
+            f.write("a,b\n")
+        db = DatabaseManager(":memory:")
+        db.save_session("https://test.com", "website", RESULTS, "folder", [path])
+        session = db.get_sessions_page()[0]
+        self.assertEqual(session['files_indexed'], 1)
+        self.assertEqual([(f['path'], f['kind'], f['size']) for f in session['files']], [(path, "csv", 4)])
+
+    def test_legacy_database_is_migrated(self):
+        db_path = os.path.join(self.test_dir, "history.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL,
+                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, mode TEXT, total_links INTEGER,
+                        working_links INTEGER, broken_links INTEGER, session_folder TEXT)""")
+        conn.execute("INSERT INTO sessions (url, mode, session_folder) VALUES ('https://old.example.com', 'website', 'f')")
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        session = db.get_sessions_page("old.example")[0]
+        self.assertEqual(session['files_indexed'], 0)
+        self.assertEqual(session['files'], [])
+        db.add_report_files(session['id'], [os.path.join(self.test_dir, "gone.txt")])
+        session = db.get_sessions_page()[0]
+        self.assertEqual(session['files_indexed'], 1)
+        self.assertEqual(session['files'][0]['kind'], "txt")
+        self.assertIsNone(session['files'][0]['size'])
+
+class TestConnections(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, "history.db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir)
+
+    def in_thread(self, fn):
+        out = []
+        worker = threading.Thread(target=lambda: out.append(fn()))
+        worker.start()
+        worker.join()
+        return out[0]
+
+    def test_one_connection_per_thread_with_pragmas(self):
+        conn = self.db._get_connection()
+        self.assertIs(self.db._get_connection(), conn)
+        self.assertIsNot(self.in_thread(self.db._get_connection), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+    def test_memory_database_shared_between_threads(self):
+        db = DatabaseManager(":memory:")
+        other = DatabaseManager(":memory:")
+        self.in_thread(lambda: db.save_session("https://a.com", "website", RESULTS, "f"))
+        self.assertEqual([s['url'] for s in db.get_sessions()], ["https://a.com"])
+        self.assertEqual(self.in_thread(other.get_sessions), [])
+        db.close()
+        other.close()
+
+    def test_concurrent_reads_and_writes(self):
+        errors = []
+        ids = []
+        done = threading.Event()
+
+        def writer():
+            try:
+                for i in range(40):
+                    ids.append(self.db.save_session(f"https://site{i % 4}.com", "website", RESULTS * 50, "f"))
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                while not done.is_set():
+                    for session in self.db.get_sessions_page(limit=5):
+                        self.db.get_session_results(session['id'])
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        writers = [threading.Thread(target=writer) for _ in range(2)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set()
+        for t in readers:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(ids)), 80)
+        self.assertEqual(len(self.db.get_sessions()), 80)
+
+    def test_write_errors_reach_the_caller(self):
+        with self.assertRaises(sqlite3.Error):
+            self.db.save_session(None, "website", RESULTS, "f")
+        self.assertEqual(self.db.get_sessions(), [])
+
+if __name__ == '__main__':
+    unittest.main()
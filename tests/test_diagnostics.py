@@ -0,0 +1,70 @@
+import sys
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.diagnostics import RunDiagnostics
+
+def busy_worker(seconds: float):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+def run_in_thread(seconds: float = 0.2):
+    worker = threading.Thread(target=busy_worker, args=(seconds,), name="ThreadPoolExecutor-0_1")
+    worker.start()
+    worker.join()
+
+class TestRunDiagnostics(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.prefix = os.path.join(self.folder, "nested", "site")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_sampler_sees_worker_threads(self):
+        with RunDiagnostics(cpu='sample', interval=0.002) as diagnostics:
+            run_in_thread()
+        paths = diagnostics.write(self.prefix)
+        self.assertEqual([os.path.basename(p) for p in paths], ["site.cpu.collapsed", "site.cpu.txt"])
+        with open(paths[0], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        worker = [line for line in lines if line.startswith("ThreadPoolExecutor-0;") and "busy_worker" in line]
+        self.assertTrue(worker)
+        stack, count = worker[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+
+    def test_cprofile_merges_thread_profiles(self):
+        with RunDiagnostics(cpu='cprofile') as diagnostics:
+            run_in_thread(0.05)
+        paths = diagnostics.write(self.prefix)
+        stats = pstats.Stats(paths[0])
+        self.assertTrue(any(func[2] == 'busy_worker' for func in stats.stats))
+
+    def test_memory_report(self):
+        with RunDiagnostics(mem=True) as diagnostics:
+            kept = [bytearray(1024) for _ in range(2000)]
+        paths = diagnostics.write(self.prefix)
+        self.assertEqual([os.path.basename(p) for p in paths], ["site.mem.txt"])
+        with open(paths[0], encoding='utf-8') as f:
+            report = f.read()
+        self.assertIn("Peak traced memory", report)
+        self.assertIn("test_diagnostics.py", report)
+        self.assertEqual(len(kept), 2000)
+
+    def test_unknown_cpu_mode(self):
+        with self.assertRaises(ValueError):
+            RunDiagnostics(cpu='perf')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.events import ProgressChannel, ResultLine, CallbackReporter, as_reporter
+from deadlink.logspool import LogSpool
+from deadlink.crawler import check_all_links
+from unittest.mock import patch
+
+def make_result(url, status=200, is_dead=False, is_external=False):
+    return LinkResult(url, status, f"{status}", 0.1, "base", is_dead, is_external)
+
+class TestProgressChannel(unittest.TestCase):
+    def test_poll_batches_everything_since_last_poll(self):
+        channel = ProgressChannel()
+        self.assertIsNone(channel.poll())
+        channel.log("starting")
+        channel.result(make_result("https://a.com/1"))
+        channel.result(make_result("https://a.com/2", 404, is_dead=True, is_external=True))
+        channel.progress(0.5)
+
+        batch = channel.poll()
+        self.assertEqual([r.url for r in batch.results], ["https://a.com/1", "https://a.com/2"])
+        self.assertEqual(batch.logs, ["starting"])
+        self.assertEqual(batch.progress, 0.5)
+        self.assertEqual((batch.counters.total, batch.counters.working, batch.counters.broken), (2, 1, 1))
+        self.assertEqual(batch.counters.external, 1)
+        self.assertEqual(batch.counters.success_rate, 50.0)
+        self.assertIsNone(channel.poll())
+
+    def test_result_lines_are_formatted_lazily(self):
+        channel = ProgressChannel()
+        result = make_result("https://a.com/page")
+        channel.result(result, ResultLine(result, 1, 3))
+        line = channel.poll().logs[0]
+        self.assertIsInstance(line, ResultLine)
+        self.assertTrue(str(line).startswith("[1/3] ✅"))
+
+    def test_verbose_lines_dropped_when_full(self):
+        channel = ProgressChannel(max_log_lines=2)
+        for i in range(5):
+            channel.log(f"excluding {i}", verbose=True)
+        channel.log("important")
+        batch = channel.poll()
+        self.assertEqual(batch.logs, ["excluding 0", "excluding 1", "important"])
+        self.assertEqual(batch.dropped_logs, 3)
+
+    def test_spool_keeps_dropped_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = LogSpool(os.path.join(tmp, "run.log"))
+            channel = ProgressChannel(max_log_lines=10, spool=spool)
+            publishers = [threading.Thread(target=lambda n=n: [channel.log(f"{n}-{i}\n", verbose=True) for i in range(500)])
+                          for n in range(4)]
+            for publisher in publishers:
+                publisher.start()
+            for publisher in publishers:
+                publisher.join()
+            for i in range(100):
+                result = make_result(f"https://a.com/{i}")
+                channel.result(result, ResultLine(result, i + 1, 100))
+            batch = channel.poll()
+            spool.close()
+            self.assertEqual(len(batch.logs), 10)
+            self.assertEqual(batch.dropped_logs, 2090)
+            with open(spool.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(spool.lines, 2100)
+            self.assertEqual(len(lines), 2100)
+            self.assertEqual({line for line in lines if not line.startswith("[")},
+                             {f"{n}-{i}" for n in range(4) for i in range(500)})
+            self.assertTrue(lines[-1].startswith("[100/100] ✅"))
+
+    def test_publishers_block_until_polled(self):
+        channel = ProgressChannel(max_pending_results=1)
+        channel.result(make_result("https://a.com/1"))
+        publisher = threading.Thread(target=channel.result, args=(make_result("https://a.com/2"),))
+        publisher.start()
+        time.sleep(0.05)
+        self.assertTrue(publisher.is_alive())
+        self.assertEqual(len(channel.poll().results), 1)
+        publisher.join(1)
+        self.assertFalse(publisher.is_alive())
+        self.assertEqual(len(channel.poll().results), 1)
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_channel_as_progress_callback(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([(f"https://test.com/{i}", "Link") for i in range(3)], "https://test.com")
+        mock_check_link.side_effect = lambda url, *args, **kwargs: make_result(url)
+        channel = ProgressChannel()
+        check_all_links("https://test.com", progress_callback=channel)
+        batch = channel.poll()
+        self.assertEqual(len(batch.results), 3)
+        self.assertEqual(batch.counters.working, 3)
+        self.assertEqual(batch.progress, 1.0)
+
+class TestCallbackReporter(unittest.TestCase):
+    def test_plain_callbacks_get_text_then_result(self):
+        received = []
+        reporter = as_reporter(received.append)
+        self.assertIsInstance(reporter, CallbackReporter)
+        result = make_result("https://a.com/")
+        reporter.log("hello")
+        reporter.result(result, ResultLine(result, 1, 1))
+        self.assertEqual(received[0], "hello")
+        self.assertIsInstance(received[1], str)
+        self.assertIs(received[2], result)
+
+    def test_channel_is_its_own_reporter(self):
+        channel = ProgressChannel()
+        self.assertIs(as_reporter(channel), channel)
+
+if __name__ == '__main__':
+    unittest.main()
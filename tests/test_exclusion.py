@@ -0,0 +1,74 @@
+import sys
+import os
+import re
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.exclusion import ExclusionMatcher, required_literal, validate_patterns
+from deadlink.crawler import should_exclude
+
+def legacy_should_exclude(url, patterns):
+    for pattern in patterns:
+        try:
+            if re.search(pattern, url, re.IGNORECASE):
+                return True
+        except re.error:
+            if pattern.lower() in url.lower():
+                return True
+    return False
+
+PATTERNS = [
+    "/wp-admin/",
+    "LOGOUT",
+    "^https://cdn",
+    r"\.pdf$",
+    r"example\.org/(private|secret)",
+    r"(ab)\1",
+    "[unclosed",
+    "a.c",
+    r"\d{4}/\d{2}",
+]
+
+URLS = [
+    "https://example.com/wp-admin/index.php",
+    "https://example.com/account/logout",
+    "https://CDN.example.com/lib.js",
+    "https://example.com/cdn/lib.js",
+    "https://example.com/files/report.PDF",
+    "https://example.com/files/report.pdf?x=1",
+    "https://example.org/secret/page",
+    "https://example.org/public/page",
+    "https://example.com/abab",
+    "https://example.com/[unclosed",
+    "https://example.com/abc",
+    "https://example.com/blog/2024/05/post",
+    "https://example.com/",
+]
+
+class TestExclusionMatcher(unittest.TestCase):
+    def test_matches_legacy_behaviour(self):
+        matcher = ExclusionMatcher(PATTERNS)
+        for url in URLS:
+            with self.subTest(url=url):
+                self.assertEqual(matcher.matches(url), legacy_should_exclude(url, PATTERNS))
+
+    def test_should_exclude_accepts_lists_and_matchers(self):
+        self.assertFalse(should_exclude("https://example.com", None))
+        self.assertFalse(should_exclude("https://example.com", []))
+        self.assertTrue(should_exclude("https://example.com/wp-admin/", ["wp-admin"]))
+        self.assertTrue(should_exclude("https://example.com/wp-admin/", ExclusionMatcher(["wp-admin"])))
+
+    def test_invalid_patterns_are_reported(self):
+        self.assertEqual([p for p, _ in validate_patterns(PATTERNS)], ["[unclosed"])
+        with self.assertRaises(ValueError):
+            ExclusionMatcher(["[unclosed"], strict=True)
+
+    def test_required_literal(self):
+        self.assertEqual(required_literal(r"example\.org/(private|secret)"), "example.org/")
+        self.assertEqual(required_literal(r"Tracking-\d+\.JS"), "tracking-")
+        self.assertEqual(required_literal(r"(a|b)+"), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.frontier import SQLiteFrontier, RemoteFrontier, WorkItem, PAGE, LINK, seed_crawl, run_worker
+from deadlink.server import CheckServer
+from unittest.mock import patch
+
+def link(url, found_on="https://test.com"):
+    return WorkItem(LINK, url, url, found_on=found_on)
+
+def ok(url, found_on="https://test.com"):
+    return LinkResult(url, 200, "OK", 0.1, found_on, False, False, "Link")
+
+class TestSQLiteFrontier(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "frontier.db")
+        self.frontier = SQLiteFrontier(self.path)
+
+    def tearDown(self):
+        self.frontier.close()
+        shutil.rmtree(self.dir)
+
+    def test_lease_and_complete(self):
+        self.assertEqual(self.frontier.add([link("https://test.com/a"), link("https://test.com/b"), link("https://test.com/a")]), 2)
+        items = self.frontier.lease("w1", 10, 60)
+        self.assertEqual([i.url for i in items], ["https://test.com/a", "https://test.com/b"])
+        self.assertEqual(self.frontier.lease("w2", 10, 60), [])
+        self.assertFalse(self.frontier.finished())
+
+        accepted = self.frontier.complete("w1", [(i.id, ok(i.url)) for i in items], [link("https://test.com/a"), link("https://test.com/c")])
+        self.assertEqual(accepted, 2)
+        self.assertEqual(self.frontier.counts(), {'queued': 1, 'leased': 0, 'done': 2, 'failed': 0})
+        self.assertEqual([r.url for r in self.frontier.results()], ["https://test.com/a", "https://test.com/b"])
+
+    def test_shared_between_connections(self):
+        other = SQLiteFrontier(self.path)
+        try:
+            self.frontier.add([link(f"https://test.com/{i}") for i in range(10)])
+            first = self.frontier.lease("w1", 6, 60)
+            second = other.lease("w2", 6, 60)
+            self.assertEqual(len(first), 6)
+            self.assertEqual(len(second), 4)
+            self.assertFalse({i.id for i in first} & {i.id for i in second})
+        finally:
+            other.close()
+
+    def test_expired_lease_is_requeued(self):
+        self.frontier.add([link("https://test.com/a")])
+        stale = self.frontier.lease("w1", 1, -1)
+        fresh = self.frontier.lease("w2", 1, 60)
+        self.assertEqual([i.id for i in fresh], [stale[0].id])
+        # The first worker lost its lease; its late completion is ignored
+        self.assertEqual(self.frontier.complete("w1", [(stale[0].id, ok(stale[0].url))]), 0)
+        self.assertEqual(self.frontier.renew("w2", [fresh[0].id], 60), 1)
+        self.assertEqual(self.frontier.complete("w2", [(fresh[0].id, ok(fresh[0].url))]), 1)
+
+    def test_repeatedly_expired_item_fails(self):
+        frontier = SQLiteFrontier(self.path, max_attempts=2)
+        try:
+            frontier.add([link("https://test.com/slow")])
+            frontier.lease("w1", 1, -1)
+            frontier.lease("w2", 1, -1)
+            self.assertEqual(frontier.lease("w3", 1, 60), [])
+            self.assertTrue(frontier.finished())
+            self.assertEqual(frontier.counts()['failed'], 1)
+            self.assertEqual(frontier.results()[0].status_text, "Error: Worker lease expired")
+        finally:
+            frontier.close()
+
+    def test_release(self):
+        self.frontier.add([link("https://test.com/a")])
+        self.frontier.lease("w1", 1, 60)
+        self.assertEqual(self.frontier.release("w1"), 1)
+        self.assertEqual(len(self.frontier.lease("w2", 1, 60)), 1)
+
+    def test_seed_rejects_other_crawl(self):
+        seed_crawl(self.frontier, "https://test.com", max_depth=2)
+        seed_crawl(self.frontier, "https://test.com", max_depth=2)
+        self.assertEqual(self.frontier.counts()['queued'], 1)
+        with self.assertRaises(ValueError):
+            seed_crawl(self.frontier, "https://other.com")
+
+    @patch('deadlink.frontier.check_link')
+    @patch('deadlink.frontier.get_all_links')
+    def test_workers_crawl_each_link_once(self, mock_get_all_links, mock_check_link):
+        site = {
+            "https://test.com": ["https://test.com/a", "https://test.com/b", "https://ext.com/x"],
+            "https://test.com/a": ["https://test.com/b", "https://test.com/c"],
+            "https://test.com/b": ["https://test.com", "https://test.com/missing"],
+            "https://test.com/c": [],
+        }
+        mock_get_all_links.side_effect = lambda url, *args, **kwargs: ([(l, "Link") for l in site[url]], url)
+        mock_check_link.side_effect = lambda url, found_on, *args, **kwargs: (
+            LinkResult(url, 404, "Not Found", 0.1, found_on, True, False, "Link") if url.endswith("missing") else ok(url, found_on))
+
+        seed_crawl(self.frontier, "https://test.com", max_depth=2)
+        frontiers = [SQLiteFrontier(self.path) for _ in range(2)]
+        threads = [threading.Thread(target=run_worker, args=(f,), kwargs={'max_workers': 2, 'batch_size': 2, 'idle_poll': 0.01})
+                   for f in frontiers]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        for f in frontiers: f.close()
+
+        results = self.frontier.results()
+        checked = sorted(r.url for r in results)
+        self.assertEqual(checked, sorted(["https://test.com", "https://test.com/a", "https://test.com/b", "https://test.com/c",
+                                          "https://ext.com/x", "https://test.com/missing"]))
+        self.assertEqual(mock_check_link.call_count, 6)
+        # Depth 2 crawls the seed, its pages and theirs, but nothing found on depth-2 pages
+        self.assertEqual(sorted(call.args[0] for call in mock_get_all_links.call_args_list),
+                         ["https://test.com", "https://test.com/a", "https://test.com/b", "https://test.com/c"])
+        self.assertTrue([r for r in results if r.url == "https://ext.com/x"][0].is_external)
+        self.assertTrue(self.frontier.finished())
+
+class TestRemoteFrontier(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.local = SQLiteFrontier(os.path.join(self.dir, "frontier.db"))
+        self.server = CheckServer(("127.0.0.1", 0), frontier=self.local)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.remote = RemoteFrontier(self.server.server_address, timeout=5)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.local.close()
+        shutil.rmtree(self.dir)
+
+    def test_round_trip(self):
+        self.assertEqual(self.remote.configure({'url': "https://test.com"}), {'url': "https://test.com"})
+        self.remote.add([WorkItem(PAGE, "https://test.com", "https://test.com"), link("https://test.com/a")])
+        items = self.remote.lease("remote", 5, 60)
+        self.assertEqual([i.kind for i in items], [PAGE, LINK])
+        self.assertEqual(self.remote.complete("remote", [(items[0].id, None), (items[1].id, ok(items[1].url))], [link("https://test.com/b")]), 2)
+        self.assertEqual(self.remote.counts()['queued'], 1)
+        self.assertFalse(self.remote.finished())
+        self.assertEqual(self.remote.results(), [ok("https://test.com/a")])
+        with self.assertRaises(RuntimeError):
+            self.remote._call('drop_everything')
+
+    def test_token_required(self):
+        self.server.token = "s3cret"
+        with self.assertRaises(RuntimeError):
+            self.remote.lease("remote", 5, 60)
+        self.assertEqual(RemoteFrontier(self.server.server_address, timeout=5, token="s3cret").counts()['queued'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
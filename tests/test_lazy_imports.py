@@ -0,0 +1,49 @@
+import sys
+import os
+import subprocess
+import unittest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Add src to path
+sys.path.append(SRC)
+
+import deadlink
+
+def loaded_after(code: str) -> set:
+    """Run `code` in a fresh interpreter and return the names of all imported modules."""
+    script = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=SRC, check=True)
+    return set(proc.stdout.split())
+
+class TestLazyPackage(unittest.TestCase):
+    def test_import_loads_no_submodules(self):
+        modules = loaded_after("import deadlink")
+        self.assertNotIn('requests', modules)
+        self.assertNotIn('deadlink.crawler', modules)
+        self.assertNotIn('deadlink.database', modules)
+
+    def test_gui_startup_names_stay_light(self):
+        modules = loaded_after(
+            "from deadlink import ProgressChannel, ResultModel, LogSpool, LinkResult, TimeoutPolicy, "
+            "RetryPolicy, validate_patterns, URLCanonicalizer, generate_summary, open_file, VERSION"
+        )
+        for heavy in ('requests', 'bs4', 'sqlite3', 'reportlab'):
+            self.assertNotIn(heavy, modules)
+
+    def test_names_resolve_on_access(self):
+        modules = loaded_after("import deadlink\ndeadlink.check_all_links")
+        self.assertIn('deadlink.crawler', modules)
+        self.assertIn('requests', modules)
+
+    def test_exports(self):
+        from deadlink.crawler import check_all_links
+        self.assertIs(deadlink.check_all_links, check_all_links)
+        self.assertTrue(set(deadlink.__all__) <= set(dir(deadlink)))
+        for name in deadlink.__all__:
+            getattr(deadlink, name)
+        with self.assertRaises(AttributeError):
+            deadlink.not_a_name
+
+if __name__ == '__main__':
+    unittest.main()
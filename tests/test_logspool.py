@@ -0,0 +1,37 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.logspool import LogSpool
+
+class TestLogSpool(unittest.TestCase):
+    def test_writes_and_counts_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "logs", "run.log")
+            with LogSpool(path) as spool:
+                spool.write("one\ntwo\n")
+                spool.write("")
+                spool.write("three\n")
+                self.assertEqual(spool.lines, 3)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "one\ntwo\nthree\n")
+
+    def test_reopen_starts_new_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = LogSpool(os.path.join(tmp, "a.log"))
+            spool.write("a\n")
+            spool.open(os.path.join(tmp, "b.log"))
+            spool.write("b\n")
+            spool.close()
+            spool.write("ignored\n")
+            self.assertEqual(spool.lines, 1)
+            self.assertEqual(spool.path, os.path.join(tmp, "b.log"))
+            with open(os.path.join(tmp, "a.log"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), "a\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.database import DatabaseManager
+from deadlink.maintenance import RetentionPolicy, maintenance_due
+from deadlink.models import LinkResult
+
+def make_results(n=30):
+    return [LinkResult(f"https://test.com/{i}", 200, "OK", 0.1, "https://test.com", False, False) for i in range(n)]
+
+def count(db, table):
+    with db._get_connection() as conn:
+        return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        self.ids = {site: [self.db.save_session(site, "single", make_results(), "f") for _ in range(4)]
+                    for site in ("https://a.com", "https://b.com")}
+
+    def test_keep_last_downsamples(self):
+        report = self.db.maintain(RetentionPolicy(keep_last=2))
+        self.assertEqual(report.sessions_downsampled, 4)
+        self.assertEqual(report.results_deleted, 4 * 30)
+        self.assertEqual(len(self.db.get_sessions()), 8)
+        for ids in self.ids.values():
+            self.assertEqual(len(self.db.get_session_results(ids[-1])), 30)
+            self.assertEqual(self.db.get_session_results(ids[0]), [])
+        oldest = [s for s in self.db.get_sessions() if s['id'] == self.ids["https://a.com"][0]][0]
+        self.assertEqual((oldest['downsampled'], oldest['total_links']), (1, 30))
+        # Already downsampled sessions are not counted again
+        self.assertEqual(self.db.maintain(RetentionPolicy(keep_last=2)).sessions_downsampled, 0)
+
+    def test_drop_old_deletes(self):
+        report = self.db.maintain(RetentionPolicy(keep_last=1, downsample=False))
+        self.assertEqual(report.sessions_deleted, 6)
+        self.assertEqual(count(self.db, 'sessions'), 2)
+        self.assertEqual(count(self.db, 'results'), 60)
+
+    def test_max_age_keeps_newest(self):
+        with self.db._get_connection() as conn:
+            conn.execute("UPDATE sessions SET timestamp = '2000-01-01 00:00:00'")
+        report = self.db.maintain(RetentionPolicy(max_age_days=30))
+        self.assertEqual(report.sessions_downsampled, 6)
+        self.assertEqual(count(self.db, 'results'), 60)
+
+    def test_no_policy_keeps_every_result(self):
+        report = self.db.maintain()
+        self.assertEqual((report.sessions_downsampled, report.sessions_deleted, report.results_deleted), (0, 0, 0))
+        self.assertEqual(count(self.db, 'results'), 8 * 30)
+
+    def test_invalid_keep_last(self):
+        with self.assertRaises(ValueError):
+            RetentionPolicy(keep_last=0)
+
+class TestUpkeep(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "history.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_foreign_keys_cascade(self):
+        db = DatabaseManager(self.path)
+        session_id = db.save_session("https://test.com", "single", make_results(), "f")
+        with db._get_connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        self.assertEqual(count(db, 'results'), 0)
+
+    def test_orphans_vacuum_and_schedule(self):
+        db = DatabaseManager(self.path)
+        for _ in range(5):
+            db.save_session("https://test.com", "single", make_results(2000), "f")
+        # Rows left behind by a delete without foreign key enforcement
+        conn = sqlite3.connect(self.path)
+        conn.execute("DELETE FROM sessions WHERE id = 1")
+        conn.commit()
+        conn.close()
+        self.assertTrue(maintenance_due(db))
+
+        report = db.maintain(RetentionPolicy(keep_last=2))
+        self.assertEqual(report.orphans_deleted, 2000)
+        self.assertEqual(report.results_deleted, 2 * 2000)
+        self.assertGreater(report.pages_freed, 0)
+        with db._get_connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+        self.assertLess(report.bytes_after, report.bytes_before)
+        self.assertTrue(report.analyzed)
+        self.assertFalse(maintenance_due(db))
+        self.assertFalse(db.maintain().analyzed)
+
+    def test_converts_old_database(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, mode TEXT, total_links INTEGER, working_links INTEGER, broken_links INTEGER, session_folder TEXT)")
+        conn.commit()
+        conn.close()
+        db = DatabaseManager(self.path)
+        self.assertFalse(db.maintain().converted)
+        self.assertTrue(db.maintain(full=True).converted)
+        self.assertFalse(db.maintain(full=True).converted)
+
+if __name__ == '__main__':
+    unittest.main()
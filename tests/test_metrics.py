@@ -0,0 +1,96 @@
+import sys
+import os
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.metrics import CrawlMetrics, serve_metrics
+from deadlink.crawler import check_all_links
+from deadlink.models import LinkResult
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self._send(b"")
+
+    def do_GET(self):
+        self._send(b'<html><body><a href="/a">a</a><a href="/b">b</a><img src="/c.png"></body></html>')
+
+    def _send(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def ok(url, code=200):
+    return LinkResult(url, code, f"{code}", 0.1, "https://test.com", code >= 400, False)
+
+class TestCrawlMetrics(unittest.TestCase):
+    def test_render_prometheus_text(self):
+        metrics = CrawlMetrics()
+        metrics.set_capacity(4)
+        metrics.check_started()
+        metrics.check_started()
+        metrics.check_finished("https://a.com/x", ok("https://a.com/x"), 0.07)
+        metrics.check_finished("https://a.com/y", ok("https://a.com/y", 404), 3.0)
+        metrics.check_started()
+        metrics.check_finished("https://b.com/z", None, 0.2)
+        metrics.record("https://ext.com", LinkResult("https://ext.com", 200, "Skipped (External)", 0, "https://test.com", False, True))
+        text = metrics.render()
+
+        self.assertIn("# TYPE deadlink_checks_total counter", text)
+        self.assertIn('deadlink_checks_total{status_class="2xx"} 1', text)
+        self.assertIn('deadlink_checks_total{status_class="4xx"} 1', text)
+        self.assertIn('deadlink_checks_total{status_class="error"} 1', text)
+        self.assertIn('deadlink_checks_total{status_class="skipped"} 1', text)
+        self.assertIn("deadlink_checks_in_flight 0", text)
+        self.assertIn('deadlink_host_errors_total{host="a.com"} 1', text)
+        self.assertIn('deadlink_host_errors_total{host="b.com"} 1', text)
+        self.assertIn('deadlink_check_duration_seconds_bucket{host="a.com",le="0.1"} 1', text)
+        self.assertIn('deadlink_check_duration_seconds_bucket{host="a.com",le="5.0"} 2', text)
+        self.assertIn('deadlink_check_duration_seconds_count{host="a.com"} 2', text)
+        self.assertNotIn('ext.com', text)
+        self.assertNotIn("# EOF", text)
+
+        openmetrics = metrics.render(openmetrics=True)
+        self.assertIn("# TYPE deadlink_checks counter", openmetrics)
+        self.assertTrue(openmetrics.endswith("# EOF\n"))
+
+    def test_host_cardinality_is_bounded(self):
+        metrics = CrawlMetrics(max_hosts=3)
+        for i in range(10):
+            metrics.record(f"https://h{i}.com/", ok(f"https://h{i}.com/"), 0.1)
+        self.assertEqual(len(metrics.hosts), 4)
+        self.assertEqual(metrics.hosts['other'].checks, 7)
+
+    def test_crawl_feeds_metrics_endpoint(self):
+        site = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        threading.Thread(target=site.serve_forever, daemon=True).start()
+        metrics = CrawlMetrics()
+        server = serve_metrics(('127.0.0.1', 0), metrics)
+        try:
+            check_all_links(f"http://127.0.0.1:{site.server_address[1]}/", max_workers=2, timeout=5, progress_callback=lambda *args: None, metrics=metrics)
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                content_type = response.headers['Content-Type']
+                text = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+            site.shutdown()
+            site.server_close()
+        self.assertTrue(content_type.startswith("text/plain"))
+        self.assertIn('deadlink_checks_total{status_class="2xx"} 3', text)
+        self.assertIn("deadlink_pages_total 1", text)
+        self.assertIn('deadlink_queue_depth{queue="links"} 0', text)
+        self.assertIn("deadlink_worker_capacity 2", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import sys
+import os
+import io
+import json
+import subprocess
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.ndjson import NDJSONReporter, summarize
+from deadlink.crawler import check_all_links
+from deadlink.models import LinkResult
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self._send(404 if self.path == "/gone" else 200, b"")
+
+    def do_GET(self):
+        if self.path == "/gone":
+            self._send(404, b"")
+            return
+        self._send(200, b'<html><body><a href="/a">a</a><a href="/gone">gone</a></body></html>')
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def read_records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+class TestSummarize(unittest.TestCase):
+    def test_counts(self):
+        results = [
+            LinkResult("https://test.com/a", 200, "OK", 0.1, "https://test.com", False, False),
+            LinkResult("https://test.com/b", 404, "Not Found", 0.1, "https://test.com", True, False, retries=1),
+            LinkResult("https://other.com", 200, "OK", 0.1, "https://test.com/a", False, True),
+        ]
+        summary = summarize(results)
+        self.assertEqual((summary['total'], summary['working'], summary['dead']), (3, 2, 1))
+        self.assertEqual((summary['external'], summary['pages'], summary['retried']), (1, 2, 1))
+        self.assertEqual(summary['success_rate'], 66.67)
+        self.assertEqual(summary['by_status'], {'OK': 2, 'Not Found': 1})
+        self.assertEqual(summarize([])['success_rate'], 0.0)
+
+class TestNDJSONReporter(unittest.TestCase):
+    def test_results_stream_during_crawl(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stream = io.StringIO()
+        reporter = NDJSONReporter(stream)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/"
+            results = check_all_links(url, max_workers=2, timeout=5, progress_callback=reporter)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(len(read_records(stream)), 2)
+        reporter.summary(results, url=url)
+
+        records = read_records(stream)
+        self.assertEqual([r['type'] for r in records], ['result', 'result', 'summary'])
+        dead = [r for r in records[:2] if r['is_dead']]
+        self.assertEqual([r['status_code'] for r in dead], [404])
+        self.assertEqual(records[-1]['url'], url)
+        self.assertEqual(records[-1]['dead'], 1)
+        self.assertIn('finished', records[-1])
+
+    def test_site_field(self):
+        stream = io.StringIO()
+        reporter = NDJSONReporter(stream)
+        site = reporter.for_site("https://test.com")
+        site.result(LinkResult("https://test.com/a", 200, "OK", 0.1, "https://test.com", False, False))
+        site.summary([], 'site_summary', error="boom")
+        reporter.summary([])
+
+        records = read_records(stream)
+        self.assertEqual(list(records[0])[:2], ['type', 'site'])
+        self.assertEqual(records[0]['site'], "https://test.com")
+        self.assertEqual(records[1]['type'], 'site_summary')
+        self.assertEqual(records[1]['error'], "boom")
+        self.assertNotIn('site', records[2])
+
+class TestNDJSONOutputFile(unittest.TestCase):
+    def test_summary_written_when_check_fails(self):
+        src = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.ndjson")
+            # Nothing listens on port 1, so the check fails after the output file is opened
+            proc = subprocess.run([sys.executable, 'deadlink_checker.py', '--connect', '127.0.0.1:1', 'https://example.com',
+                                   '--format', 'ndjson', '--output', path], capture_output=True, text=True, cwd=src)
+            self.assertEqual(proc.returncode, 1)
+            with open(path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r['type'] for r in records], ['summary'])
+        self.assertEqual(records[0]['url'], "https://example.com")
+        self.assertEqual(records[0]['total'], 0)
+        self.assertTrue(records[0]['error'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.resultmodel import ResultModel, format_row
+
+def make_result(url, status=200, time=0.1, is_dead=False, found_on="https://test.com"):
+    return LinkResult(url, status, "OK" if not is_dead else "Not Found", time, found_on, is_dead, False)
+
+class TestResultModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ResultModel()
+        self.model.extend([
+            make_result("https://test.com/b", 200, 0.3),
+            make_result("https://test.com/a", 404, 0.1, is_dead=True),
+            make_result("https://test.com/c", None, None, is_dead=True),
+        ])
+
+    def urls(self):
+        return [self.model.result(i).url for i in range(len(self.model))]
+
+    def test_rows_in_arrival_order(self):
+        self.assertEqual(len(self.model), 3)
+        self.assertEqual(self.model.row(0), format_row(self.model.result(0)))
+        self.assertEqual(self.model.rows(1, 10)[1][1], "Err Not Found")
+
+    def test_sort_by_column_and_direction(self):
+        self.model.sort("URL")
+        self.assertEqual(self.urls(), ["https://test.com/a", "https://test.com/b", "https://test.com/c"])
+        self.model.sort("Time", descending=True)
+        self.assertEqual(self.urls(), ["https://test.com/b", "https://test.com/a", "https://test.com/c"])
+        self.model.sort("Status")
+        self.assertEqual(self.urls()[0], "https://test.com/c")
+        self.model.sort(None)
+        self.assertEqual(self.urls(), ["https://test.com/b", "https://test.com/a", "https://test.com/c"])
+        with self.assertRaises(ValueError):
+            self.model.sort("Nope")
+
+    def test_appends_keep_sort_order(self):
+        self.model.sort("URL", descending=True)
+        self.model.extend([make_result("https://test.com/bb")])
+        self.model.extend([make_result(f"https://test.com/z{i}") for i in range(10)])
+        urls = self.urls()
+        self.assertEqual(urls, sorted(urls, reverse=True))
+
+    def test_filter_applies_to_new_results(self):
+        self.model.set_filter(lambda r: r.is_dead)
+        self.assertEqual(len(self.model), 2)
+        self.model.extend([make_result("https://test.com/d", 500, is_dead=True), make_result("https://test.com/e")])
+        self.assertEqual(len(self.model), 3)
+        self.assertEqual(self.model.total, 5)
+        self.model.set_filter(None)
+        self.assertEqual(len(self.model), 5)
+
+    def test_retried_result_replaces_row(self):
+        self.model.sort("Status")
+        self.model.set_filter(lambda r: r.is_dead)
+        self.model.extend([make_result("https://test.com/c", 200, 0.2)])
+        self.assertEqual(self.model.total, 3)
+        self.assertEqual(self.urls(), ["https://test.com/a"])
+        self.model.set_filter(None)
+        self.assertEqual([self.model.result(i).status_code for i in range(3)], [200, 200, 404])
+        self.assertEqual((self.model.counters.total, self.model.counters.working, self.model.counters.broken), (3, 2, 1))
+
+    def test_retry_in_same_batch(self):
+        self.model.set_filter(lambda r: r.is_dead)
+        self.model.extend([make_result("https://test.com/d", 503, is_dead=True), make_result("https://test.com/d", 200)])
+        self.assertEqual(self.model.total, 4)
+        self.assertEqual(self.urls(), ["https://test.com/a", "https://test.com/c"])
+        self.assertEqual(self.model.counters.working, 2)
+
+    def test_large_model(self):
+        model = ResultModel()
+        model.extend(make_result(f"https://test.com/{i}", 200, (i * 7919) % 1000 / 1000) for i in range(200000))
+        model.sort("Time", descending=True)
+        self.assertEqual(len(model), 200000)
+        self.assertGreaterEqual(model.result(0).response_time, model.result(199999).response_time)
+        self.assertEqual(len(model.rows(100000, 100030)), 30)
+
+if __name__ == '__main__':
+    unittest.main()
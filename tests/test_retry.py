@@ -0,0 +1,108 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.retry import RetryPolicy, RetryQueue, is_transient
+from deadlink.crawler import check_all_links
+from deadlink.control import RunController
+from deadlink.events import ProgressChannel
+from deadlink.resultmodel import ResultModel
+from unittest.mock import patch
+
+def make_result(url, status_code=200, status_text="200 OK", retries=0):
+    return LinkResult(url, status_code, status_text, 0.1, "base", status_code is None or status_code >= 400, False, retries=retries)
+
+class TestRetry(unittest.TestCase):
+    def test_transient_classification(self):
+        self.assertTrue(is_transient(make_result("https://a.com", None, "Error: ConnectionError")))
+        self.assertTrue(is_transient(make_result("https://a.com", None, "Error: ReadTimeout")))
+        self.assertTrue(is_transient(make_result("https://a.com", 503, "503 Service Unavailable")))
+        self.assertTrue(is_transient(make_result("https://a.com", 429, "429 Too Many Requests")))
+        self.assertFalse(is_transient(make_result("https://a.com", 404, "404 Not Found")))
+        self.assertFalse(is_transient(make_result("https://a.com", None, "Error: InvalidURL")))
+
+    def test_backoff_grows_and_is_capped(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0)
+        self.assertEqual([policy.delay_for(n) for n in range(1, 5)], [1, 2, 4, 5])
+        jittered = RetryPolicy(base_delay=4, jitter=0.5)
+        for _ in range(20):
+            self.assertTrue(2 <= jittered.delay_for(1) <= 4)
+
+    def test_queue_respects_retry_limit(self):
+        queue = RetryQueue(RetryPolicy(max_retries=2, base_delay=0))
+        self.assertTrue(queue.push(0, make_result("https://a.com", 503, "503", retries=1)))
+        self.assertFalse(queue.push(1, make_result("https://b.com", 503, "503", retries=2)))
+        self.assertFalse(queue.push(2, make_result("https://c.com")))
+        self.assertEqual(len(queue), 1)
+        self.assertEqual([key for key, _ in queue.pop_due()], [0])
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_transient_failures_are_retried_and_counted(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/flaky", "Link"), ("https://test.com/gone", "Link")], "https://test.com")
+        outcomes = {
+            "https://test.com/flaky": [make_result("https://test.com/flaky", None, "Error: ConnectionError"),
+                                       make_result("https://test.com/flaky", 502, "502 Bad Gateway"),
+                                       make_result("https://test.com/flaky")],
+            "https://test.com/gone": [make_result("https://test.com/gone", 404, "404 Not Found")],
+        }
+        mock_check_link.side_effect = lambda url, *args, **kwargs: outcomes[url].pop(0)
+
+        results = check_all_links("https://test.com", retry_policy=RetryPolicy(max_retries=3, base_delay=0))
+
+        by_url = {r.url: r for r in results}
+        self.assertFalse(by_url["https://test.com/flaky"].is_dead)
+        self.assertEqual(by_url["https://test.com/flaky"].retries, 2)
+        self.assertTrue(by_url["https://test.com/gone"].is_dead)
+        self.assertEqual(by_url["https://test.com/gone"].retries, 0)
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_no_retries_after_stop(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/flaky", "Link")], "https://test.com")
+        mock_check_link.side_effect = lambda url, *args, **kwargs: make_result(url, 503, "503 Service Unavailable")
+        controller = RunController()
+        messages = []
+
+        def progress(message):
+            # Stop once the first pass has its result, as a user pressing Stop at the end of the run
+            if isinstance(message, LinkResult):
+                controller.stop()
+            messages.append(message)
+
+        check_all_links("https://test.com", progress_callback=progress, controller=controller,
+                        retry_policy=RetryPolicy(max_retries=3, base_delay=0))
+        self.assertEqual(mock_check_link.call_count, 1)
+        self.assertFalse([m for m in messages if isinstance(m, str) and "Retrying" in m])
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_retried_links_counted_once(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/flaky", "Link"), ("https://test.com/gone", "Link")], "https://test.com")
+        outcomes = {
+            "https://test.com/flaky": [make_result("https://test.com/flaky", 503, "503 Service Unavailable"),
+                                       make_result("https://test.com/flaky")],
+            "https://test.com/gone": [make_result("https://test.com/gone", 404, "404 Not Found")],
+        }
+        mock_check_link.side_effect = lambda url, *args, **kwargs: outcomes[url].pop(0)
+        channel = ProgressChannel()
+        model = ResultModel()
+
+        check_all_links("https://test.com", progress_callback=channel, retry_policy=RetryPolicy(max_retries=3, base_delay=0))
+
+        batch = channel.poll()
+        self.assertEqual(len(batch.results), 3)
+        model.extend(batch.results)
+        self.assertEqual(model.total, 2)
+        counters = model.counters
+        self.assertEqual((counters.total, counters.working, counters.broken), (2, 1, 1))
+        self.assertEqual(counters.success_rate, 50.0)
+        model.clear()
+        self.assertEqual(model.counters.total, 0)
+
+if __name__ == '__main__':
+    unittest.main()
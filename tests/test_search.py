@@ -0,0 +1,93 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.search import SearchIndex, parse_query, Filter
+from deadlink.resultmodel import ResultModel
+
+RESULTS = [
+    LinkResult("https://test.com/blog/post", 200, "OK", 0.1, "https://test.com", False, False, "Link"),
+    LinkResult("https://test.com/missing.png", 404, "Not Found", 0.2, "https://test.com", True, False, "Image"),
+    LinkResult("https://cdn.other.com/logo.png", 404, "Not Found", 0.3, "https://test.com", True, True, "Image"),
+    LinkResult("https://other.com/blog", None, "Connection Error", None, "https://test.com", True, True, "Link"),
+    LinkResult("https://test.com/app.js", 500, "Server Error", 0.4, "https://test.com", True, False, "Script"),
+]
+
+class TestParseQuery(unittest.TestCase):
+    def test_terms_filters_and_exclusions(self):
+        query = parse_query('Blog status:404 -type:image EXT:yes -cdn "two words" foo:bar')
+        self.assertEqual(query.terms, ("blog", "two words", "foo:bar"))
+        self.assertEqual(query.excluded, ("cdn",))
+        self.assertEqual(query.filters, (
+            Filter("status", "404"), Filter("type", "image", True), Filter("external", "yes")
+        ))
+
+    def test_incomplete_filters_are_ignored(self):
+        self.assertFalse(parse_query("status:"))
+        self.assertEqual(parse_query('"unterminated').terms, ('"unterminated',))
+
+    def test_narrowing(self):
+        self.assertTrue(parse_query("blog/p").narrows(parse_query("blog")))
+        self.assertTrue(parse_query("status:40").narrows(parse_query("status:4")))
+        self.assertTrue(parse_query("blog type:image").narrows(parse_query("blog")))
+        self.assertFalse(parse_query("blo").narrows(parse_query("blog")))
+        self.assertFalse(parse_query("-cd").narrows(parse_query("-cdn")))
+        self.assertFalse(parse_query("status:404,500").narrows(parse_query("status:404")))
+        self.assertTrue(parse_query("external:no").narrows(parse_query("external:n")))
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.extend(RESULTS)
+
+    def test_structured_filters(self):
+        self.assertEqual(self.index.search("status:404"), [1, 2])
+        self.assertEqual(self.index.search("status:4xx type:image external:yes"), [2])
+        self.assertEqual(self.index.search("status:err"), [3])
+        self.assertEqual(self.index.search("status:404,5xx"), [1, 2, 4])
+        self.assertEqual(self.index.search("-status:200 type:link"), [3])
+        self.assertEqual(self.index.search("dead:no"), [0])
+        self.assertEqual(self.index.search("external:maybe"), [])
+
+    def test_free_text_covers_url_status_and_type(self):
+        self.assertEqual(self.index.search("BLOG"), [0, 3])
+        self.assertEqual(self.index.search("not found -cdn"), [1])
+        self.assertEqual(self.index.search("script"), [4])
+
+    def test_within_restricts_and_keeps_order(self):
+        self.assertEqual(self.index.search("png", within=[2, 1, 0]), [2, 1])
+
+    def test_update_reindexes_row(self):
+        self.index.update(3, LinkResult("https://other.com/blog", 200, "OK", 0.1, "https://test.com", False, True, "Link"))
+        self.assertEqual(self.index.search("status:err"), [])
+        self.assertEqual(self.index.search("status:200"), [0, 3])
+
+class TestResultModelSearch(unittest.TestCase):
+    def test_search_filters_new_rows_and_narrows(self):
+        model = ResultModel()
+        model.extend(RESULTS[:3])
+        model.sort("URL", descending=True)
+        model.search("png")
+        self.assertEqual([model.result(i).url for i in range(len(model))],
+                         ["https://test.com/missing.png", "https://cdn.other.com/logo.png"])
+        model.search("png external:yes")
+        self.assertEqual(len(model), 1)
+        model.extend(RESULTS[3:] + [LinkResult("https://x.com/a.png", 404, "Not Found", 0.1, "https://test.com", True, True, "Image")])
+        self.assertEqual(len(model), 2)
+        model.search("")
+        self.assertEqual(len(model), 6)
+
+    def test_clear_keeps_active_search(self):
+        model = ResultModel()
+        model.search("status:404")
+        model.extend(RESULTS)
+        model.clear()
+        model.extend(RESULTS)
+        self.assertEqual(len(model), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.seenset import BloomFilter, BloomSeenSet, DiskSeenSet, seen_set_factory
+from deadlink.crawler import crawl_website
+from deadlink.models import LinkResult
+from unittest.mock import patch
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"https://test.com/page/{i}")
+        self.assertTrue(all(f"https://test.com/page/{i}" in bloom for i in range(10000)))
+        false_positives = sum(f"https://other.com/{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_sizing(self):
+        bloom = BloomFilter(capacity=1_000_000, error_rate=0.001)
+        self.assertEqual(bloom.hashes, 10)
+        self.assertAlmostEqual(bloom.nbytes / 1_000_000, 1.8, delta=0.05)
+
+class TestDiskSeenSet(unittest.TestCase):
+    def test_exact_with_small_hot_set(self):
+        seen = DiskSeenSet(hot_size=10, flush_every=10, bloom=BloomFilter(1000, 0.01))
+        try:
+            for i in range(500):
+                seen.add(f"https://test.com/{i}")
+            seen.add("https://test.com/3")
+            self.assertEqual(len(seen), 500)
+            self.assertLessEqual(len(seen._hot), 10)
+            self.assertTrue(all(f"https://test.com/{i}" in seen for i in range(500)))
+            self.assertFalse(any(f"https://test.com/x{i}" in seen for i in range(500)))
+        finally:
+            seen.close()
+
+    def test_temporary_file_removed_on_close(self):
+        seen = DiskSeenSet()
+        seen.add("https://test.com")
+        path = seen.path
+        self.assertTrue(os.path.exists(path))
+        seen.close()
+        self.assertFalse(os.path.exists(path))
+
+class TestSeenSetFactory(unittest.TestCase):
+    def test_modes(self):
+        self.assertIs(seen_set_factory('memory'), set)
+        self.assertIsInstance(seen_set_factory('bloom', capacity=100)(), BloomSeenSet)
+        disk = seen_set_factory('disk')()
+        self.assertIsInstance(disk, DiskSeenSet)
+        disk.close()
+        with self.assertRaises(ValueError):
+            seen_set_factory('redis')
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_crawl_with_disk_seen_set(self, mock_get_all_links, mock_check_link):
+        site = {
+            "https://test.com": ["https://test.com/a", "https://test.com/b"],
+            "https://test.com/a": ["https://test.com/b", "https://test.com"],
+            "https://test.com/b": ["https://test.com/a"],
+        }
+        mock_get_all_links.side_effect = lambda url, *args, **kwargs: ([(l, "Link") for l in site[url]], url)
+        mock_check_link.side_effect = lambda url, found_on, *args, **kwargs: LinkResult(url, 200, "OK", 0.1, found_on, False, False, "Link")
+
+        created = []
+
+        def factory():
+            created.append(DiskSeenSet(hot_size=1, flush_every=1))
+            return created[-1]
+
+        results = crawl_website("https://test.com", max_depth=3, seen_set=factory)
+        self.assertEqual(sorted(r.url for r in results), ["https://test.com", "https://test.com/a", "https://test.com/b"])
+        self.assertEqual(mock_get_all_links.call_count, 3)
+        self.assertEqual(len(created), 2)
+        self.assertFalse(any(os.path.exists(s.path) for s in created))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import os
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.server import CheckServer, parse_address, is_loopback, build_check_options, remote_check, request
+from unittest.mock import patch
+
+class TestCheckOptions(unittest.TestCase):
+    def test_parse_address(self):
+        self.assertEqual(parse_address("9000"), ("127.0.0.1", 9000))
+        self.assertEqual(parse_address("localhost:9000"), ("localhost", 9000))
+        with self.assertRaises(ValueError):
+            parse_address("localhost")
+
+    def test_build_check_options(self):
+        options = build_check_options("https://test.com", {'workers': 3, 'retries': 2, 'adaptive_timeout': True, 'exclude': ['/private/']})
+        self.assertEqual(options['max_workers'], 3)
+        self.assertEqual(options['retry_policy'].max_retries, 2)
+        self.assertEqual(options['timeout_policy'].max_read_timeout, 10)
+        self.assertTrue(options['exclude_patterns'].matches("https://test.com/private/x"))
+        self.assertIsNone(build_check_options("https://test.com", {})['retry_policy'])
+
+    def test_invalid_parameters_rejected(self):
+        with self.assertRaises(ValueError):
+            build_check_options("https://test.com", {'exclude': ['(']})
+        with self.assertRaises(ValueError):
+            build_check_options("https://test.com", {'bogus': 1})
+
+class TestCheckServer(unittest.TestCase):
+    def setUp(self):
+        self.server = CheckServer(("127.0.0.1", 0))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.address = self.server.server_address
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_remote_check_round_trip(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/a", "Link"), ("https://test.com/b.png", "Image")], "https://test.com")
+        mock_check_link.side_effect = lambda url, *args, **kwargs: LinkResult(url, 404, "Not Found", 0.1, "https://test.com", True, False, "Image", 1)
+        results = remote_check(self.address, "https://test.com", {'workers': 2}, timeout=5)
+        self.assertEqual(sorted(r.url for r in results), ["https://test.com/a", "https://test.com/b.png"])
+        self.assertIsInstance(results[0], LinkResult)
+        self.assertEqual(results[0].retries, 1)
+
+    def test_errors_are_reported(self):
+        self.assertEqual(request(self.address, {'command': 'ping'}, timeout=5), {'ok': True})
+        self.assertFalse(request(self.address, {'command': 'nope'}, timeout=5)['ok'])
+        with self.assertRaises(RuntimeError):
+            remote_check(self.address, "https://test.com", {'exclude': ['(']}, timeout=5)
+
+class TestServerToken(unittest.TestCase):
+    def test_loopback(self):
+        self.assertTrue(is_loopback("127.0.0.1"))
+        self.assertTrue(is_loopback("::1"))
+        self.assertTrue(is_loopback("localhost"))
+        self.assertFalse(is_loopback("0.0.0.0"))
+        self.assertFalse(is_loopback(""))
+        self.assertFalse(is_loopback("build-host.example.com"))
+
+    def test_non_loopback_bind_needs_token(self):
+        with self.assertRaises(ValueError):
+            CheckServer(("0.0.0.0", 0))
+        server = CheckServer(("0.0.0.0", 0), token="s3cret")
+        server.server_close()
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_every_request_checked(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/a", "Link")], "https://test.com")
+        mock_check_link.side_effect = lambda url, *args, **kwargs: LinkResult(url, 200, "OK", 0.1, "https://test.com", False, False)
+        server = CheckServer(("127.0.0.1", 0), token="s3cret")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            address = server.server_address
+            for token in (None, "wrong"):
+                self.assertFalse(request(address, {'command': 'ping'}, timeout=5, token=token)['ok'])
+                with self.assertRaises(RuntimeError):
+                    remote_check(address, "https://test.com", timeout=5, token=token)
+                self.assertFalse(request(address, {'command': 'frontier', 'op': 'counts'}, timeout=5, token=token)['ok'])
+            mock_check_link.assert_not_called()
+            self.assertEqual(request(address, {'command': 'ping'}, timeout=5, token="s3cret"), {'ok': True})
+            self.assertEqual([r.url for r in remote_check(address, "https://test.com", timeout=5, token="s3cret")], ["https://test.com/a"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
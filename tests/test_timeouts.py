@@ -0,0 +1,63 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.models import LinkResult
+from deadlink.timeouts import TimeoutPolicy, is_timeout
+from deadlink.crawler import check_all_links
+from unittest.mock import patch
+
+def make_result(url, response_time=0.1, status_code=200, status_text="200 OK"):
+    return LinkResult(url, status_code, status_text, response_time, "base", status_code is None, False)
+
+class TestTimeoutPolicy(unittest.TestCase):
+    def test_unseen_host_gets_max_budget(self):
+        policy = TimeoutPolicy(connect_timeout=3, max_read_timeout=20)
+        self.assertEqual(policy.timeout_for("https://slow.example/a"), (3, 20))
+
+    def test_read_timeout_follows_p95(self):
+        policy = TimeoutPolicy(connect_timeout=3, min_read_timeout=1, max_read_timeout=20, latency_multiplier=4, min_samples=5)
+        for _ in range(10):
+            policy.record(make_result("https://fast.example/x", response_time=0.5))
+        self.assertEqual(policy.timeout_for("https://fast.example/y"), (3, 2.0))
+        stats = policy.host_stats("fast.example")
+        self.assertEqual(stats['count'], 10)
+        self.assertEqual(stats['p50'], 0.5)
+
+    def test_read_timeout_is_clamped(self):
+        policy = TimeoutPolicy(min_read_timeout=2, max_read_timeout=10, min_samples=1)
+        policy.record(make_result("https://tiny.example/", response_time=0.01))
+        policy.record(make_result("https://huge.example/", response_time=9))
+        self.assertEqual(policy.timeout_for("https://tiny.example/")[1], 2)
+        self.assertEqual(policy.timeout_for("https://huge.example/")[1], 10)
+
+    def test_errors_are_not_recorded(self):
+        policy = TimeoutPolicy(min_samples=1)
+        policy.record(make_result("https://down.example/", status_code=None, status_text="Error: ReadTimeout"))
+        self.assertIsNone(policy.host_stats("down.example"))
+
+    def test_is_timeout(self):
+        self.assertTrue(is_timeout(make_result("https://a.com", status_code=None, status_text="Error: ConnectTimeout")))
+        self.assertFalse(is_timeout(make_result("https://a.com", status_code=None, status_text="Error: ConnectionError")))
+
+    @patch('deadlink.crawler.check_link')
+    @patch('deadlink.crawler.get_all_links')
+    def test_timed_out_links_are_retried_with_longer_budget(self, mock_get_all_links, mock_check_link):
+        mock_get_all_links.return_value = ([("https://test.com/slow", "Link")], "https://test.com")
+        mock_check_link.side_effect = [
+            make_result("https://test.com/slow", status_code=None, status_text="Error: ReadTimeout"),
+            make_result("https://test.com/slow"),
+        ]
+        policy = TimeoutPolicy(connect_timeout=2, max_read_timeout=5, retry_timeouts=True, retry_factor=3)
+
+        results = check_all_links("https://test.com", timeout=5, timeout_policy=policy)
+
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0].is_dead)
+        self.assertEqual(mock_check_link.call_args_list[1][0][2], (6, 15))
+
+if __name__ == '__main__':
+    unittest.main()
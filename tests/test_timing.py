@@ -0,0 +1,115 @@
+import sys
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.timing import Histogram, RunProfile
+from deadlink.crawler import check_all_links
+from deadlink.database import DatabaseManager
+from deadlink.models import LinkResult
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self._send(b"")
+
+    def do_GET(self):
+        self._send(b'<html><body><a href="/a">a</a><a href="/b">b</a><img src="/c.png"></body></html>')
+
+    def _send(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestHistogram(unittest.TestCase):
+    def test_quantiles_and_merge(self):
+        h = Histogram()
+        for ms in [3] * 90 + [150] * 9 + [4000]:
+            h.add(ms / 1000)
+        self.assertEqual(h.count, 100)
+        self.assertEqual(h.quantile(0.5), 0.005)
+        self.assertEqual(h.quantile(0.95), 0.2)
+        self.assertEqual(h.quantile(1.0), 4.0)
+        other = Histogram()
+        other.add(0.0001)
+        h.merge(other)
+        self.assertEqual(h.count, 101)
+        self.assertEqual(h.min, 0.0001)
+
+    def test_add_many_matches_add(self):
+        values = [0.0, 0.001, 0.0015, 0.002, 0.05, 0.3, 29.9, 30.0, 45.0] + [i / 997 for i in range(500)]
+        one, many = Histogram(), Histogram()
+        one.add(0.2)
+        many.add(0.2)
+        for seconds in values:
+            one.add(seconds)
+        many.add_many(values[:7])
+        many.add_many(values[7:])
+        self.assertEqual(many.buckets, one.buckets)
+        self.assertEqual((many.count, many.min, many.max), (one.count, one.min, one.max))
+        self.assertAlmostEqual(many.total, one.total)
+
+class TestRunProfile(unittest.TestCase):
+    def test_host_breakdown_and_round_trip(self):
+        profile = RunProfile()
+        profile.record('request', 0.2, 'a.com')
+        profile.record('request', 0.4, 'b.com')
+        profile.record('parse', 0.01, 'a.com')
+        with profile.timer('report'):
+            pass
+        self.assertEqual(profile.phases['request'].count, 2)
+        self.assertEqual(set(profile.hosts), {'a.com', 'b.com'})
+        self.assertNotIn('parse', profile.hosts['a.com'])
+
+        restored = RunProfile.from_json(profile.to_json())
+        self.assertEqual(restored.to_dict(), profile.to_dict())
+        summary = restored.summary()
+        self.assertIn('request', summary)
+        self.assertLess(summary.index('b.com'), summary.index('a.com'))
+
+    def test_check_records_request_phases(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            profile = RunProfile()
+            url = f"http://127.0.0.1:{server.server_address[1]}/"
+            results = check_all_links(url, max_workers=2, timeout=5, progress_callback=lambda *args: None, profile=profile)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(len(results), 3)
+        for phase in ('dns', 'connect', 'ttfb', 'request', 'parse', 'queue_wait', 'callback'):
+            self.assertIn(phase, profile.phases, phase)
+        self.assertNotIn('tls', profile.phases)
+        self.assertEqual(profile.phases['request'].count, 4)
+        self.assertEqual(profile.phases['callback'].count, 3)
+        self.assertEqual(set(profile.hosts), {'127.0.0.1'})
+
+class TestProfileStorage(unittest.TestCase):
+    def test_profile_saved_with_session(self):
+        db = DatabaseManager(":memory:")
+        profile = RunProfile()
+        profile.record('request', 0.1, 'test.com')
+        results = [LinkResult("https://test.com", 200, "OK", 0.1, "https://test.com", False, False)]
+        session_id = db.save_session("https://test.com", "single", results, "folder", profile=profile)
+        plain_id = db.save_session("https://test.com", "single", results, "folder")
+
+        stored = db.get_session_profile(session_id)
+        self.assertEqual(stored.phases['request'].count, 1)
+        self.assertEqual(stored.phases['db_save'].count, 1)
+        self.assertIsNone(db.get_session_profile(plain_id))
+        db.delete_session(session_id)
+        self.assertIsNone(db.get_session_profile(session_id))
+
+if __name__ == '__main__':
+    unittest.main()
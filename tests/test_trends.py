@@ -0,0 +1,106 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from deadlink.database import DatabaseManager
+from deadlink.models import LinkResult
+from deadlink import trends
+
+SITE = "https://site.com"
+
+def link(url, dead, seconds=0.1, found_on=SITE):
+    return LinkResult(url, 404 if dead else 200, "Not Found" if dead else "OK", seconds, found_on, dead, False)
+
+# (timestamp, links) per run; /flaky alternates, /fixed breaks for two days
+RUNS = [
+    ("2024-01-01 00:00:00", [link(f"{SITE}/ok", False), link(f"{SITE}/fixed", True), link(f"{SITE}/flaky", False)]),
+    ("2024-01-02 00:00:00", [link(f"{SITE}/ok", False), link(f"{SITE}/fixed", True), link(f"{SITE}/flaky", True)]),
+    ("2024-01-03 00:00:00", [link(f"{SITE}/ok", False), link(f"{SITE}/fixed", False), link(f"{SITE}/flaky", False)]),
+    ("2024-01-03 12:00:00", [link(f"{SITE}/ok", False), link(f"{SITE}/fixed", False), link(f"{SITE}/flaky", True),
+                             link(f"{SITE}/flaky", False, found_on=f"{SITE}/other")]),
+]
+
+class TestTrends(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+        for timestamp, results in RUNS:
+            session_id = self.db.save_session(SITE, "website", results, "f")
+            with self.db._get_connection() as conn:
+                conn.execute("UPDATE sessions SET timestamp = ? WHERE id = ?", (timestamp, session_id))
+        # Rollups were updated with the real save times; replay them with the ones set above
+        trends.rebuild_rollups(self.db)
+
+    def test_broken_link_trend(self):
+        days = trends.broken_link_trend(self.db, SITE)
+        self.assertEqual([(d['period'], d['runs'], d['broken'], d['broken_max']) for d in days],
+                         [("2024-01-01", 1, 1, 1), ("2024-01-02", 1, 2, 2), ("2024-01-03", 2, 1, 1)])
+        self.assertEqual(len(trends.broken_link_trend(self.db, bucket='month')), 1)
+        self.assertEqual(trends.broken_link_trend(self.db, "https://other.com"), [])
+        with self.assertRaises(ValueError):
+            trends.broken_link_trend(self.db, bucket='year')
+
+    def test_mean_time_to_fix(self):
+        fixes = {row['url']: row for row in trends.mean_time_to_fix(self.db, SITE)}
+        self.assertEqual(fixes[f"{SITE}/fixed"]['mean_fix_seconds'], 2 * 86400)
+        self.assertEqual(fixes[f"{SITE}/flaky"]['mean_fix_seconds'], 86400)
+        self.assertNotIn(f"{SITE}/ok", fixes)
+        self.assertEqual(next(iter(fixes)), f"{SITE}/fixed")
+
+    def test_flapping_links(self):
+        flapping = trends.flapping_links(self.db, min_transitions=3)
+        self.assertEqual([row['url'] for row in flapping], [f"{SITE}/flaky"])
+        self.assertEqual((flapping[0]['transitions'], flapping[0]['checks'], flapping[0]['dead_checks'], flapping[0]['broken_now']),
+                         (3, 4, 2, 1))
+        self.db.save_session(SITE, "website", [link(f"{SITE}/flaky", True)], "f")
+        self.assertEqual(trends.flapping_links(self.db)[0]['dead_checks'], 3)
+
+    def test_link_broken_on_another_page_is_not_fixed(self):
+        self.db.save_session(SITE, "website", [link(f"{SITE}/flaky", False), link(f"{SITE}/flaky", True, found_on=f"{SITE}/other")], "f")
+        flapping = trends.flapping_links(self.db)
+        self.assertEqual((flapping[0]['transitions'], flapping[0]['broken_now']), (3, 1))
+
+    def test_slow_hosts(self):
+        self.db.save_session("https://slow.com", "website", [link(f"https://slow.com/{i}", False, 3.0) for i in range(30)], "f")
+        hosts = trends.slow_hosts(self.db, min_checks=10)
+        self.assertEqual([h['host'] for h in hosts], ["slow.com", "site.com"])
+        self.assertEqual(hosts[0]['quantile'], 3.0)
+        self.assertEqual(hosts[1]['checks'], 13)
+        self.assertEqual(trends.slow_hosts(self.db, min_checks=20)[0]['host'], "slow.com")
+
+    def test_incremental_matches_rebuild(self):
+        self.db.save_session(SITE, "website", [link(f"{SITE}/flaky", False), link(f"{SITE}/new", True)], "f")
+        incremental = trends.flapping_links(self.db, min_transitions=0)
+        trends.rebuild_rollups(self.db)
+        self.assertEqual(trends.flapping_links(self.db, min_transitions=0), incremental)
+
+    def test_older_rollup_layout_rebuilt(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        path = os.path.join(folder, "history.db")
+        db = DatabaseManager(path)
+        db.save_session(SITE, "website", [link(f"{SITE}/gone", True)], "f")
+        with db._get_connection() as conn:
+            conn.execute("UPDATE db_meta SET value = '1' WHERE key = 'rollup_version'")
+            conn.execute("DROP TABLE link_state")
+            conn.execute("CREATE TABLE link_state (site TEXT, url TEXT, dead_checks INTEGER, PRIMARY KEY (site, url))")
+        db.close()
+
+        db = DatabaseManager(path)
+        db.save_session(SITE, "website", [link(f"{SITE}/gone", False)], "f")
+        fixes = trends.mean_time_to_fix(db)
+        self.assertEqual([(row['url'], row['fixes']) for row in fixes], [(f"{SITE}/gone", 1)])
+        db.close()
+
+    def test_legacy_history_backfilled(self):
+        with self.db._get_connection() as conn:
+            conn.execute("DELETE FROM link_state")
+            conn.execute("DELETE FROM db_meta WHERE key = 'rollup_version'")
+        self.assertEqual([row['url'] for row in trends.flapping_links(self.db)], [f"{SITE}/flaky"])
+
+if __name__ == '__main__':
+    unittest.main()